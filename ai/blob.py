@@ -1,5 +1,6 @@
 from azure.storage.blob import BlobServiceClient
 import os
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 from datetime import datetime
 
@@ -8,14 +9,29 @@ load_dotenv()
 azure_storage_emdpoint = os.getenv("AZURE_STORAGE_EMDPOINT")
 azure_storage_connection_string = os.getenv("AZURE_STORAGE_CONNECTION_STRING")
 azure_storage_container = os.getenv("AZURE_STORAGE_CONTAINER", "query-log-data")
+# 여러 파일 동시 업로드 시 최대 스레드 수
+azure_storage_upload_workers = int(os.getenv("AZURE_STORAGE_UPLOAD_WORKERS", "4"))
 
-def upload_to_blob(file, project_code, dbms_type):
+def _get_container_client():
     blob_service_client = BlobServiceClient.from_connection_string(os.getenv("AZURE_STORAGE_CONNECTION_STRING"))
+    return blob_service_client.get_container_client(container=azure_storage_container)
 
+def _upload(container_client, file, project_code, dbms_type):
     blob_name = f"{dbms_type.lower()}/{project_code}/{datetime.now().strftime('%Y%m%d')}_{file.name}"
-    container_client = blob_service_client.get_container_client(container=azure_storage_container)
     blob_client = container_client.get_blob_client(blob_name)
 
     blob_client.upload_blob(file, overwrite=True)
-    
-    return f"{azure_storage_emdpoint}/{azure_storage_container}/{blob_name}"
\ No newline at end of file
+
+    return f"{azure_storage_emdpoint}/{azure_storage_container}/{blob_name}"
+
+def upload_to_blob(file, project_code, dbms_type):
+    return _upload(_get_container_client(), file, project_code, dbms_type)
+
+def upload_files_to_blob(files, project_code):
+    """[(파일, dbms_type)] 을 스레드 풀에서 동시에 업로드하고 입력 순서대로 Blob 경로 반환"""
+    if not files:
+        return []
+    container_client = _get_container_client()
+    with ThreadPoolExecutor(max_workers=min(azure_storage_upload_workers, len(files))) as executor:
+        futures = [executor.submit(_upload, container_client, file, project_code, dbms_type) for file, dbms_type in files]
+        return [future.result() for future in futures]
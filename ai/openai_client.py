@@ -1,6 +1,10 @@
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from openai import AzureOpenAI
 from dotenv import load_dotenv
+from ai.rate_limit import RateLimiter
+from database.suggestion_cache import get_cached_suggestion, save_cached_suggestion
+from parser.fingerprint import fingerprint, fingerprint_id
 
 load_dotenv()
 
@@ -11,6 +15,20 @@ openai_client = AzureOpenAI(
 )
 
 DEPLOYMENT_NAME = os.getenv("AZURE_OPENAI_DEPLOYMENT")
+# 프롬프트 문구를 바꾸면 올려서 이전 프롬프트로 만든 캐시 제안을 쓰지 않도록 함
+TUNING_PROMPT_VERSION = "1"
+# 튜닝 제안 캐시 유효 기간(일)과 최대 항목 수 (넘으면 가장 오래 쓰이지 않은 항목부터 삭제)
+SUGGESTION_CACHE_TTL_DAYS = float(os.getenv("SUGGESTION_CACHE_TTL_DAYS", "30"))
+SUGGESTION_CACHE_MAX_ENTRIES = int(os.getenv("SUGGESTION_CACHE_MAX_ENTRIES", "10000"))
+# 튜닝 제안 응답 최대 토큰 수 (Azure 는 요청 시점에 프롬프트 + max_tokens 를 TPM 한도에서 차감)
+TUNING_MAX_TOKENS = 1000
+# 전체 분석 시 동시 요청 수와 배포의 분당 요청/토큰 한도
+AZURE_OPENAI_MAX_CONCURRENCY = int(os.getenv("AZURE_OPENAI_MAX_CONCURRENCY", "4"))
+AZURE_OPENAI_RPM = int(os.getenv("AZURE_OPENAI_RPM", "60"))
+AZURE_OPENAI_TPM = int(os.getenv("AZURE_OPENAI_TPM", "60000"))
+
+# 한도는 배포 단위이므로 모든 세션이 같은 제한기를 공유
+tuning_rate_limiter = RateLimiter(AZURE_OPENAI_RPM, AZURE_OPENAI_TPM)
 # EMBEDDING_DEPLOYMENT = os.getenv("AZURE_OPENAI_EMBEDDING_DEPLOYMENT", "text-embedding-ada-002")
 
 # def get_embedding(text):
@@ -23,7 +41,7 @@ DEPLOYMENT_NAME = os.getenv("AZURE_OPENAI_DEPLOYMENT")
 #     except Exception as e:
 #         raise RuntimeError(f"임베딩 생성 실패: {e}")
 
-def get_tuning_suggestion(sql, duration_ms, lang, similar_queries=None, dbms_type="PostgreSQL"):
+def _build_tuning_messages(sql, duration_ms, lang, similar_queries=None, dbms_type="PostgreSQL"):
     base_prompt = ""
     if similar_queries:
         base_prompt = f"""
@@ -59,16 +77,120 @@ SQL:
 {sql}
 """
 
+    return [
+        {"role": "system", "content": system_msg},
+        {"role": "user", "content": prompt}
+    ]
+
+
+def _create_tuning_completion(messages, stream=False):
+    # 프롬프트 토큰은 글자 수로 추정
+    tuning_rate_limiter.acquire(sum(len(message["content"]) for message in messages) // 3 + TUNING_MAX_TOKENS)
+    return openai_client.chat.completions.create(
+        model=DEPLOYMENT_NAME,
+        messages=messages,
+        temperature=0.3,
+        max_tokens=TUNING_MAX_TOKENS,
+        stream=stream,
+    )
+
+
+def _request_tuning_suggestion(sql, duration_ms, lang, similar_queries=None, dbms_type="PostgreSQL"):
+    response = _create_tuning_completion(_build_tuning_messages(sql, duration_ms, lang, similar_queries, dbms_type))
+    return response.choices[0].message.content
+
+
+def get_tuning_suggestion(sql, duration_ms, lang, similar_queries=None, dbms_type="PostgreSQL"):
     try:
-        response = openai_client.chat.completions.create(
-            model=DEPLOYMENT_NAME,
-            messages=[
-                {"role": "system", "content": system_msg},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.3,
-            max_tokens=1000,
-        )
-        return response.choices[0].message.content
+        return _request_tuning_suggestion(sql, duration_ms, lang, similar_queries, dbms_type)
     except Exception as e:
         return f"❌ Azure OpenAI API 에러: {e}"
+
+
+def _tuning_cache_key(sql, dbms_type, query_type, lang):
+    # 슬로우 쿼리와 에러 쿼리는 프롬프트(실행 시간 유무)가 달라 따로 캐시
+    return (fingerprint_id(fingerprint(sql, dbms_type)), dbms_type, query_type, lang, TUNING_PROMPT_VERSION, DEPLOYMENT_NAME or "")
+
+
+def _get_or_request_tuning_suggestion(sql, duration_ms, lang, similar_queries=None, dbms_type="PostgreSQL", query_type="slow"):
+    # 캐시 조회 후 없으면 API 호출 (API 오류는 그대로 발생)
+    cache_key = _tuning_cache_key(sql, dbms_type, query_type, lang)
+    ttl_seconds = SUGGESTION_CACHE_TTL_DAYS * 86400
+    suggestion = get_cached_suggestion(*cache_key, ttl_seconds)
+    if suggestion is not None:
+        return suggestion, True
+
+    suggestion = _request_tuning_suggestion(sql, duration_ms, lang, similar_queries, dbms_type)
+    if suggestion:
+        save_cached_suggestion(*cache_key, suggestion, ttl_seconds, SUGGESTION_CACHE_MAX_ENTRIES)
+    return suggestion, False
+
+
+def get_cached_tuning_suggestion(sql, duration_ms, lang, similar_queries=None, dbms_type="PostgreSQL", query_type="slow"):
+    """
+    같은 쿼리 형태(fingerprint)/DBMS/쿼리 종류(slow·error)/언어/프롬프트·모델 버전으로 받은 제안이 캐시에 있으면 API 를 호출하지 않음.
+    (제안, 캐시 적중 여부) 반환. API 오류 메시지는 캐시하지 않음.
+    """
+    try:
+        return _get_or_request_tuning_suggestion(sql, duration_ms, lang, similar_queries, dbms_type, query_type)
+    except Exception as e:
+        return f"❌ Azure OpenAI API 에러: {e}", False
+
+
+def _stream_and_cache_tuning_suggestion(messages, cache_key, ttl_seconds):
+    parts = []
+    try:
+        for chunk in _create_tuning_completion(messages, stream=True):
+            # Azure 는 콘텐츠 필터 결과만 담긴(choices 가 빈) 청크를 먼저 보냄
+            if chunk.choices and chunk.choices[0].delta.content:
+                parts.append(chunk.choices[0].delta.content)
+                yield chunk.choices[0].delta.content
+    except Exception as e:
+        # 중간에 끊긴 제안이 저장/색인되지 않도록 호출한 쪽에 실패를 알림
+        raise RuntimeError(f"Azure OpenAI API 에러: {e}") from e
+    # 끝까지 받은 제안만 캐시
+    if parts:
+        save_cached_suggestion(*cache_key, "".join(parts), ttl_seconds, SUGGESTION_CACHE_MAX_ENTRIES)
+
+
+def stream_cached_tuning_suggestion(sql, duration_ms, lang, similar_queries=None, dbms_type="PostgreSQL", query_type="slow"):
+    """
+    튜닝 제안을 받는 대로 조각(delta)으로 내보내는 이터레이터와 캐시 적중 여부 반환.
+    캐시에 있으면 저장된 제안 전체를 한 번에 내보내며, 받는 도중 API 오류가 나면 RuntimeError 발생.
+    """
+    cache_key = _tuning_cache_key(sql, dbms_type, query_type, lang)
+    ttl_seconds = SUGGESTION_CACHE_TTL_DAYS * 86400
+    suggestion = get_cached_suggestion(*cache_key, ttl_seconds)
+    if suggestion is not None:
+        return iter([suggestion]), True
+
+    messages = _build_tuning_messages(sql, duration_ms, lang, similar_queries, dbms_type)
+    return _stream_and_cache_tuning_suggestion(messages, cache_key, ttl_seconds), False
+
+
+def get_tuning_suggestions_bulk(queries, lang, max_concurrency=AZURE_OPENAI_MAX_CONCURRENCY):
+    """
+    [(sql, duration_ms, dbms_type, query_type)] 의 튜닝 제안을 스레드 풀에서 최대 max_concurrency 개씩 동시에 요청.
+    끝난 순서대로 (입력 위치, 제안, 캐시 적중 여부, 오류) 를 반환 (진행 표시는 호출한 스레드에서 처리).
+    같은 캐시 키(쿼리 형태/DBMS/쿼리 종류/언어)는 한 번만 요청해 모든 위치에 돌려주며, 두 번째 위치부터는 캐시 적중으로 표시.
+    분당 요청/토큰 한도는 tuning_rate_limiter 가 지키며, 캐시에 있는 제안은 한도를 쓰지 않음.
+    """
+    groups = {}
+    for i, (sql, duration_ms, dbms_type, query_type) in enumerate(queries):
+        groups.setdefault(_tuning_cache_key(sql, dbms_type, query_type, lang), []).append(i)
+
+    with ThreadPoolExecutor(max_workers=max(1, max_concurrency)) as executor:
+        futures = {}
+        for positions in groups.values():
+            sql, duration_ms, dbms_type, query_type = queries[positions[0]]
+            futures[executor.submit(_get_or_request_tuning_suggestion, sql, duration_ms, lang, None, dbms_type, query_type)] = positions
+        for future in as_completed(futures):
+            positions = futures[future]
+            try:
+                suggestion, cached = future.result()
+            except Exception as e:
+                for i in positions:
+                    yield i, None, False, f"Azure OpenAI API 에러: {e}"
+            else:
+                for n, i in enumerate(positions):
+                    yield i, suggestion, cached or n > 0, None
@@ -0,0 +1,40 @@
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    분당 rate_per_minute 만큼 채워지는 토큰 버킷 (여러 스레드에서 공유).
+    잔량이 모자라도 먼저 예약(음수 잔량)하고 채워질 때까지 기다리므로 요청 순서대로 처리됨.
+    """
+
+    def __init__(self, rate_per_minute, clock=time.monotonic):
+        self.capacity = float(rate_per_minute)
+        self._rate = self.capacity / 60.0
+        self._tokens = self.capacity
+        self._clock = clock
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount):
+        """amount 를 예약하고 사용 가능해질 때까지 기다릴 시간(초) 반환 (버킷 크기보다 큰 요청은 버킷 크기로 계산)"""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self._rate)
+            self._updated = now
+            self._tokens -= min(amount, self.capacity)
+            return max(0.0, -self._tokens / self._rate)
+
+
+class RateLimiter:
+    """Azure OpenAI 배포의 분당 요청 수(RPM)와 분당 토큰 수(TPM) 한도를 함께 지키는 제한기"""
+
+    def __init__(self, requests_per_minute, tokens_per_minute):
+        self._requests = TokenBucket(requests_per_minute)
+        self._tokens = TokenBucket(tokens_per_minute)
+
+    def acquire(self, tokens):
+        """요청 1건과 tokens 만큼의 한도를 예약하고 필요하면 대기"""
+        wait = max(self._requests.reserve(1), self._tokens.reserve(tokens))
+        if wait > 0:
+            time.sleep(wait)
@@ -1,3 +1,4 @@
+import hashlib
 import os
 from azure.search.documents import SearchClient
 from azure.search.documents.indexes import SearchIndexClient
@@ -14,8 +15,14 @@ from azure.search.documents.indexes.models import (
         HnswAlgorithmConfiguration,
     )
 from ai.openai_client import openai_client 
+from database.embedding_cache import get_cached_embeddings, save_cached_embeddings
 from dotenv import load_dotenv
 
+try:
+    import tiktoken
+except ImportError:  # 없으면 글자 수로 토큰 수를 넉넉하게 추정
+    tiktoken = None
+
 # .env 파일에서 환경 변수 불러오기 (API 키, 엔드포인트 등)
 load_dotenv()
 
@@ -23,6 +30,9 @@ load_dotenv()
 # deployment_name = os.getenv("AZURE_OPENAI_DEPLOYMENT")
 # embedding_model = os.getenv("AZURE_OPENAI_EMBEDDING_MODEL", "text-embedding-3-small")
 embedding_deployment = os.getenv("AZURE_OPENAI_EMBEDDING_DEPLOYMENT")
+# 임베딩 요청 한 번에 보낼 최대 입력 수 / 최대 토큰 수
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "256"))
+EMBEDDING_BATCH_MAX_TOKENS = int(os.getenv("EMBEDDING_BATCH_MAX_TOKENS", "100000"))
 
 # 인덱스 설정용 클라이언트 (인덱스 생성, 수정 등 구조 관리)
 search_index_client = SearchIndexClient(
@@ -166,17 +176,67 @@ def semantic_search_queries(dbms_type: str, query_text: str, filters=None, top_k
         raise RuntimeError(f"검색 실패: {e}")
     
 
-# 텍스트를 임베딩 벡터로 변환하는 함수 (OpenAI API 사용)
+# 임베딩 캐시 키: 공백을 정리한 텍스트의 해시 (배포 이름과 함께 저장)
+def get_embedding_cache_key(text):
+    normalized = " ".join(text.split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def _count_tokens(text, encoding):
+    if encoding is not None:
+        return len(encoding.encode(text))
+    return len(text) // 3 + 1
+
+
+def _chunk_embedding_inputs(texts):
+    """입력 수(EMBEDDING_BATCH_SIZE)와 토큰 수(EMBEDDING_BATCH_MAX_TOKENS) 제한에 맞춰 순서대로 나눔"""
+    encoding = tiktoken.get_encoding("cl100k_base") if tiktoken else None
+    chunk, chunk_tokens = [], 0
+    for text in texts:
+        tokens = _count_tokens(text, encoding)
+        if chunk and (len(chunk) >= EMBEDDING_BATCH_SIZE or chunk_tokens + tokens > EMBEDDING_BATCH_MAX_TOKENS):
+            yield chunk
+            chunk, chunk_tokens = [], 0
+        chunk.append(text)
+        chunk_tokens += tokens
+    if chunk:
+        yield chunk
+
+
+# 여러 텍스트를 한 번에 임베딩 (캐시에 있는 것은 재사용, 나머지 중복 없는 텍스트만 묶어서 요청)
+def get_embeddings(texts):
+    """텍스트 목록을 입력 순서대로 임베딩 벡터 목록으로 변환"""
+    cache_keys = [get_embedding_cache_key(text) for text in texts]
+    embeddings = get_cached_embeddings(cache_keys, embedding_deployment or "")
+
+    missing = {}
+    for cache_key, text in zip(cache_keys, texts):
+        if cache_key not in embeddings:
+            missing.setdefault(cache_key, text)
+
+    missing_keys = list(missing)
+    start = 0
+    for chunk in _chunk_embedding_inputs(list(missing.values())):
+        try:
+            response = openai_client.embeddings.create(
+                input=chunk,
+                model=embedding_deployment
+            )
+        except Exception as e:
+            raise RuntimeError(f"임베딩 생성 실패: {e}")
+        # 응답 순서가 아닌 index 로 입력과 맞춤
+        created = {missing_keys[start + item.index]: item.embedding for item in response.data}
+        save_cached_embeddings(created, embedding_deployment or "")
+        embeddings.update(created)
+        start += len(chunk)
+
+    return [embeddings[cache_key] for cache_key in cache_keys]
+
+
+# 텍스트를 임베딩 벡터로 변환하는 함수 (OpenAI API 사용, 이미 만든 임베딩은 로컬 캐시에서 재사용)
 def get_embedding(text):
     """텍스트를 벡터 임베딩으로 변환"""
-    try:
-        response = openai_client.embeddings.create(
-            input=text,
-            model=embedding_deployment
-        )
-        return response.data[0].embedding
-    except Exception as e:
-        raise RuntimeError(f"임베딩 생성 실패: {e}")
+    return get_embeddings([text])[0]
 
 # 패싯(Facets) 필터링 정보 조회 (쿼리 타입, 언어, DBMS 분포)        
 def get_facets(dbms_type: str):
@@ -192,6 +252,21 @@ def get_facets(dbms_type: str):
         raise RuntimeError(f"패싯 조회 실패: {e}")
 
 
+def index_queries_to_search(docs: list, dbms_type: str):
+    """여러 문서를 한 번에 업로드 (sql_embedding 이 없는 문서는 일괄 임베딩으로 채움)"""
+    pending = [doc for doc in docs if not doc.get("sql_embedding")]
+    for doc, embedding in zip(pending, get_embeddings([doc["sql_query"] for doc in pending])):
+        doc["sql_embedding"] = embedding
+    if not docs:
+        return
+
+    client = get_search_client(dbms_type)
+    try:
+        client.upload_documents(docs)
+    except Exception as e:
+        raise RuntimeError(f"[{get_index_name(dbms_type)}] 인덱스 업로드 실패: {e}")
+
+
 def index_query_to_search(doc: dict, dbms_type: str):
 
     # index_name = get_index_name(dbms_type)
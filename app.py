@@ -105,8 +105,8 @@ def route():
                 st.markdown(f"**{current_user["user_id"]}님**")
                 selected = option_menu(
                     menu_title="사용자 메뉴",
-                    options=["쿼리 로그 분석", "이력 관리", "유사 쿼리 검색"],
-                    icons=["bi-graph-up", "clipboard2-data", "search"],
+                    options=["쿼리 로그 분석", "튜닝 전/후 비교", "이력 관리", "유사 쿼리 검색"],
+                    icons=["bi-graph-up", "arrow-left-right", "clipboard2-data", "search"],
                     menu_icon="cast",
                     default_index=0,
                     orientation="vertical",
@@ -121,6 +121,8 @@ def route():
 
             if page == "쿼리 로그 분석":
                 dashboard._show_query_log_analysis()
+            elif page == "튜닝 전/후 비교":
+                dashboard._show_query_log_comparison()
             elif page == "이력 관리":
                 dashboard._show_query_log_analysis_history()
             elif page == "유사 쿼리 검색":
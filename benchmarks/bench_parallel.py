@@ -0,0 +1,76 @@
+"""
+레코드 경계 구간 병렬 파싱(parallel_scan_file) 워커 수별 확장성 벤치마크.
+
+samples.zip 의 로그를 반복해 --size-mb 크기(기본 1GB)의 파일을 만들고
+워커 수별 처리 시간/처리량과 1 워커 대비 속도 향상, 결과 일치 여부를 출력.
+
+실행: python -m benchmarks.bench_parallel [--size-mb 1024 4096] [--workers 1 2 4 8 16] [--dbms mysql]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.bench_scan import PARSERS
+from benchmarks.samples import load_samples
+from parser.parallel import parallel_scan_file
+
+
+def build_log_file(data, size_mb, directory=None):
+    """샘플 로그를 반복 기록해 size_mb 이상의 임시 파일 생성 후 경로 반환"""
+    target = size_mb * 1024 * 1024
+    if not data.endswith(b"\n"):
+        data += b"\n"
+    # 쓰기 호출 수를 줄이기 위해 약 16MB 단위로 묶어서 기록
+    chunk = data * max(1, (16 * 1024 * 1024) // len(data))
+    fd, path = tempfile.mkstemp(prefix="bench-parallel-", suffix=".log", dir=directory)
+    with os.fdopen(fd, "wb") as f:
+        written = 0
+        while written < target:
+            f.write(chunk)
+            written += len(chunk)
+    return path
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--size-mb", type=int, nargs="+", default=[1024])
+    arg_parser.add_argument("--workers", type=int, nargs="+", default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    arg_parser.add_argument("--dbms", choices=sorted(PARSERS), nargs="+", default=sorted(PARSERS))
+    arg_parser.add_argument("--threshold", type=float, default=1000, help="결과 보관량을 줄이기 위한 기준 시간(ms)")
+    arg_parser.add_argument("--tmp-dir", help="벤치마크 로그 파일을 만들 디렉터리")
+    args = arg_parser.parse_args()
+
+    # DBMS 별로 가장 큰 샘플을 반복 단위로 사용
+    samples = {}
+    for dbms_type, _, data in load_samples():
+        if len(data) > len(samples.get(dbms_type, b"")):
+            samples[dbms_type] = data
+
+    print(f"{'dbms':<11} {'MB':>6} {'workers':>7} {'sec':>8} {'MB/s':>8} {'speedup':>8} {'slow':>9} {'error':>9}")
+    for dbms_type in args.dbms:
+        parser = PARSERS[dbms_type]()
+        for size_mb in args.size_mb:
+            path = build_log_file(samples[dbms_type], size_mb, args.tmp_dir)
+            try:
+                actual_mb = os.path.getsize(path) / (1024 * 1024)
+                baseline_sec = None
+                baseline = None
+                for workers in args.workers:
+                    start = time.perf_counter()
+                    result = parallel_scan_file(parser, path, args.threshold, workers=workers)
+                    elapsed = time.perf_counter() - start
+
+                    if baseline is None:
+                        baseline_sec, baseline = elapsed, result
+                    else:
+                        assert result == baseline, f"{dbms_type} workers={workers}: 병렬 파싱 결과가 1차 측정과 다릅니다."
+                    print(f"{dbms_type:<11} {actual_mb:>6.0f} {workers:>7} {elapsed:>8.2f} {actual_mb / elapsed:>8.1f} "
+                          f"{baseline_sec / elapsed:>7.2f}x {len(result.slow_queries):>9} {len(result.error_queries):>9}")
+                    del result
+            finally:
+                os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
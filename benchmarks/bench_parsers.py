@@ -0,0 +1,155 @@
+"""
+파서별 extract_slow_queries / extract_error_queries / extract_sql_features 처리량 벤치마크.
+
+samples.zip 의 각 로그(및 N배로 이어 붙인 로그)에 대해 MB/s, records/s, 최대 RSS 를 측정하고
+결과를 JSON 으로 저장. --compare 로 이전 결과와 비교해 처리량 회귀를 표시.
+측정마다 새 프로세스에서 실행하므로 최대 RSS 는 측정 항목별 값.
+
+실행: python -m benchmarks.bench_parsers [--scales 1 10 100] [--output results.json] [--compare baseline.json]
+"""
+import argparse
+import json
+import multiprocessing
+import platform
+import resource
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+from benchmarks.samples import load_samples
+from parser.registry import get_parser
+
+OPERATIONS = ("extract_slow_queries", "extract_error_queries", "extract_sql_features")
+# 이전 결과 대비 처리량(MB/s)이 이 비율 미만이면 회귀로 표시 (--regression-ratio 로 변경)
+REGRESSION_RATIO = 0.9
+
+
+def _peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux 는 KB, macOS 는 byte 단위
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _measure(dbms_type, name, scale, operation, repeat):
+    """(새 프로세스에서 실행) 샘플을 scale 배로 만들어 operation 을 repeat 번 실행한 최고 기록 측정"""
+    data = next(data for sample_type, sample_name, data in load_samples()
+                if sample_type == dbms_type and sample_name == name)
+    parser = get_parser(dbms_type)
+    log_text = data.decode("utf-8", "replace") * scale
+
+    if operation == "extract_sql_features":
+        # 로그에서 추출한 슬로우 쿼리 SQL 전체가 입력
+        sqls = [query.sql for query in parser.extract_slow_queries(log_text, 0)]
+        del log_text
+        input_bytes = sum(len(sql.encode("utf-8")) for sql in sqls)
+
+        def run():
+            for sql in sqls:
+                parser.extract_sql_features(sql)
+            return len(sqls)
+    else:
+        input_bytes = len(data) * scale
+
+        def run():
+            if operation == "extract_slow_queries":
+                return len(parser.extract_slow_queries(log_text, 0))
+            return len(parser.extract_error_queries(log_text))
+
+    best = float("inf")
+    records = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        records = run()
+        best = min(best, time.perf_counter() - start)
+
+    mb = input_bytes / (1024 * 1024)
+    return {
+        "dbms": dbms_type,
+        "file": name,
+        "scale": scale,
+        "operation": operation,
+        "parser_version": parser.parser_version,
+        "input_mb": round(mb, 3),
+        "records": records,
+        "seconds": round(best, 6),
+        "mb_per_s": round(mb / best, 3) if best else None,
+        "records_per_s": round(records / best, 1) if best else None,
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _result_key(result):
+    return result["dbms"], result["file"], result["scale"], result["operation"]
+
+
+def _print_comparison(results, baseline_path, regression_ratio=REGRESSION_RATIO):
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {_result_key(result): result for result in json.load(f)["results"]}
+
+    print(f"\n{baseline_path} 대비 (MB/s 비율, {regression_ratio:.0%} 미만이면 회귀)")
+    regressions = 0
+    for result in results:
+        previous = baseline.get(_result_key(result))
+        if not previous or not previous["mb_per_s"] or not result["mb_per_s"]:
+            continue
+        ratio = result["mb_per_s"] / previous["mb_per_s"]
+        mark = "  ⚠ 회귀" if ratio < regression_ratio else ""
+        regressions += ratio < regression_ratio
+        print(f"{result['dbms']:<11} {result['file']:<32} x{result['scale']:<4} {result['operation']:<24} "
+              f"{previous['mb_per_s']:>9.1f} → {result['mb_per_s']:>9.1f} MB/s ({ratio:.2f}x){mark}")
+    return regressions
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100], help="샘플을 N배로 이어 붙여 측정")
+    arg_parser.add_argument("--operations", choices=OPERATIONS, nargs="+", default=list(OPERATIONS))
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    arg_parser.add_argument("--output", default="benchmark_results.json", help="결과 JSON 파일 경로")
+    arg_parser.add_argument("--compare", help="비교할 이전 결과 JSON 파일 경로")
+    arg_parser.add_argument("--regression-ratio", type=float, default=REGRESSION_RATIO)
+    args = arg_parser.parse_args()
+
+    print(f"{'dbms':<11} {'file':<32} {'scale':>5} {'operation':<24} {'MB':>8} {'MB/s':>9} {'records/s':>12} {'RSS MB':>8}")
+    results = []
+    context = multiprocessing.get_context("spawn")
+    for dbms_type, name, _ in load_samples():
+        for scale in args.scales:
+            for operation in args.operations:
+                with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                    result = executor.submit(_measure, dbms_type, name, scale, operation, args.repeat).result()
+                results.append(result)
+                print(f"{dbms_type:<11} {name:<32} {scale:>5} {operation:<24} {result['input_mb']:>8.2f} "
+                      f"{result['mb_per_s'] or 0:>9.1f} {result['records_per_s'] or 0:>12.0f} {result['peak_rss_mb']:>8.1f}")
+
+    report = {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n결과 저장: {args.output}")
+
+    if args.compare:
+        regressions = _print_comparison(results, args.compare, args.regression_ratio)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+단일 패스 scan() 과 기존 2-pass(슬로우/오류 개별 추출) 방식 비교 벤치마크.
+
+실행: python -m benchmarks.bench_scan [--repeat N] [--scale N]
+"""
+import argparse
+import io
+import time
+
+from parser.mariadb import MariaDBLogParser
+from parser.mysql import MysqlLogParser
+from parser.postgresql import PostgresqlLogParser
+from benchmarks.samples import load_samples
+
+PARSERS = {
+    "postgresql": PostgresqlLogParser,
+    "mariadb": MariaDBLogParser,
+    "mysql": MysqlLogParser,
+}
+
+THRESHOLD_MS = 1000
+
+
+def _legacy_two_pass(parser, data):
+    # 기존 방식: 전체 디코딩 후 슬로우/오류 쿼리를 각각 전체 텍스트에 대해 추출
+    content = data.decode("utf-8")
+    return parser.extract_slow_queries(content, THRESHOLD_MS), parser.extract_error_queries(content)
+
+
+def _stream_two_pass(parser, data):
+    # 스트리밍 API 를 슬로우/오류 쿼리별로 한 번씩 (파일을 두 번 읽음)
+    slow_queries = list(parser.iter_slow_queries(io.BytesIO(data), THRESHOLD_MS))
+    error_queries = list(parser.iter_error_queries(io.BytesIO(data)))
+    return slow_queries, error_queries
+
+
+def _stream_scan(parser, data):
+    result = parser.scan(io.BytesIO(data), THRESHOLD_MS)
+    return result.slow_queries, result.error_queries
+
+
+def _best_of(func, parser, data, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(parser, data)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    arg_parser.add_argument("--scale", type=int, default=1, help="샘플을 N배로 이어 붙여 측정")
+    args = arg_parser.parse_args()
+
+    print(f"{'dbms':<11} {'file':<32} {'MB':>7} {'legacy':>9} {'stream2':>9} {'scan':>9} {'speedup':>8}")
+    for dbms_type, name, data in load_samples():
+        data = data * args.scale
+        parser = PARSERS[dbms_type]()
+
+        legacy_sec, expected = _best_of(_legacy_two_pass, parser, data, args.repeat)
+        stream_sec, _ = _best_of(_stream_two_pass, parser, data, args.repeat)
+        scan_sec, actual = _best_of(_stream_scan, parser, data, args.repeat)
+        assert actual == expected, f"{name}: scan 결과가 기존 방식과 다릅니다."
+
+        print(f"{dbms_type:<11} {name:<32} {len(data) / 1e6:>7.2f} "
+              f"{legacy_sec * 1000:>7.1f}ms {stream_sec * 1000:>7.1f}ms {scan_sec * 1000:>7.1f}ms "
+              f"{stream_sec / scan_sec:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
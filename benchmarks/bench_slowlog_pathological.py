@@ -0,0 +1,72 @@
+"""
+MySQL/MariaDB slow log 병적 입력(여러 줄 SQL + 세미콜론 누락) 회귀 벤치마크.
+
+기존 정규식(# Query_time: ... (?:.+\\n)*?(.+);)은 레코드마다 다음 세미콜론을 찾아
+파일 끝까지 백트래킹하므로 입력 크기에 대해 제곱 시간이 걸리고,
+상태 머신 파서는 선형 시간을 유지하는지 확인.
+
+실행: python -m benchmarks.bench_slowlog_pathological [--sizes 100 200 400 8000] [--legacy-max 400]
+"""
+import argparse
+import re
+import time
+
+from parser.mysql import MysqlLogParser
+
+LEGACY_SLOW_QUERY_PATTERN = re.compile(r'# Query_time: ([\d\.]+).+?\n(?:.+\n)*?(.+);', re.MULTILINE)
+
+# 입력 크기 증가율 대비 처리 시간 증가율이 이 배수를 넘으면 선형 시간 회귀로 판단
+MAX_LINEAR_GROWTH = 3.0
+
+
+def build_pathological_log(entries, body_lines=20):
+    """세미콜론 없이 끝나는 여러 줄 SQL 레코드로 구성된 slow log 생성"""
+    lines = []
+    for i in range(entries):
+        lines.append("# Time: 2025-07-09T09:03:58.000000Z")
+        lines.append("# User@Host: app[app] @ 10.0.0.1 []")
+        lines.append(f"# Query_time: {1 + i % 7}.250  Lock_time: 0.000 Rows_sent: 1  Rows_examined: {i}")
+        lines.append(f"SET timestamp={1720000000 + i}")
+        lines.append("SELECT o.id, o.total")
+        lines.extend(f"  , c{j}.name FROM orders o JOIN customers c{j} ON c{j}.id = o.customer_id" for j in range(body_lines))
+        lines.append(f"WHERE o.id = {i}")
+    return "\n".join(lines) + "\n"
+
+
+def _time(func, text):
+    start = time.perf_counter()
+    result = func(text)
+    return time.perf_counter() - start, result
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--sizes", type=int, nargs="+", default=[100, 200, 400, 2000, 8000])
+    arg_parser.add_argument("--legacy-max", type=int, default=400, help="기존 정규식은 이 레코드 수까지만 측정 (제곱 시간)")
+    args = arg_parser.parse_args()
+
+    parser = MysqlLogParser()
+    print(f"{'entries':>8} {'MB':>6} {'legacy':>10} {'state machine':>14} {'records':>8}")
+
+    first = None
+    for entries in args.sizes:
+        text = build_pathological_log(entries)
+        legacy = "skipped"
+        if entries <= args.legacy_max:
+            legacy_sec, _ = _time(LEGACY_SLOW_QUERY_PATTERN.findall, text)
+            legacy = f"{legacy_sec * 1000:.1f}ms"
+        parser_sec, records = _time(lambda t: parser.extract_slow_queries(t, 0), text)
+        assert len(records) == entries, "레코드마다 정확히 하나의 결과가 나와야 합니다."
+
+        print(f"{entries:>8} {len(text) / 1e6:>6.2f} {legacy:>10} {parser_sec * 1000:>12.1f}ms {len(records):>8}")
+
+        # 입력 크기 대비 처리 시간 증가율이 선형 범위인지 검사
+        if first is None:
+            first = (entries, parser_sec)
+        else:
+            growth = (parser_sec / first[1]) / (entries / first[0])
+            assert growth < MAX_LINEAR_GROWTH, f"상태 머신 파서가 선형 시간을 벗어났습니다 (x{growth:.1f})"
+
+
+if __name__ == "__main__":
+    main()
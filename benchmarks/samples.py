@@ -0,0 +1,25 @@
+import os
+import zipfile
+
+SAMPLES_ZIP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "samples.zip")
+
+# samples.zip 폴더명 → dbms_type
+SAMPLE_DIRS = {
+    "01.PostgresSQL": "postgresql",
+    "02.MariaDB": "mariadb",
+    "03.MySQL": "mysql",
+}
+
+
+def load_samples(path=SAMPLES_ZIP):
+    """samples.zip 의 로그 파일을 [(dbms_type, 파일명, bytes)] 로 반환"""
+    samples = []
+    with zipfile.ZipFile(path) as zf:
+        for info in zf.infolist():
+            if info.is_dir():
+                continue
+            folder, _, name = info.filename.partition("/")
+            dbms_type = SAMPLE_DIRS.get(folder)
+            if dbms_type:
+                samples.append((dbms_type, name, zf.read(info)))
+    return samples
@@ -0,0 +1,70 @@
+from database.setup_database import get_connection
+
+def save_digest_snapshot(project_code, dbms_type, label, digests, created_by):
+    """fingerprint 별 집계(QueryDigest 목록)를 전/후 비교용 분석으로 저장하고 snapshot id 반환"""
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute('''
+        INSERT INTO digest_snapshots (project_code, dbms_type, label, slow_query_count, created_by)
+        VALUES (?, ?, ?, ?, ?)
+    ''', (project_code, dbms_type, label, sum(digest.count for digest in digests), created_by))
+    snapshot_id = cur.lastrowid
+    cur.executemany('''
+        INSERT INTO digest_snapshot_stats (snapshot_id, fingerprint_id, fingerprint, count, total_ms, mean_ms, p95_ms, max_ms)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ''', (
+        (snapshot_id, digest.fingerprint_id, digest.fingerprint, digest.count, digest.total_ms, digest.mean_ms, digest.p95_ms, digest.max_ms)
+        for digest in digests
+    ))
+    conn.commit()
+    conn.close()
+    return snapshot_id
+
+
+def list_digest_snapshots(project_code, dbms_type):
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute('''
+        SELECT id, label, slow_query_count, created_by, created_at
+        FROM digest_snapshots
+        WHERE project_code = ? AND dbms_type = ?
+        ORDER BY created_at DESC, id DESC
+    ''', (project_code, dbms_type))
+    rows = cur.fetchall()
+    conn.close()
+
+    return [
+        {
+            "id": r[0],
+            "label": r[1],
+            "slow_query_count": r[2],
+            "created_by": r[3],
+            "created_at": r[4]
+        }
+        for r in rows
+    ]
+
+
+def get_digest_snapshot_stats(snapshot_id):
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute('''
+        SELECT fingerprint_id, fingerprint, count, total_ms, mean_ms, p95_ms, max_ms
+        FROM digest_snapshot_stats
+        WHERE snapshot_id = ?
+    ''', (snapshot_id,))
+    rows = cur.fetchall()
+    conn.close()
+
+    return [
+        {
+            "fingerprint_id": r[0],
+            "fingerprint": r[1],
+            "count": r[2],
+            "total_ms": r[3],
+            "mean_ms": r[4],
+            "p95_ms": r[5],
+            "max_ms": r[6]
+        }
+        for r in rows
+    ]
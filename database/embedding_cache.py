@@ -0,0 +1,39 @@
+import numpy as np
+from database.setup_database import get_connection
+
+# SQLite 변수 개수 제한(기본 999) 안에서 한 번에 조회할 해시 수
+_LOOKUP_CHUNK_SIZE = 500
+
+
+def get_cached_embeddings(text_hashes, deployment):
+    """텍스트 해시 목록 중 캐시에 있는 임베딩을 {해시: 벡터(list)} 로 반환"""
+    text_hashes = list(dict.fromkeys(text_hashes))
+    conn = get_connection()
+    cur = conn.cursor()
+    embeddings = {}
+    for start in range(0, len(text_hashes), _LOOKUP_CHUNK_SIZE):
+        chunk = text_hashes[start:start + _LOOKUP_CHUNK_SIZE]
+        cur.execute(f'''
+            SELECT text_hash, embedding
+            FROM embedding_cache
+            WHERE deployment = ? AND text_hash IN ({", ".join("?" * len(chunk))})
+        ''', [deployment] + chunk)
+        for text_hash, blob in cur.fetchall():
+            embeddings[text_hash] = np.frombuffer(blob, dtype=np.float32).tolist()
+    conn.close()
+    return embeddings
+
+
+def save_cached_embeddings(embeddings, deployment):
+    """{텍스트 해시: 벡터} 를 float32 BLOB 으로 저장 (같은 해시는 덮어씀)"""
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.executemany('''
+        INSERT OR REPLACE INTO embedding_cache (text_hash, deployment, dimensions, embedding)
+        VALUES (?, ?, ?, ?)
+    ''', (
+        (text_hash, deployment, len(embedding), np.asarray(embedding, dtype=np.float32).tobytes())
+        for text_hash, embedding in embeddings.items()
+    ))
+    conn.commit()
+    conn.close()
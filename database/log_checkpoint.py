@@ -0,0 +1,38 @@
+from database.setup_database import get_connection
+
+def get_log_checkpoint(project_code, dbms_type, path):
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute('''
+        SELECT inode, byte_offset, head_hash, last_time, updated_at
+        FROM log_checkpoints
+        WHERE project_code = ? AND dbms_type = ? AND path = ?
+    ''', (project_code, dbms_type, path))
+    row = cur.fetchone()
+    conn.close()
+
+    if row is None:
+        return None
+    return {
+        "inode": row[0],
+        "offset": row[1],
+        "head_hash": row[2],
+        "last_time": row[3],
+        "updated_at": row[4]
+    }
+
+
+def save_log_checkpoint(project_code, dbms_type, path, inode, offset, head_hash=None, last_time=None):
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute('''
+        INSERT INTO log_checkpoints (project_code, dbms_type, path, inode, byte_offset, head_hash, last_time)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (project_code, dbms_type, path)
+        DO UPDATE SET inode = excluded.inode, byte_offset = excluded.byte_offset, head_hash = excluded.head_hash,
+                      last_time = excluded.last_time,
+                      updated_at = CURRENT_TIMESTAMP
+    ''', (project_code, dbms_type, path, inode, offset, head_hash, last_time))
+    conn.commit()
+    conn.close()
+
@@ -16,6 +16,10 @@ def init_db():
     # user_projects 테이블: 사용자 ↔ 프로젝트 다대다 매핑
     # login_logs 테이블: 로그인 이력 관리
     # query_logs 테이블: 쿼리 분석 로그 
+    # log_checkpoints 테이블: 서버 로그 증분 분석 위치 (프로젝트/DBMS/경로별 inode, 오프셋, copytruncate 회전 판별용 앞부분 해시, slow log 의 마지막 '# Time')
+    # digest_snapshots / digest_snapshot_stats 테이블: 전/후 비교용으로 저장한 분석의 fingerprint 별 집계
+    # suggestion_cache / suggestion_cache_stats 테이블: AI 튜닝 제안 캐시 (fingerprint/DBMS/언어/프롬프트·모델 버전별) 및 적중/미스 횟수
+    # embedding_cache 테이블: 정규화한 텍스트 해시 + 임베딩 배포별 임베딩 벡터 (float32 BLOB)
     cur.executescript('''
         PRAGMA foreign_keys = ON;
                       
@@ -75,6 +79,74 @@ def init_db():
             FOREIGN KEY (user_id) REFERENCES users(user_id),
             FOREIGN KEY (project_code) REFERENCES projects(project_code)
         );
+
+        CREATE TABLE IF NOT EXISTS log_checkpoints (
+            project_code TEXT,
+            dbms_type TEXT,
+            path TEXT,
+            inode INTEGER,
+            byte_offset INTEGER DEFAULT 0,
+            head_hash TEXT,
+            last_time TEXT,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (project_code, dbms_type, path),
+            FOREIGN KEY (project_code) REFERENCES projects(project_code)
+        );
+
+        CREATE TABLE IF NOT EXISTS digest_snapshots (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            project_code TEXT,
+            dbms_type TEXT,
+            label TEXT,
+            slow_query_count INTEGER,
+            created_by TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (project_code) REFERENCES projects(project_code),
+            FOREIGN KEY (created_by) REFERENCES users(user_id)
+        );
+
+        CREATE TABLE IF NOT EXISTS digest_snapshot_stats (
+            snapshot_id INTEGER,
+            fingerprint_id TEXT,
+            fingerprint TEXT,
+            count INTEGER,
+            total_ms REAL,
+            mean_ms REAL,
+            p95_ms REAL,
+            max_ms REAL,
+            PRIMARY KEY (snapshot_id, fingerprint_id),
+            FOREIGN KEY (snapshot_id) REFERENCES digest_snapshots(id) ON DELETE CASCADE
+        );
+
+        CREATE TABLE IF NOT EXISTS suggestion_cache (
+            fingerprint_id TEXT,
+            dbms_type TEXT,
+            query_type TEXT,
+            language TEXT,
+            prompt_version TEXT,
+            model_version TEXT,
+            suggestion TEXT,
+            hit_count INTEGER DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            last_used_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (fingerprint_id, dbms_type, query_type, language, prompt_version, model_version)
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_suggestion_cache_last_used_at ON suggestion_cache (last_used_at);
+
+        CREATE TABLE IF NOT EXISTS suggestion_cache_stats (
+            outcome TEXT PRIMARY KEY,
+            count INTEGER DEFAULT 0
+        );
+
+        CREATE TABLE IF NOT EXISTS embedding_cache (
+            text_hash TEXT,
+            deployment TEXT,
+            dimensions INTEGER,
+            embedding BLOB,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (text_hash, deployment)
+        );
     ''')
 
     # 최초 관리자 계정 자동 생성
@@ -0,0 +1,75 @@
+from database.setup_database import get_connection
+
+def _record_outcome(cur, outcome):
+    cur.execute('''
+        INSERT INTO suggestion_cache_stats (outcome, count)
+        VALUES (?, 1)
+        ON CONFLICT (outcome) DO UPDATE SET count = count + 1
+    ''', (outcome,))
+
+
+def get_cached_suggestion(fingerprint_id, dbms_type, query_type, language, prompt_version, model_version, ttl_seconds):
+    """캐시된 튜닝 제안 반환 (없거나 TTL 이 지났으면 None), 적중/미스 횟수 기록"""
+    conn = get_connection()
+    cur = conn.cursor()
+    key = (fingerprint_id, dbms_type, query_type, language, prompt_version, model_version)
+    cur.execute('''
+        SELECT suggestion
+        FROM suggestion_cache
+        WHERE fingerprint_id = ? AND dbms_type = ? AND query_type = ? AND language = ? AND prompt_version = ? AND model_version = ?
+          AND created_at >= datetime('now', ?)
+    ''', key + (f"-{int(ttl_seconds)} seconds",))
+    row = cur.fetchone()
+
+    if row is None:
+        _record_outcome(cur, "miss")
+    else:
+        _record_outcome(cur, "hit")
+        cur.execute('''
+            UPDATE suggestion_cache
+            SET hit_count = hit_count + 1, last_used_at = CURRENT_TIMESTAMP
+            WHERE fingerprint_id = ? AND dbms_type = ? AND query_type = ? AND language = ? AND prompt_version = ? AND model_version = ?
+        ''', key)
+    conn.commit()
+    conn.close()
+    return row[0] if row else None
+
+
+def save_cached_suggestion(fingerprint_id, dbms_type, query_type, language, prompt_version, model_version, suggestion, ttl_seconds, max_entries):
+    """튜닝 제안 저장 후 TTL 이 지난 항목 삭제, max_entries 를 넘으면 가장 오래 쓰이지 않은 항목부터 삭제"""
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute('''
+        INSERT INTO suggestion_cache (fingerprint_id, dbms_type, query_type, language, prompt_version, model_version, suggestion)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (fingerprint_id, dbms_type, query_type, language, prompt_version, model_version)
+        DO UPDATE SET suggestion = excluded.suggestion, hit_count = 0,
+                      created_at = CURRENT_TIMESTAMP, last_used_at = CURRENT_TIMESTAMP
+    ''', (fingerprint_id, dbms_type, query_type, language, prompt_version, model_version, suggestion))
+    cur.execute("DELETE FROM suggestion_cache WHERE created_at < datetime('now', ?)", (f"-{int(ttl_seconds)} seconds",))
+    cur.execute('''
+        DELETE FROM suggestion_cache
+        WHERE rowid IN (
+            SELECT rowid FROM suggestion_cache
+            ORDER BY last_used_at DESC, rowid DESC
+            LIMIT -1 OFFSET ?
+        )
+    ''', (max_entries,))
+    conn.commit()
+    conn.close()
+
+
+def get_suggestion_cache_stats():
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute("SELECT outcome, count FROM suggestion_cache_stats")
+    counts = dict(cur.fetchall())
+    cur.execute("SELECT COUNT(*) FROM suggestion_cache")
+    entries = cur.fetchone()[0]
+    conn.close()
+
+    return {
+        "hits": counts.get("hit", 0),
+        "misses": counts.get("miss", 0),
+        "entries": entries
+    }
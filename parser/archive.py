@@ -0,0 +1,170 @@
+import multiprocessing
+import os
+import shutil
+import tarfile
+import tempfile
+import zipfile
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from .base import ScanResult
+from .compression import detect_compression, open_decompressed
+from .parallel import PARSE_PARALLEL_MIN_BYTES, PARSE_WORKERS, parallel_scan_file
+from .records import LogSource
+from .registry import detect_parser, get_parser
+
+# 여러 로그를 한 번에 올리는 묶음 파일 확장자 (tar 는 gz/bz2/xz/zst 압축도 가능)
+ARCHIVE_FILE_TYPES = ["zip", "tar", "tgz"]
+
+# 압축 해제된 로그 임시 파일 (name: 표시 이름 '묶음/폴더/파일', upload_name: 원래 업로드 파일명)
+LogFile = namedtuple("LogFile", ["name", "path", "upload_name", "size"])
+
+_TAR_MAGIC_OFFSET = 257
+
+
+def _is_tar(fileobj, name=None):
+    """(압축을 풀어) tar 헤더의 ustar 매직으로 tar 묶음인지 판별"""
+    try:
+        with open_decompressed(fileobj, name) as stream:
+            header = stream.read(_TAR_MAGIC_OFFSET + 5)
+    except (OSError, EOFError, ValueError):
+        return False
+    finally:
+        fileobj.seek(0)
+    return header[_TAR_MAGIC_OFFSET:_TAR_MAGIC_OFFSET + 5] == b"ustar"
+
+
+def is_archive(fileobj, name=None):
+    """업로드 파일이 여러 로그를 담은 zip/tar 묶음인지 판별 (읽기 위치는 처음으로 복원)"""
+    fileobj.seek(0)
+    archive = zipfile.is_zipfile(fileobj)
+    fileobj.seek(0)
+    return archive or _is_tar(fileobj, name)
+
+
+def _is_hidden(member_name):
+    # macOS 압축 시 생기는 __MACOSX/, .DS_Store 등은 제외
+    # (`tar czf logs.tgz .` 로 만든 ./slow.log 처럼 빈 경로/"." 구간은 숨김 파일이 아님)
+    return any(part.startswith(".") or part == "__MACOSX" for part in member_name.split("/") if part not in ("", ".", ".."))
+
+
+def _iter_archive_members(fileobj, name=None):
+    """zip/tar 묶음의 일반 파일을 (멤버 경로, 읽기용 파일 객체) 로 순서대로 반환 (tar 는 스트리밍으로 읽음)"""
+    fileobj.seek(0)
+    if zipfile.is_zipfile(fileobj):
+        fileobj.seek(0)
+        with zipfile.ZipFile(fileobj) as zf:
+            for info in zf.infolist():
+                if not info.is_dir() and not _is_hidden(info.filename):
+                    with zf.open(info) as member:
+                        yield info.filename, member
+        return
+
+    with open_decompressed(fileobj, name) as stream, tarfile.open(fileobj=stream, mode="r|") as tf:
+        for info in tf:
+            if info.isfile() and not _is_hidden(info.name):
+                yield info.name, tf.extractfile(info)
+
+
+def _write_log_file(source, directory, name):
+    """멤버/업로드 파일을 임시 파일로 쓰고 경로 반환 (gz 등으로 압축된 로그는 풀어서 저장)"""
+    fd, path = tempfile.mkstemp(prefix="query-log-", suffix=".log", dir=directory)
+    with os.fdopen(fd, "wb") as f:
+        shutil.copyfileobj(source, f, 1024 * 1024)
+
+    with open(path, "rb") as f:
+        if detect_compression(f, name) is None:
+            return path
+        fd, plain_path = tempfile.mkstemp(prefix="query-log-", suffix=".log", dir=directory)
+        with open_decompressed(f, name) as stream, os.fdopen(fd, "wb") as plain:
+            shutil.copyfileobj(stream, plain, 1024 * 1024)
+    os.remove(path)
+    return plain_path
+
+
+@contextmanager
+def extract_log_files(uploads):
+    """
+    업로드 파일 목록(zip/tar 묶음 포함)을 압축 해제된 임시 로그 파일 [LogFile] 로 제공하고, 사용이 끝나면 삭제.
+    묶음 안의 로그는 '묶음 파일명/멤버 경로' 로 표시하며, 묶음 안의 gz 등 압축 로그도 풀어서 제공.
+    """
+    directory = tempfile.mkdtemp(prefix="query-logs-")
+    try:
+        log_files = []
+        for upload in uploads:
+            if is_archive(upload, upload.name):
+                for member_name, member in _iter_archive_members(upload, upload.name):
+                    path = _write_log_file(member, directory, member_name)
+                    log_files.append(LogFile(f"{upload.name}/{member_name}", path, upload.name, os.path.getsize(path)))
+            else:
+                upload.seek(0)
+                path = _write_log_file(upload, directory, upload.name)
+                log_files.append(LogFile(upload.name, path, upload.name, os.path.getsize(path)))
+            upload.seek(0)
+        yield log_files
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def resolve_log_parsers(log_files, format_id=None):
+    """
+    로그 파일마다 파서 결정: format_id 를 지정하면 모두 같은 파서, 아니면 파일별 앞부분으로 자동 감지.
+    [(LogFile, 파서)] 와 형식을 감지하지 못한 LogFile 목록을 반환.
+    """
+    resolved = []
+    skipped = []
+    for log_file in log_files:
+        if format_id is not None:
+            resolved.append((log_file, get_parser(format_id)))
+            continue
+        # 임시 파일은 이미 압축을 풀었으므로 표시 이름(.gz 등)의 확장자로 판별하지 않음
+        with open(log_file.path, "rb") as f:
+            parser, _ = detect_parser(f)
+        if parser is None:
+            skipped.append(log_file)
+        else:
+            resolved.append((log_file, parser))
+    return resolved, skipped
+
+
+def _set_source(result, source):
+    for record in result.slow_queries:
+        record.source = source
+    for record in result.error_queries:
+        record.source = source
+    return result
+
+
+def _scan_log_file(task):
+    """(워커 프로세스) 로그 파일 하나를 스캔하고 레코드에 출처 기록"""
+    parser, path, source, threshold_ms = task
+    return _set_source(parser.scan_file(path, threshold_ms), source)
+
+
+def scan_log_files(resolved, threshold_ms=0, workers=None):
+    """
+    [(LogFile, 파서)] 를 프로세스 풀에서 파일 단위로 동시에 스캔해 입력 순서대로 병합 (레코드마다 LogSource 출처 기록).
+    파일이 하나면 구간 분할 병렬 파싱, 전체 크기가 작거나 workers 가 1 이면 현재 프로세스에서 순차 처리.
+    """
+    workers = PARSE_WORKERS if workers is None else workers
+    tasks = [
+        (parser, log_file.path, LogSource(log_file.name, parser.get_format_id(), parser.dbms_type), threshold_ms)
+        for log_file, parser in resolved
+    ]
+
+    if len(tasks) == 1:
+        parser, path, source, threshold_ms = tasks[0]
+        parts = [_set_source(parallel_scan_file(parser, path, threshold_ms, workers), source)]
+    elif workers <= 1 or sum(log_file.size for log_file, _ in resolved) < PARSE_PARALLEL_MIN_BYTES:
+        parts = [_scan_log_file(task) for task in tasks]
+    else:
+        # Streamlit 처럼 스레드가 있는 프로세스에서 fork 는 교착 위험이 있으므로 spawn 사용
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks)), mp_context=context) as executor:
+            parts = list(executor.map(_scan_log_file, tasks))
+
+    result = ScanResult([], [])
+    for part in parts:
+        result.slow_queries.extend(part.slow_queries)
+        result.error_queries.extend(part.error_queries)
+    return result
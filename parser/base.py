@@ -1,6 +1,179 @@
+import re
 from abc import ABC, abstractmethod
+from collections import namedtuple
+from .fingerprint import HASH_COMMENT_PATTERNS, sql_dialect
+from .stream import iter_log_blocks, open_mmap
+
+# 단일 패스 스캔 결과 (slow_queries: [SlowQuery], error_queries: [ErrorQuery])
+ScanResult = namedtuple("ScanResult", ["slow_queries", "error_queries"])
+
+# SQL 특징 (tables: 등장 순서의 테이블명, patterns: SELECT/JOIN/GROUP_BY 등, statement_type: 최상위 문장 종류)
+SqlFeatures = namedtuple("SqlFeatures", ["tables", "patterns", "statement_type"])
+
+# SQL 토큰: 문자열/주석은 건너뛰고 단어, 인용 식별자, 괄호, 콤마만 반환 ('#' 주석은 방언별로 다름)
+def _compile_sql_token_pattern(hash_comment):
+    return re.compile(
+        r"'(?:[^'\\]|\\.|'')*'"          # 'string'
+        r"|\$(\w*)\$.*?\$\1\$"              # $$dollar quoted$$ (PostgreSQL)
+        r"|--[^\n]*|/\*.*?\*/"               # 주석
+        + (f"|{hash_comment}" if hash_comment else "")
+        + r"|(?P<word>[A-Za-z_][\w$]*(?:\s*\.\s*(?:[A-Za-z_][\w$]*|\"[^\"]*\"|`[^`]*`))*)"
+        r"|(?P<quoted>(?:\"[^\"]*\"|`[^`]*`)(?:\s*\.\s*(?:[A-Za-z_][\w$]*|\"[^\"]*\"|`[^`]*`))*)"
+        r"|(?P<punct>[(),])",
+        re.DOTALL
+    )
+
+
+_SQL_TOKEN_PATTERNS = {dialect: _compile_sql_token_pattern(pattern) for dialect, pattern in HASH_COMMENT_PATTERNS.items()}
+# 패턴 출력 순서 (기존 extract_sql_features 와 동일)
+_SQL_PATTERN_ORDER = ("SELECT", "INSERT", "UPDATE", "DELETE", "JOIN", "GROUP_BY", "ORDER_BY", "HAVING", "SUBQUERY")
+_STATEMENT_KEYWORDS = frozenset((
+    "SELECT", "INSERT", "UPDATE", "DELETE", "REPLACE", "MERGE", "CREATE", "ALTER", "DROP", "TRUNCATE",
+    "CALL", "EXPLAIN", "SHOW", "SET", "BEGIN", "COMMIT", "ROLLBACK", "GRANT", "REVOKE", "COPY", "VACUUM", "ANALYZE",
+))
+# FROM 목록(FROM a, b)을 끝내는 예약어 (별칭이 아닌 단어)
+_CLAUSE_KEYWORDS = frozenset((
+    "WHERE", "GROUP", "ORDER", "HAVING", "LIMIT", "OFFSET", "JOIN", "INNER", "LEFT", "RIGHT", "FULL", "CROSS",
+    "NATURAL", "STRAIGHT_JOIN", "ON", "USING", "UNION", "INTERSECT", "EXCEPT", "SET", "VALUES", "SELECT", "WINDOW",
+    "FOR", "RETURNING", "INTO", "FETCH", "LATERAL", "LOCK", "PROCEDURE",
+))
+
+
+def _table_name(token):
+    # 인용 부호와 점 주변 공백 제거 (예: `db` . `users` → db.users)
+    return re.sub(r'\s*\.\s*', ".", token).replace('"', "").replace("`", "")
+
+
+def extract_sql_features(sql, dbms_type=None):
+    """
+    SQL 을 한 번만 토큰화하며 테이블/문장 종류/JOIN/GROUP BY/ORDER BY/HAVING/서브쿼리를 추출.
+    문자열 리터럴과 주석 안의 키워드는 무시하고, 백트래킹이 생기는 정규식을 쓰지 않아 긴 SQL 에서도 선형 시간.
+    '#' 은 dbms_type 이 MySQL/MariaDB 일 때만 주석으로 처리 (PostgreSQL 에서는 #>, #>> 등 연산자).
+    """
+    tables = []
+    found = set()
+    statement_type = None
+    depth = 0
+    prev = None              # 직전 토큰 (단어는 대문자)
+    expect_table = False     # 다음 식별자가 테이블명인지
+    from_depth = None        # FROM 목록(FROM a, b) 이 열린 괄호 깊이
+    update_depth = None      # UPDATE ... SET 판별용
+
+    for match in _SQL_TOKEN_PATTERNS[sql_dialect(dbms_type)].finditer(sql):
+        word, quoted, punct = match.group("word"), match.group("quoted"), match.group("punct")
+        if punct:
+            if punct == "(":
+                depth += 1
+                expect_table = False
+            elif punct == ")":
+                depth -= 1
+                if from_depth is not None and depth < from_depth:
+                    from_depth = None
+            elif from_depth == depth:
+                expect_table = True
+            prev = punct
+            continue
+
+        if quoted:
+            if expect_table:
+                tables.append(_table_name(quoted))
+                expect_table = False
+            prev = "IDENT"
+            continue
+        if not word:
+            continue  # 문자열/주석
+
+        keyword = word.upper()
+        if expect_table and keyword not in _CLAUSE_KEYWORDS and keyword not in ("ONLY", "IGNORE", "LOW_PRIORITY", "QUICK"):
+            tables.append(_table_name(word))
+            expect_table = False
+            prev = "IDENT"
+            continue
+        expect_table = False
+
+        if depth == 0 and statement_type is None and keyword in _STATEMENT_KEYWORDS:
+            statement_type = keyword
+
+        if keyword == "SELECT":
+            if prev == "(":
+                found.add("SUBQUERY")
+            found.add("SELECT_KEYWORD")
+        elif keyword == "FROM":
+            if statement_type == "DELETE" and "DELETE" not in found:
+                found.add("DELETE")
+            elif "SELECT_KEYWORD" in found:
+                found.add("SELECT")
+            expect_table = True
+            from_depth = depth
+        elif keyword == "JOIN" or keyword == "STRAIGHT_JOIN":
+            found.add("JOIN")
+            expect_table = True
+            from_depth = None
+        elif keyword == "INTO":
+            # SELECT ... INTO 변수 는 제외
+            if statement_type in ("INSERT", "REPLACE", "MERGE"):
+                found.add("INSERT")
+                expect_table = True
+        elif keyword == "UPDATE":
+            # ON DUPLICATE KEY UPDATE / FOR UPDATE 는 UPDATE 문이 아님
+            if prev not in ("KEY", "FOR"):
+                expect_table = True
+                update_depth = depth
+        elif keyword == "SET":
+            if update_depth == depth:
+                found.add("UPDATE")
+                update_depth = None
+        elif keyword == "BY":
+            if prev == "GROUP":
+                found.add("GROUP_BY")
+            elif prev == "ORDER":
+                found.add("ORDER_BY")
+        elif keyword == "HAVING":
+            found.add("HAVING")
+
+        if from_depth is not None and from_depth == depth and keyword in _CLAUSE_KEYWORDS:
+            from_depth = None
+        prev = keyword
+
+    unique_tables = list(dict.fromkeys(tables))
+    patterns = [pattern for pattern in _SQL_PATTERN_ORDER if pattern in found]
+    return SqlFeatures(unique_tables, patterns, statement_type)
+
+
+def extract_sql_features_batch(sqls, dbms_type=None):
+    """여러 SQL 의 특징을 순서대로 추출 (같은 SQL 은 한 번만 분석)"""
+    cache = {}
+    results = []
+    for sql in sqls:
+        features = cache.get(sql)
+        if features is None:
+            features = cache[sql] = extract_sql_features(sql, dbms_type)
+        results.append(features)
+    return results
+
+
+def carry_last_time(slow_queries, last_time):
+    """
+    앞 블록/구간의 마지막 시각(last_time)을 이 블록의 시각 없는 레코드에 채움.
+    시각 헤더가 바뀔 때만 기록되는 로그(MySQL/MariaDB '# Time')를 나눠 읽어도 순차로 읽은 것과 같은 결과.
+    """
+    if last_time is not None:
+        for query in slow_queries:
+            if query.timestamp is None:
+                query.timestamp = last_time
+    return slow_queries
+
 
 class BaseLogParser(ABC):
+    # 파싱 결과가 달라지는 변경 시 올려서 파싱 캐시를 무효화
+    parser_version = "1"
+    # 검색 필터/Blob 경로에 쓰는 DBMS 식별자 (예: 'postgresql')
+    dbms_type = None
+    # 같은 DBMS 의 다른 로그 형식 구분 (예: 'csvlog'), 기본 텍스트 로그는 None
+    log_format = None
+    # 스트리밍 파싱 시 블록 분할 경계 패턴 (이전 줄 시작에서 match 되면 다음 줄부터 새 레코드)
+    record_boundary_pattern = None
+
     @abstractmethod
     def extract_slow_queries(self, log_text: str, threshold_ms: int):
         """슬로우 쿼리 추출"""
@@ -11,12 +184,82 @@ class BaseLogParser(ABC):
         """오류 쿼리 추출"""
         pass
 
-    @abstractmethod
     def extract_sql_features(self, sql: str):
-        """SQL에서 테이블명, 쿼리 패턴 등 추출"""
-        pass
+        """
+        SQL에서 (테이블명, 쿼리 패턴) 추출 (DBMS 공통 토크나이저 사용).
+        문장 종류(statement_type)까지 필요하면 모듈 함수 extract_sql_features 의 SqlFeatures 사용.
+        """
+        features = extract_sql_features(sql, self.dbms_type)
+        return features.tables, features.patterns
+
+    def extract_sql_features_batch(self, sqls) -> list:
+        """여러 SQL 의 (테이블명, 쿼리 패턴) 을 한 번에 추출 (입력 순서 유지)"""
+        return [(features.tables, features.patterns) for features in extract_sql_features_batch(sqls, self.dbms_type)]
 
     @abstractmethod
     def get_dbms_name(self):
         """DBMS 이름 반환 (예: 'PostgreSQL', 'MySQL')"""
-        pass
\ No newline at end of file
+        pass
+
+    @classmethod
+    def get_format_id(cls):
+        """파서 레지스트리 식별자 (예: 'postgresql', 'postgresql-csvlog')"""
+        return f"{cls.dbms_type}-{cls.log_format}" if cls.log_format else cls.dbms_type
+
+    def score(self, head: str) -> float:
+        """
+        로그 앞부분(head)이 이 파서의 형식일 가능성 (0.0 ~ 1.0).
+        파서 레지스트리의 자동 감지에 사용하며, 기본값 0.0 은 감지 대상에서 제외.
+        """
+        return 0.0
+
+    def find_last_time(self, text, start=0, end=None):
+        """
+        블록/구간 [start, end) 에서 다음 블록으로 넘길 마지막 시각 헤더 값 (기본 None).
+        시각이 바뀔 때만 헤더를 기록하는 형식(MySQL/MariaDB slow log)만 재정의.
+        """
+        return None
+
+    def iter_slow_queries(self, fileobj, threshold_ms: int):
+        """파일 객체(바이너리/텍스트)에서 슬로우 쿼리를 블록 단위로 순차 추출"""
+        last_time = None
+        for block in iter_log_blocks(fileobj, self.record_boundary_pattern):
+            yield from carry_last_time(self.extract_slow_queries(block, threshold_ms), last_time)
+            last_time = self.find_last_time(block) or last_time
+
+    def iter_error_queries(self, fileobj):
+        """파일 객체(바이너리/텍스트)에서 오류 쿼리를 블록 단위로 순차 추출"""
+        for block in iter_log_blocks(fileobj, self.record_boundary_pattern):
+            yield from self.extract_error_queries(block)
+
+    def scan(self, log, threshold_ms: int) -> ScanResult:
+        """
+        슬로우/오류 쿼리를 한 번의 읽기로 함께 추출.
+        log 는 문자열 또는 파일 객체(바이너리/텍스트) 모두 가능하며,
+        파일은 한 번만 읽고 디코딩한 블록마다 클래스에 미리 compile 된 패턴을 적용.
+        """
+        if isinstance(log, str):
+            blocks = (log,)
+        else:
+            blocks = iter_log_blocks(log, self.record_boundary_pattern)
+
+        result = ScanResult([], [])
+        last_time = None
+        for block in blocks:
+            result.slow_queries.extend(carry_last_time(self.extract_slow_queries(block, threshold_ms), last_time))
+            result.error_queries.extend(self.extract_error_queries(block))
+            last_time = self.find_last_time(block) or last_time
+        return result
+
+    def scan_buffer(self, buffer, threshold_ms: int, start=0, end=None) -> ScanResult:
+        """
+        bytes/mmap 버퍼의 [start, end) 구간을 스캔.
+        기본 구현은 구간을 디코딩해 scan 에 위임하며, 바이트 단위 파싱이 가능한 파서는 재정의.
+        """
+        end = len(buffer) if end is None else end
+        return self.scan(bytes(buffer[start:end]).decode("utf-8", "replace"), threshold_ms)
+
+    def scan_file(self, path, threshold_ms: int) -> ScanResult:
+        """디스크 파일을 mmap 으로 열어 복사/전체 디코딩 없이 스캔"""
+        with open_mmap(path) as buffer:
+            return self.scan_buffer(buffer, threshold_ms)
@@ -0,0 +1,159 @@
+import hashlib
+import os
+import pickle
+import threading
+from collections import OrderedDict, namedtuple
+from .compression import open_decompressed
+from .index import DurationIndex
+from .parallel import parallel_scan_file
+from .sampling import scan_bounded
+from .stream import spill_to_file
+
+# 메모리에 보관할 최대 레코드 수 (슬로우 + 오류 쿼리 합계 기준)
+PARSE_CACHE_MAX_RECORDS = int(os.getenv("PARSE_CACHE_MAX_RECORDS", "2000000"))
+# 디스크 캐시 경로 (미설정 시 메모리 캐시만 사용)
+PARSE_CACHE_DIR = os.getenv("PARSE_CACHE_DIR")
+PARSE_CACHE_MAX_FILES = int(os.getenv("PARSE_CACHE_MAX_FILES", "64"))
+# 캐시 항목 형식이 바뀌면 올려서 기존 디스크 캐시를 무효화
+CACHE_FORMAT_VERSION = "3"
+
+# 캐시 항목: threshold 0 의 전체 파싱 결과 + 실행 시간 인덱스
+ParsedLog = namedtuple("ParsedLog", ["scan_result", "duration_index"])
+
+
+def hash_fileobj(fileobj, chunk_size=1024 * 1024):
+    """파일 객체 전체 내용의 SHA-256 (청크 단위로 읽으며, 읽기 위치는 원래대로 복원)"""
+    position = fileobj.tell()
+    fileobj.seek(0)
+    digest = hashlib.sha256()
+    while True:
+        chunk = fileobj.read(chunk_size)
+        if not chunk:
+            break
+        digest.update(chunk if isinstance(chunk, bytes) else chunk.encode("utf-8"))
+    fileobj.seek(position)
+    return digest.hexdigest()
+
+
+class ParseCache:
+    """
+    로그 파싱 결과(ParsedLog) 캐시.
+    (내용 해시, DBMS, 파서 버전) 단위로 threshold 0 의 전체 결과와 실행 시간 인덱스를 보관하며,
+    메모리는 레코드 수 기준 LRU 로 제한하고 cache_dir 지정 시 디스크에도 저장.
+    """
+
+    def __init__(self, max_records=PARSE_CACHE_MAX_RECORDS, cache_dir=PARSE_CACHE_DIR, max_files=PARSE_CACHE_MAX_FILES):
+        self.max_records = max_records
+        self.cache_dir = cache_dir
+        self.max_files = max_files
+        self._entries = OrderedDict()
+        self._total_records = 0
+        self._lock = threading.Lock()
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(content_hash, parser):
+        return f"{content_hash}:{parser.get_dbms_name()}:{type(parser).__name__}:{parser.parser_version}:{CACHE_FORMAT_VERSION}"
+
+    @staticmethod
+    def _weight(parsed):
+        return len(parsed.scan_result.slow_queries) + len(parsed.scan_result.error_queries) + 1
+
+    def _disk_path(self, key):
+        return os.path.join(self.cache_dir, hashlib.sha256(key.encode("utf-8")).hexdigest()[:32] + ".pkl")
+
+    def get(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._disk_path(key), "rb") as f:
+                parsed = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            return None
+        self._put_memory(key, parsed)
+        return parsed
+
+    def put(self, key, parsed):
+        self._put_memory(key, parsed)
+        if self.cache_dir:
+            self._put_disk(key, parsed)
+
+    def _put_memory(self, key, parsed):
+        with self._lock:
+            if key in self._entries:
+                self._total_records -= self._weight(self._entries.pop(key))
+            self._entries[key] = parsed
+            self._total_records += self._weight(parsed)
+            # 가장 오래 사용하지 않은 항목부터 제거 (방금 넣은 항목은 유지)
+            while self._total_records > self.max_records and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self._total_records -= self._weight(evicted)
+
+    def _put_disk(self, key, parsed):
+        path = self._disk_path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                pickle.dump(parsed, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except OSError:
+            return
+
+        files = [os.path.join(self.cache_dir, name) for name in os.listdir(self.cache_dir) if name.endswith(".pkl")]
+        if len(files) > self.max_files:
+            files.sort(key=os.path.getmtime)
+            for old_path in files[:len(files) - self.max_files]:
+                try:
+                    os.remove(old_path)
+                except OSError:
+                    pass
+
+    def get_or_parse(self, parser, fileobj, content_hash=None):
+        """
+        캐시에 있으면 재사용하고, 없으면 파싱 후 실행 시간 인덱스와 함께 저장.
+        threshold 필터링은 반환된 duration_index 로 수행.
+        """
+        if content_hash is None:
+            content_hash = hash_fileobj(fileobj)
+        key = self.make_key(content_hash, parser)
+
+        parsed = self.get(key)
+        if parsed is None:
+            # 업로드 파일은 (압축이면 스트리밍으로 풀면서) 임시 파일로 내려
+            # mmap 으로 바이트 단위 파싱 (대용량은 구간별 병렬)
+            with open_decompressed(fileobj) as stream, spill_to_file(stream) as path:
+                result = parallel_scan_file(parser, path, 0)
+            parsed = self.put_scan_result(key, result)
+        return parsed
+
+    def get_or_scan_bounded(self, parser, fileobj, threshold_ms, size, mode="top", by="duration", content_hash=None):
+        """
+        대용량 로그용: 전체 레코드 대신 상위 K 개 / 무작위 표본 size 개만 보관한 BoundedScan 을 캐시.
+        threshold 를 스캔 중에 적용하므로 키에 포함하며, 표본은 내용 해시를 seed 로 써서 rerun 시에도 동일.
+        """
+        if content_hash is None:
+            content_hash = hash_fileobj(fileobj)
+        key = f"{self.make_key(content_hash, parser)}:{mode}:{size}:{by}:{threshold_ms}"
+
+        bounded = self.get(key)
+        if bounded is None:
+            with open_decompressed(fileobj) as stream:
+                bounded = scan_bounded(parser, stream, threshold_ms, size, mode, by, seed=content_hash)
+            self.put(key, bounded)
+        return bounded
+
+    def put_scan_result(self, key, scan_result):
+        """threshold 0 스캔 결과를 실행 시간 인덱스와 함께 저장하고 ParsedLog 반환"""
+        parsed = ParsedLog(scan_result, DurationIndex(scan_result.slow_queries))
+        self.put(key, parsed)
+        return parsed
+
+
+# 프로세스 전역 캐시 (Streamlit 세션 간 공유)
+parse_cache = ParseCache()
@@ -0,0 +1,72 @@
+import os
+import numpy as np
+import pandas as pd
+
+# 전/후 비율이 이 범위(±10%)를 벗어나면 악화/개선으로 판정
+COMPARE_TOLERANCE = float(os.getenv("COMPARE_TOLERANCE", "0.1"))
+# 비교 지표 (status_by 로 판정 기준 선택)
+COMPARE_METRICS = ("count", "p95_ms", "total_ms")
+
+# 비교 결과 상태: 악화 / 개선 / 변화 없음 / 이후에만 있음 / 이전에만 있음
+STATUS_REGRESSION = "regression"
+STATUS_IMPROVEMENT = "improvement"
+STATUS_UNCHANGED = "unchanged"
+STATUS_NEW = "new"
+STATUS_GONE = "gone"
+
+_STAT_COLUMNS = ["fingerprint_id", "fingerprint", "count", "total_ms", "p95_ms"]
+
+
+def digests_to_frame(digests):
+    """QueryDigest 목록 또는 저장된 집계 dict 목록을 비교용 DataFrame 으로 변환"""
+    rows = [digest if isinstance(digest, dict) else digest.to_dict() for digest in digests]
+    return pd.DataFrame(rows, columns=_STAT_COLUMNS)
+
+
+def compare_digests(before, after, status_by="p95_ms", tolerance=COMPARE_TOLERANCE):
+    """
+    전/후 fingerprint 별 집계(digests_to_frame)를 fingerprint_id 해시 조인(pandas merge)으로 비교.
+    지표마다 *_before / *_after / *_delta / *_ratio 컬럼을 만들고, status_by 지표의 비율로 상태를 판정.
+    결과는 총 소요 시간 증가량 내림차순 (가장 많이 악화된 쿼리 형태가 먼저).
+    """
+    if status_by not in COMPARE_METRICS:
+        raise ValueError(f"지원하지 않는 비교 지표입니다: {status_by}")
+
+    merged = before.merge(after, on="fingerprint_id", how="outer", suffixes=("_before", "_after"), indicator=True, sort=False)
+    merged["fingerprint"] = merged["fingerprint_after"].fillna(merged["fingerprint_before"])
+
+    for metric in COMPARE_METRICS:
+        metric_before = merged[f"{metric}_before"].astype(np.float64)
+        metric_after = merged[f"{metric}_after"].astype(np.float64)
+        merged[f"{metric}_delta"] = metric_after.fillna(0) - metric_before.fillna(0)
+        # 한쪽에만 있으면 비율 없음(NaN)
+        merged[f"{metric}_ratio"] = metric_after / metric_before.where(metric_before > 0)
+
+    ratio = merged[f"{status_by}_ratio"]
+    merged["status"] = np.select(
+        [
+            merged["_merge"].eq("left_only").to_numpy(),
+            merged["_merge"].eq("right_only").to_numpy(),
+            (ratio >= 1 + tolerance).to_numpy(),
+            (ratio <= 1 - tolerance).to_numpy(),
+        ],
+        [STATUS_GONE, STATUS_NEW, STATUS_REGRESSION, STATUS_IMPROVEMENT],
+        default=STATUS_UNCHANGED,
+    )
+
+    columns = ["fingerprint_id", "fingerprint", "status"] + [
+        f"{metric}_{suffix}" for metric in COMPARE_METRICS for suffix in ("before", "after", "delta", "ratio")
+    ]
+    merged = merged.sort_values("total_ms_delta", ascending=False, kind="stable")
+    return merged[columns].reset_index(drop=True)
+
+
+def summarize_comparison(comparison):
+    """상태별 쿼리 형태 수와 전/후 총 건수·소요 시간 요약 dict"""
+    counts = comparison["status"].value_counts()
+    summary = {status: int(counts.get(status, 0)) for status in
+               (STATUS_REGRESSION, STATUS_IMPROVEMENT, STATUS_UNCHANGED, STATUS_NEW, STATUS_GONE)}
+    for metric in ("count", "total_ms"):
+        summary[f"{metric}_before"] = float(comparison[f"{metric}_before"].sum())
+        summary[f"{metric}_after"] = float(comparison[f"{metric}_after"].sum())
+    return summary
@@ -0,0 +1,70 @@
+import bz2
+import gzip
+import lzma
+import os
+from contextlib import contextmanager
+
+try:
+    import zstandard
+except ImportError:  # .zst 업로드를 쓰지 않으면 설치하지 않아도 됨
+    zstandard = None
+
+# 업로드 허용 확장자 (압축 파일은 스트리밍으로 풀면서 파싱)
+LOG_FILE_TYPES = ["log", "txt"]
+COMPRESSED_FILE_TYPES = ["gz", "bz2", "xz", "zst"]
+
+# 손상된 압축 파일을 읽을 때 발생하는 예외
+DECOMPRESSION_ERRORS = (OSError, EOFError, lzma.LZMAError) + ((zstandard.ZstdError,) if zstandard else ())
+
+# 매직 바이트 → 압축 형식 (확장자가 바뀐 파일도 내용으로 판별)
+_MAGIC_NUMBERS = {
+    b"\x1f\x8b": "gz",
+    b"BZh": "bz2",
+    b"\xfd7zXZ\x00": "xz",
+    b"\x28\xb5\x2f\xfd": "zst",
+}
+
+
+def detect_compression(fileobj, name=None):
+    """파일 앞부분의 매직 바이트(없으면 확장자)로 압축 형식 판별, 비압축이면 None"""
+    position = fileobj.tell()
+    head = fileobj.read(8)
+    fileobj.seek(position)
+    if isinstance(head, bytes):
+        for magic, compression in _MAGIC_NUMBERS.items():
+            if head.startswith(magic):
+                return compression
+
+    extension = os.path.splitext(name or getattr(fileobj, "name", "") or "")[1].lstrip(".").lower()
+    return extension if extension in COMPRESSED_FILE_TYPES else None
+
+
+@contextmanager
+def open_decompressed(fileobj, name=None):
+    """
+    압축 파일 객체를 압축 해제 스트림으로 제공 (비압축이면 원본 그대로).
+    전체를 메모리에 풀지 않고 읽는 만큼만 해제하며, 사용 후 원본 파일 객체는 닫지 않음.
+    """
+    fileobj.seek(0)
+    compression = detect_compression(fileobj, name)
+    if compression is None:
+        yield fileobj
+        return
+
+    if compression == "gz":
+        stream = gzip.GzipFile(fileobj=fileobj, mode="rb")
+    elif compression == "bz2":
+        stream = bz2.BZ2File(fileobj, mode="rb")
+    elif compression == "xz":
+        stream = lzma.LZMAFile(fileobj, mode="rb")
+    else:
+        if zstandard is None:
+            raise ValueError("zstd(.zst) 압축 로그를 읽으려면 zstandard 패키지를 설치해야 합니다.")
+        # 여러 프레임으로 이어 붙인 파일(zstd 로테이션 로그 등)도 끝까지 읽음
+        stream = zstandard.ZstdDecompressor().stream_reader(fileobj, read_across_frames=True, closefd=False)
+
+    try:
+        yield stream
+    finally:
+        stream.close()
+        fileobj.seek(0)
@@ -0,0 +1,57 @@
+from .fingerprint import fingerprint, fingerprint_id
+from .records import record_dbms_type
+
+
+def _percentile(sorted_values, percent):
+    """정렬된 값의 백분위수 (선형 보간, numpy.percentile 기본 방식과 동일)"""
+    if not sorted_values:
+        return 0.0
+    rank = (len(sorted_values) - 1) * percent / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (rank - lower)
+
+
+class QueryDigest:
+    """fingerprint 단위 슬로우 쿼리 집계 (pt-query-digest 스타일)"""
+    __slots__ = ("fingerprint", "fingerprint_id", "count", "total_ms", "mean_ms",
+                 "p50_ms", "p95_ms", "p99_ms", "max_ms", "sample")
+
+    def __init__(self, fingerprint_text, durations, sample, count=None, total_ms=None):
+        # durations 가 표본이면 전체 count/total_ms 를 따로 전달 (백분위는 표본 기준 추정치)
+        durations = sorted(durations)
+        self.fingerprint = fingerprint_text
+        self.fingerprint_id = fingerprint_id(fingerprint_text)
+        self.count = len(durations) if count is None else count
+        self.total_ms = sum(durations) if total_ms is None else total_ms
+        self.mean_ms = self.total_ms / self.count
+        self.p50_ms = _percentile(durations, 50)
+        self.p95_ms = _percentile(durations, 95)
+        self.p99_ms = _percentile(durations, 99)
+        self.max_ms = max(durations[-1], sample.duration_ms)
+        # 대표 쿼리: 가장 오래 걸린 실제 실행 건 (AI 분석 대상)
+        self.sample = sample
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__ if name != "sample"}
+
+
+def aggregate_slow_queries(slow_queries, dbms_type=None):
+    """
+    슬로우 쿼리를 fingerprint 별로 묶어 count/total/mean/p50/p95/p99/max 집계.
+    결과는 총 소요 시간 내림차순. dbms_type 은 출처(LogSource)가 없는 레코드의 SQL 방언.
+    """
+    groups = {}
+    for query in slow_queries:
+        key = fingerprint(query.sql, record_dbms_type(query, dbms_type))
+        group = groups.get(key)
+        if group is None:
+            groups[key] = [[query.duration_ms], query]
+            continue
+        group[0].append(query.duration_ms)
+        if query.duration_ms > group[1].duration_ms:
+            group[1] = query
+
+    digests = [QueryDigest(key, durations, sample) for key, (durations, sample) in groups.items()]
+    digests.sort(key=lambda digest: digest.total_ms, reverse=True)
+    return digests
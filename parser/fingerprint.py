@@ -0,0 +1,67 @@
+import hashlib
+import re
+
+# '#' 을 줄 주석으로 쓰는 DBMS (PostgreSQL 에서는 #>, #>>, #-, # (XOR) 연산자)
+HASH_COMMENT_DBMS_TYPES = frozenset(("mysql", "mariadb"))
+# 방언별 '#' 줄 주석 패턴 (DBMS 를 모르면 PostgreSQL JSON 연산자 #>, #>>, #- 는 주석으로 보지 않음)
+HASH_COMMENT_PATTERNS = {
+    "mysql": r"#[^\n]*",
+    "postgresql": None,
+    None: r"#(?![>\-#])[^\n]*",
+}
+
+
+def sql_dialect(dbms_type):
+    """dbms_type 으로 SQL 방언 판별: 'mysql'(MySQL/MariaDB), 'postgresql', 모르면 None"""
+    dbms_type = (dbms_type or "").lower()
+    if dbms_type in HASH_COMMENT_DBMS_TYPES:
+        return "mysql"
+    return "postgresql" if dbms_type == "postgresql" else None
+
+
+# 문자열 리터럴과 주석을 왼쪽부터 한 번에 처리 (문자열 안의 '--', 주석 안의 따옴표 오인 방지)
+_STRING = r"'(?:[^'\\]|\\.|'')*'"                  # 'string'
+_DOUBLE_QUOTED_STRING = r'"(?:[^"\\]|\\.|"")*"'     # "string" (MySQL, PostgreSQL 에서는 식별자)
+_DOLLAR_QUOTED = r"\$(\w*)\$.*?\$\1\$"               # $$dollar quoted$$ (PostgreSQL)
+_COMMENTS = r"/\*.*?\*/|--[^\n]*"                     # /* block */, -- line
+_LITERAL_OR_COMMENT_PATTERNS = {
+    dialect: re.compile(
+        "|".join(filter(None, (
+            _STRING,
+            _DOUBLE_QUOTED_STRING if dialect == "mysql" else _DOLLAR_QUOTED,
+            _COMMENTS,
+            HASH_COMMENT_PATTERNS[dialect],
+        ))),
+        re.DOTALL
+    )
+    for dialect in HASH_COMMENT_PATTERNS
+}
+_NUMBER_PATTERN = re.compile(r'\b0x[0-9a-f]+\b|\b\d+(?:\.\d+)?(?:e[+-]?\d+)?\b|\B\.\d+\b')
+_IN_LIST_PATTERN = re.compile(r'\bin\s*\(\s*\?(?:\s*,\s*\?)*\s*\)')
+_VALUES_LIST_PATTERN = re.compile(r'\bvalues\s*\((?:[^()]|\([^()]*\))*\)(?:\s*,\s*\((?:[^()]|\([^()]*\))*\))*')
+_WHITESPACE_PATTERN = re.compile(r'\s+')
+
+
+def _replace_literal_or_comment(match):
+    # 주석은 공백, 문자열('...', "...", $$...$$)은 ? 로 치환
+    return " " if match.group(0)[0] in "/-#" else "?"
+
+
+def fingerprint(sql: str, dbms_type=None) -> str:
+    """
+    SQL 을 리터럴/주석/공백과 무관한 쿼리 형태(fingerprint)로 정규화.
+    예) SELECT * FROM t WHERE id IN (1, 2, 3) AND name = 'a'  →  select * from t where id in(?+) and name = ?
+    dbms_type 에 따라 '#' 주석, "..." 문자열(MySQL/MariaDB)과 $$...$$ 문자열(PostgreSQL)을 구분.
+    """
+    text = _LITERAL_OR_COMMENT_PATTERNS[sql_dialect(dbms_type)].sub(_replace_literal_or_comment, sql)
+    text = text.lower()
+    text = _NUMBER_PATTERN.sub("?", text)
+    text = _IN_LIST_PATTERN.sub("in(?+)", text)
+    text = _VALUES_LIST_PATTERN.sub("values(?+)", text)
+    text = _WHITESPACE_PATTERN.sub(" ", text).strip()
+    return text.rstrip(";").rstrip()
+
+
+def fingerprint_id(fingerprint_text: str) -> str:
+    """fingerprint 의 짧은 식별자 (pt-query-digest 의 checksum 과 같은 용도)"""
+    return hashlib.md5(fingerprint_text.encode("utf-8")).hexdigest()[:16]
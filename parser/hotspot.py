@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+from .base import extract_sql_features
+from .fingerprint import fingerprint
+from .records import record_dbms_types
+
+# 집계 기준: 테이블 / 쿼리 패턴(JOIN, SUBQUERY, GROUP_BY ...) / 쿼리 형태
+HOTSPOT_KEYS = ("table", "pattern", "fingerprint")
+NO_TABLE_LABEL = "(테이블 없음)"
+NO_PATTERN_LABEL = "(패턴 없음)"
+
+HOTSPOT_COLUMNS = ["key", "slow_count", "total_ms", "share", "mean_ms", "p95_ms", "max_ms", "error_count"]
+
+
+def sql_feature_labels(sqls, by, dbms_types=None):
+    """
+    SQL 별 집계 키 배열 (같은 SQL 은 한 번만 분석).
+    by='fingerprint' 는 문자열, 'table'/'pattern' 은 쿼리마다 여러 값일 수 있어 리스트.
+    dbms_types 는 SQL 방언: 모두 같으면 문자열 하나(또는 None), 여러 DBMS 로그를 함께 분석하면 SQL 별 목록.
+    """
+    if dbms_types is None or isinstance(dbms_types, str):
+        codes, uniques = pd.factorize(pd.Series(sqls, dtype=object))
+        unique_dbms_types = [dbms_types] * len(uniques)
+    else:
+        codes, pairs = pd.factorize(pd.Series(list(zip(sqls, dbms_types)), dtype=object))
+        uniques = [sql for sql, _ in pairs]
+        unique_dbms_types = [dbms_type for _, dbms_type in pairs]
+
+    labels = np.empty(len(uniques), dtype=object)
+    if by == "fingerprint":
+        for i, (sql, dbms_type) in enumerate(zip(uniques, unique_dbms_types)):
+            labels[i] = fingerprint(sql, dbms_type)
+    elif by == "table":
+        for i, (sql, dbms_type) in enumerate(zip(uniques, unique_dbms_types)):
+            labels[i] = extract_sql_features(sql, dbms_type).tables or [NO_TABLE_LABEL]
+    elif by == "pattern":
+        for i, (sql, dbms_type) in enumerate(zip(uniques, unique_dbms_types)):
+            labels[i] = extract_sql_features(sql, dbms_type).patterns or [NO_PATTERN_LABEL]
+    else:
+        raise ValueError(f"지원하지 않는 집계 기준입니다: {by}")
+    return labels[codes]
+
+
+def build_hotspot_report(slow_queries, error_queries=(), by="table", dbms_type=None):
+    """
+    로그 전체의 슬로우/오류 쿼리를 테이블(또는 패턴/쿼리 형태)별로 집계한 DataFrame (총 소요 시간 내림차순).
+    컬럼: key, slow_count, total_ms, share(전체 슬로우 시간 대비 비율), mean_ms, p95_ms, max_ms, error_count
+    여러 테이블/패턴에 해당하는 쿼리는 각각에 모두 집계되므로 share 합계는 1 보다 클 수 있음.
+    dbms_type 은 출처(LogSource)가 없는 레코드의 SQL 방언.
+    """
+    if by not in HOTSPOT_KEYS:
+        raise ValueError(f"지원하지 않는 집계 기준입니다: {by}")
+
+    durations = np.fromiter((query.duration_ms for query in slow_queries), dtype=np.float64, count=len(slow_queries))
+    slow = pd.DataFrame({
+        "key": sql_feature_labels([query.sql for query in slow_queries], by, record_dbms_types(slow_queries, dbms_type)),
+        "duration_ms": durations,
+    }).explode("key", ignore_index=True)
+    error_labels = sql_feature_labels([query.sql for query in error_queries], by, record_dbms_types(error_queries, dbms_type))
+    errors = pd.Series(error_labels, dtype=object).explode()
+
+    grouped = slow.groupby("key", sort=False)["duration_ms"]
+    report = grouped.agg(slow_count="count", total_ms="sum", mean_ms="mean", max_ms="max")
+    report["p95_ms"] = grouped.quantile(0.95)
+    report = report.join(errors.value_counts().rename("error_count"), how="outer")
+    if report.empty:
+        return pd.DataFrame(columns=HOTSPOT_COLUMNS)
+
+    report[["slow_count", "total_ms", "error_count"]] = report[["slow_count", "total_ms", "error_count"]].fillna(0)
+    report = report.astype({"slow_count": np.int64, "error_count": np.int64})
+    total_ms = durations.sum()
+    report["share"] = report["total_ms"] / total_ms if total_ms else 0.0
+
+    report = report.sort_values(["total_ms", "error_count"], ascending=False)
+    return report.rename_axis("key").reset_index()[HOTSPOT_COLUMNS]
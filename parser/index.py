@@ -0,0 +1,45 @@
+import numpy as np
+
+
+class DurationIndex:
+    """
+    슬로우 쿼리 실행 시간 컬럼 인덱스.
+    파싱 시 한 번 정렬해 두고, 기준 시간/백분위 변경 시에는 이진 탐색 또는
+    벡터 마스크로만 필터링 (레코드는 원본 목록의 오프셋으로 참조).
+    """
+
+    def __init__(self, slow_queries):
+        self.records = slow_queries
+        self.durations = np.fromiter((query.duration_ms for query in slow_queries), dtype=np.float64, count=len(slow_queries))
+        # 실행 시간 오름차순 오프셋 (같은 시간은 로그 순서 유지)
+        self.order = np.argsort(self.durations, kind="stable")
+        self.sorted_durations = self.durations[self.order]
+
+    def __len__(self):
+        return len(self.records)
+
+    def _start(self, threshold_ms):
+        return int(np.searchsorted(self.sorted_durations, threshold_ms, side="left"))
+
+    def count_above(self, threshold_ms):
+        """threshold_ms 이상인 레코드 수 (이진 탐색)"""
+        return len(self.records) - self._start(threshold_ms)
+
+    def offsets_above(self, threshold_ms, order="log"):
+        """
+        threshold_ms 이상인 레코드의 오프셋.
+        order='log' 는 로그 순서(벡터 마스크), 'duration' 은 실행 시간 내림차순(이진 탐색).
+        """
+        if order == "duration":
+            return self.order[self._start(threshold_ms):][::-1]
+        return np.flatnonzero(self.durations >= threshold_ms)
+
+    def above(self, threshold_ms, order="log"):
+        """threshold_ms 이상인 슬로우 쿼리 레코드 목록"""
+        return [self.records[offset] for offset in self.offsets_above(threshold_ms, order)]
+
+    def percentile(self, percent):
+        """실행 시간 백분위수 (예: 95 → p95 기준 시간)"""
+        if not len(self.records):
+            return 0.0
+        return float(np.percentile(self.sorted_durations, percent))
@@ -1,7 +1,20 @@
 import re
-from .base import BaseLogParser
+from .base import BaseLogParser, ScanResult, carry_last_time
+from .slowlog import find_last_time, iter_slow_log_entries, score_slow_log
+from .records import ErrorQuery
+from .stream import iter_buffer_lines
 
 class MariaDBLogParser(BaseLogParser):
+    dbms_type = "mariadb"
+    # 블록/구간 경계를 넘는 '# Time' 이어받기로 결과가 바뀌어 파싱 캐시 무효화
+    parser_version = "2"
+    # 버전 배너, Thread_id/QC_hit/Rows_affected 헤더는 MariaDB 에만 있음
+    dialect_markers = ("MariaDB", "# Thread_id:", "QC_hit:", "Rows_affected:")
+    # 레코드 경계: 헤더가 아닌 줄 다음에 오는 첫 헤더 줄 (# Time / # User@Host / # Query_time) 앞
+    record_boundary_pattern = re.compile(r'^(?!# )[^\n]*\n(?=# (?:Time|User@Host|Query_time):)', re.MULTILINE)
+
+    error_query_pattern = re.compile(r'ERROR.*\nQuery:\s(.+);', re.IGNORECASE)
+    error_query_bytes_pattern = re.compile(error_query_pattern.pattern.encode(), re.IGNORECASE)
 
     def extract_slow_queries(self, log_text, threshold_ms):
         # MariaDB slow query log 예시 패턴:
@@ -9,33 +22,36 @@ class MariaDBLogParser(BaseLogParser):
         # # User@Host: root[root] @ localhost []
         # # Query_time: 1.234  Lock_time: 0.000 Rows_sent: 1  Rows_examined: 0
         # SELECT * FROM users WHERE id = 1;
-        pattern = r'# Query_time: ([\d\.]+).+?\n(?:.+\n)*?(.+);'
-        matches = re.findall(pattern, log_text, re.IGNORECASE)
-        return [(float(dur)*1000, stmt.strip()) for dur, stmt in matches if float(dur)*1000 >= threshold_ms]
+        # 헤더/본문 단위 상태 머신으로 읽음 (정규식 백트래킹 없는 선형 시간 파싱)
+        entries = iter_slow_log_entries(log_text.splitlines())
+        return [entry for entry in entries if entry.duration_ms >= threshold_ms]
 
     def extract_error_queries(self, log_text):
         # MariaDB 일반 에러 로그는 형태가 다양하지만 보통 'ERROR' 문구 포함, 'Query' 라벨 뒤 SQL문
         # 예시:
         # 2023-07-03T12:34:56.789123Z 123 [ERROR] Some error message
         # Query: SELECT * FROM invalid_table;
-        pattern = r'ERROR.*\nQuery:\s(.+);'
-        matches = re.findall(pattern, log_text, re.IGNORECASE)
-        return [stmt.strip() for stmt in matches]
-
-    def extract_sql_features(self, sql):
-        table_pattern = r'(?:FROM|JOIN|UPDATE|INSERT INTO|DELETE FROM)\s+`?([a-zA-Z_][a-zA-Z0-9_]*)`?'
-        tables = list(set(re.findall(table_pattern, sql, re.IGNORECASE)))
-        patterns = []
-        if re.search(r'SELECT.*FROM', sql, re.IGNORECASE): patterns.append('SELECT')
-        if re.search(r'INSERT INTO', sql, re.IGNORECASE): patterns.append('INSERT')
-        if re.search(r'UPDATE.*SET', sql, re.IGNORECASE): patterns.append('UPDATE')
-        if re.search(r'DELETE FROM', sql, re.IGNORECASE): patterns.append('DELETE')
-        if re.search(r'JOIN', sql, re.IGNORECASE): patterns.append('JOIN')
-        if re.search(r'GROUP BY', sql, re.IGNORECASE): patterns.append('GROUP_BY')
-        if re.search(r'ORDER BY', sql, re.IGNORECASE): patterns.append('ORDER_BY')
-        if re.search(r'HAVING', sql, re.IGNORECASE): patterns.append('HAVING')
-        if re.search(r'SUBQUERY|\(SELECT', sql, re.IGNORECASE): patterns.append('SUBQUERY')
-        return tables, patterns
+        matches = self.error_query_pattern.findall(log_text)
+        return [ErrorQuery(stmt.strip()) for stmt in matches]
+
+    def score(self, head):
+        return score_slow_log(head, self.dialect_markers)
+
+    def scan_buffer(self, buffer, threshold_ms, start=0, end=None):
+        # mmap 버퍼를 bytes 줄 단위로 읽고 추출한 값만 디코딩
+        end = len(buffer) if end is None else end
+        entries = iter_slow_log_entries(iter_buffer_lines(buffer, start, end), binary=True)
+        slow_queries = [entry for entry in entries if entry.duration_ms >= threshold_ms]
+        # 구간 중간부터 읽으면(병렬 구간, 증분 읽기) 앞 구간의 마지막 '# Time' 을 이어받음
+        result = ScanResult(carry_last_time(slow_queries, self.find_last_time(buffer, 0, start) if start else None), [])
+        result.error_queries.extend(
+            ErrorQuery(match.group(1).decode("utf-8", "replace").strip())
+            for match in self.error_query_bytes_pattern.finditer(buffer, start, end)
+        )
+        return result
+
+    def find_last_time(self, text, start=0, end=None):
+        return find_last_time(text, start, end)
 
     def get_dbms_name(self):
         return "MariaDB"
\ No newline at end of file
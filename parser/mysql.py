@@ -1,34 +1,42 @@
 import re
-from .base import BaseLogParser
+from .base import BaseLogParser, ScanResult, carry_last_time
+from .slowlog import find_last_time, iter_slow_log_entries, score_slow_log
+from .stream import iter_buffer_lines
 
 class MysqlLogParser(BaseLogParser):
+    dbms_type = "mysql"
+    # 블록/구간 경계를 넘는 '# Time' 이어받기로 결과가 바뀌어 파싱 캐시 무효화
+    parser_version = "2"
+    # 버전 배너, User@Host 줄의 Id 항목은 MySQL 에만 있음
+    # (이전 MariaDB 도 'mysqld, Version: 10.x-MariaDB' 배너를 남기므로 MariaDB 표기가 보이면 가산하지 않음)
+    dialect_markers = ("MySQL Community Server", "MySQL Enterprise Server", "mysqld, Version:", "  Id: ")
+    foreign_markers = ("MariaDB",)
+    # 레코드 경계: 헤더가 아닌 줄 다음에 오는 첫 헤더 줄 (# Time / # User@Host / # Query_time) 앞
+    record_boundary_pattern = re.compile(r'^(?!# )[^\n]*\n(?=# (?:Time|User@Host|Query_time):)', re.MULTILINE)
 
     def extract_slow_queries(self, log_text, threshold_ms):
-        # MySQL slow query log 패턴 예시 처리
-        pattern = r'# Query_time: ([\d\.]+).+?\n(?:.+\n)*?(.+);'
-        matches = re.findall(pattern, log_text, re.MULTILINE)
-        # 단위 sec → ms 변환 및 threshold 필터링
-        return [(float(dur)*1000, stmt.strip()) for dur, stmt in matches if float(dur)*1000 >= threshold_ms]
+        # MySQL slow query log 를 헤더/본문 단위로 읽음 (정규식 백트래킹 없는 선형 시간 파싱)
+        entries = iter_slow_log_entries(log_text.splitlines())
+        # threshold 필터링 (Query_time 은 ms 로 변환되어 있음)
+        return [entry for entry in entries if entry.duration_ms >= threshold_ms]
 
     def extract_error_queries(self, log_text):
         # MySQL 에러 로그는 일반 slow query 로그와 별개이므로 별도 구현 필요 (임시 빈 리스트)
         return []
 
-    def extract_sql_features(self, sql):
-        # MySQL 문법에 맞게 테이블명 추출 (대략 PostgreSQL과 비슷)
-        table_pattern = r'(?:FROM|JOIN|UPDATE|INSERT INTO|DELETE FROM)\s+`?([a-zA-Z_][a-zA-Z0-9_]*)`?'
-        tables = list(set(re.findall(table_pattern, sql, re.IGNORECASE)))
-        patterns = []
-        if re.search(r'SELECT.*FROM', sql, re.IGNORECASE): patterns.append('SELECT')
-        if re.search(r'INSERT INTO', sql, re.IGNORECASE): patterns.append('INSERT')
-        if re.search(r'UPDATE.*SET', sql, re.IGNORECASE): patterns.append('UPDATE')
-        if re.search(r'DELETE FROM', sql, re.IGNORECASE): patterns.append('DELETE')
-        if re.search(r'JOIN', sql, re.IGNORECASE): patterns.append('JOIN')
-        if re.search(r'GROUP BY', sql, re.IGNORECASE): patterns.append('GROUP_BY')
-        if re.search(r'ORDER BY', sql, re.IGNORECASE): patterns.append('ORDER_BY')
-        if re.search(r'HAVING', sql, re.IGNORECASE): patterns.append('HAVING')
-        if re.search(r'SUBQUERY|\(SELECT', sql, re.IGNORECASE): patterns.append('SUBQUERY')
-        return tables, patterns
+    def score(self, head):
+        return score_slow_log(head, self.dialect_markers, self.foreign_markers)
+
+    def scan_buffer(self, buffer, threshold_ms, start=0, end=None):
+        # mmap 버퍼를 bytes 줄 단위로 읽고 추출한 값만 디코딩
+        end = len(buffer) if end is None else end
+        entries = iter_slow_log_entries(iter_buffer_lines(buffer, start, end), binary=True)
+        slow_queries = [entry for entry in entries if entry.duration_ms >= threshold_ms]
+        # 구간 중간부터 읽으면(병렬 구간, 증분 읽기) 앞 구간의 마지막 '# Time' 을 이어받음
+        return ScanResult(carry_last_time(slow_queries, self.find_last_time(buffer, 0, start) if start else None), [])
+
+    def find_last_time(self, text, start=0, end=None):
+        return find_last_time(text, start, end)
 
     def get_dbms_name(self):
         return "MySQL"
\ No newline at end of file
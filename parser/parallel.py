@@ -0,0 +1,68 @@
+import math
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from .base import ScanResult
+from .stream import open_mmap, to_bytes_pattern
+
+# 병렬 파싱 프로세스 수 (1 이면 항상 단일 프로세스)
+PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", str(os.cpu_count() or 1)))
+# 이 크기 미만의 파일은 프로세스 기동 비용이 더 크므로 단일 프로세스로 파싱
+PARSE_PARALLEL_MIN_BYTES = int(os.getenv("PARSE_PARALLEL_MIN_BYTES", str(64 * 1024 * 1024)))
+# 작업 단위 구간 크기 (워커 수보다 구간이 많으면 먼저 끝난 워커가 다음 구간을 가져감)
+PARSE_CHUNK_BYTES = int(os.getenv("PARSE_CHUNK_BYTES", str(64 * 1024 * 1024)))
+
+
+def split_record_ranges(buffer, record_boundary, parts):
+    """
+    버퍼를 레코드 경계에 맞춘 [(start, end)] 구간 최대 parts 개로 분할.
+    균등 분할 지점 이후 첫 레코드 시작 위치에서 자르므로 한 레코드가 두 구간에 걸치지 않음.
+    record_boundary 는 base.record_boundary_pattern 과 같은 규칙의 bytes 정규식.
+    """
+    size = len(buffer)
+    cuts = [0]
+    for i in range(1, parts):
+        target = size * i // parts
+        if target <= cuts[-1]:
+            continue
+        # 분할 지점이 속한 줄의 시작부터 검색 (경계 패턴은 이전 줄 전체를 소비하고 끝남)
+        line_start = buffer.rfind(b"\n", cuts[-1], target) + 1
+        match = record_boundary.search(buffer, max(line_start, cuts[-1]))
+        if match is None:
+            break
+        if match.end() > cuts[-1] and match.end() < size:
+            cuts.append(match.end())
+    cuts.append(size)
+    return list(zip(cuts, cuts[1:]))
+
+
+def _scan_range(task):
+    """워커 프로세스: 파일을 각자 mmap 으로 열어 할당된 구간만 스캔"""
+    parser, path, start, end, threshold_ms = task
+    with open_mmap(path) as buffer:
+        return parser.scan_buffer(buffer, threshold_ms, start, end)
+
+
+def parallel_scan_file(parser, path, threshold_ms, workers=None):
+    """
+    파일을 레코드 경계 구간으로 나눠 프로세스 풀에서 병렬 스캔하고 로그 순서대로 병합.
+    레코드 경계 패턴이 없거나 파일이 작거나 workers 가 1 이면 scan_file 로 처리.
+    """
+    workers = PARSE_WORKERS if workers is None else workers
+    size = os.path.getsize(path)
+    if workers <= 1 or parser.record_boundary_pattern is None or size < PARSE_PARALLEL_MIN_BYTES:
+        return parser.scan_file(path, threshold_ms)
+
+    parts = max(workers, math.ceil(size / PARSE_CHUNK_BYTES))
+    with open_mmap(path) as buffer:
+        ranges = split_record_ranges(buffer, to_bytes_pattern(parser.record_boundary_pattern), parts)
+
+    result = ScanResult([], [])
+    tasks = [(parser, path, start, end, threshold_ms) for start, end in ranges]
+    # Streamlit 처럼 스레드가 있는 프로세스에서 fork 는 교착 위험이 있으므로 spawn 사용
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=min(workers, len(tasks)), mp_context=context) as executor:
+        for part in executor.map(_scan_range, tasks):
+            result.slow_queries.extend(part.slow_queries)
+            result.error_queries.extend(part.error_queries)
+    return result
@@ -1,32 +1,76 @@
 import re
-from .base import BaseLogParser
+from .base import BaseLogParser, ScanResult
+from .records import ErrorQuery, SlowQuery
 
 class PostgresqlLogParser(BaseLogParser):
+    dbms_type = "postgresql"
+    # 레코드 경계: log_line_prefix 로 시작하는 줄 앞 (STATEMENT/DETAIL 등 부가 줄 제외)
+    record_boundary_pattern = re.compile(r'^[^\n]*\n(?=(?![^\n]*\b(?:STATEMENT|DETAIL|HINT|CONTEXT|QUERY):)\S)', re.MULTILINE)
+
+    slow_query_pattern = re.compile(r'duration: ([\d\.]+) ms\s+statement: (.+)')
+    error_query_pattern = re.compile(r'ERROR:.*\n.*STATEMENT:\s(.+)')
+    # mmap 버퍼를 직접 검색하는 bytes 패턴 (일치한 부분만 디코딩)
+    slow_query_bytes_pattern = re.compile(slow_query_pattern.pattern.encode())
+    error_query_bytes_pattern = re.compile(error_query_pattern.pattern.encode())
+
+    # log_line_prefix 에서 시각(%t/%m)과 user@database(%u@%d) 추출
+    timestamp_pattern = re.compile(r'\d{4}-\d\d-\d\d[ T]\d\d:\d\d:\d\d(?:\.\d+)?(?: [A-Z]{2,5}(?![:\w])|[+-]\d\d(?::?\d\d)?)?')
+    user_host_pattern = re.compile(r'(?:^|\s)(\S+@\S+)\s')
+    # 자동 감지용: stderr 로그의 심각도 라벨 (LOG:  duration ..., ERROR:  ..., STATEMENT:  ...)
+    severity_label_pattern = re.compile(r'\b(?:LOG|ERROR|STATEMENT|DETAIL|HINT|CONTEXT|WARNING|FATAL|PANIC|NOTICE|INFO|DEBUG\d?):  ')
 
     def extract_slow_queries(self, log_text, threshold_ms):
-        pattern = r'duration: ([\d\.]+) ms\s+statement: (.+)'
-        matches = re.findall(pattern, log_text)
-        return [(float(dur), stmt.strip()) for dur, stmt in matches if float(dur) >= threshold_ms]
+        slow_queries = []
+        for match in self.slow_query_pattern.finditer(log_text):
+            duration = float(match.group(1))
+            if duration < threshold_ms:
+                continue
+            line_start = log_text.rfind("\n", 0, match.start()) + 1
+            prefix = log_text[line_start:match.start()]
+            timestamp = self.timestamp_pattern.match(prefix)
+            user_host = self.user_host_pattern.search(prefix)
+            slow_queries.append(SlowQuery(
+                duration,
+                match.group(2).strip(),
+                timestamp=timestamp.group(0) if timestamp else None,
+                user_host=user_host.group(1) if user_host else None,
+            ))
+        return slow_queries
 
     def extract_error_queries(self, log_text):
-        pattern = r'ERROR:.*\n.*STATEMENT:\s(.+)'
-        matches = re.findall(pattern, log_text)
-        return [stmt.strip() for stmt in matches]
-
-    def extract_sql_features(self, sql):
-        table_pattern = r'(?:FROM|JOIN|UPDATE|INSERT INTO|DELETE FROM)\s+([a-zA-Z_][a-zA-Z0-9_]*)'
-        tables = list(set(re.findall(table_pattern, sql, re.IGNORECASE)))
-        patterns = []
-        if re.search(r'SELECT.*FROM', sql, re.IGNORECASE): patterns.append('SELECT')
-        if re.search(r'INSERT INTO', sql, re.IGNORECASE): patterns.append('INSERT')
-        if re.search(r'UPDATE.*SET', sql, re.IGNORECASE): patterns.append('UPDATE')
-        if re.search(r'DELETE FROM', sql, re.IGNORECASE): patterns.append('DELETE')
-        if re.search(r'JOIN', sql, re.IGNORECASE): patterns.append('JOIN')
-        if re.search(r'GROUP BY', sql, re.IGNORECASE): patterns.append('GROUP_BY')
-        if re.search(r'ORDER BY', sql, re.IGNORECASE): patterns.append('ORDER_BY')
-        if re.search(r'HAVING', sql, re.IGNORECASE): patterns.append('HAVING')
-        if re.search(r'SUBQUERY|\(SELECT', sql, re.IGNORECASE): patterns.append('SUBQUERY')
-        return tables, patterns
+        matches = self.error_query_pattern.findall(log_text)
+        return [ErrorQuery(stmt.strip()) for stmt in matches]
+
+    def score(self, head):
+        # 마지막 줄은 잘렸을 수 있으므로 제외하고, 심각도 라벨이 있는 줄의 비율로 판단
+        lines = [line for line in head.splitlines()[:-1] if line.strip()] or head.splitlines()
+        if not lines:
+            return 0.0
+        matched = sum(1 for line in lines if self.severity_label_pattern.search(line))
+        if not matched:
+            return 0.0
+        return min(0.5 + 0.5 * matched / len(lines), 0.9 if "duration: " not in head else 1.0)
+
+    def scan_buffer(self, buffer, threshold_ms, start=0, end=None):
+        end = len(buffer) if end is None else end
+        result = ScanResult([], [])
+        for match in self.slow_query_bytes_pattern.finditer(buffer, start, end):
+            duration = float(match.group(1))
+            if duration < threshold_ms:
+                continue
+            line_start = max(buffer.rfind(b"\n", start, match.start()) + 1, start)
+            prefix = buffer[line_start:match.start()].decode("utf-8", "replace")
+            timestamp = self.timestamp_pattern.match(prefix)
+            user_host = self.user_host_pattern.search(prefix)
+            result.slow_queries.append(SlowQuery(
+                duration,
+                match.group(2).decode("utf-8", "replace").strip(),
+                timestamp=timestamp.group(0) if timestamp else None,
+                user_host=user_host.group(1) if user_host else None,
+            ))
+        for match in self.error_query_bytes_pattern.finditer(buffer, start, end):
+            result.error_queries.append(ErrorQuery(match.group(1).decode("utf-8", "replace").strip()))
+        return result
 
     def get_dbms_name(self):
-        return "PostgreSQL"
\ No newline at end of file
+        return "PostgreSQL"
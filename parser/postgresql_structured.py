@@ -0,0 +1,207 @@
+import csv
+import json
+import re
+import sys
+from abc import abstractmethod
+from .base import ScanResult
+from .postgresql import PostgresqlLogParser
+from .records import ErrorQuery, SlowQuery
+from .stream import iter_buffer_lines, open_text_stream
+
+# message 컬럼의 실행 시간 + SQL (여러 줄 SQL 포함, 확장 프로토콜의 execute 도 인식)
+# 예) duration: 2654.891 ms  statement: SELECT ...
+#     duration: 12.345 ms  execute S_1: SELECT ...
+_DURATION_MESSAGE_PATTERN = re.compile(r'duration: ([\d\.]+) ms\s+(?:statement|execute [^:]*):\s(.*)', re.DOTALL)
+_ERROR_SEVERITIES = ("ERROR", "FATAL", "PANIC")
+# csvlog 레코드 시작 줄 (log_time 컬럼: 시각 + 시간대 + 콤마)
+_CSV_RECORD_START_PATTERN = re.compile(r'\d{4}-\d\d-\d\d \d\d:\d\d:\d\d(?:\.\d+)? ?[A-Za-z0-9+:-]*,')
+
+
+def _raise_csv_field_size_limit():
+    # 기본 한도(128KB)를 넘는 긴 SQL/메시지 컬럼도 읽도록 한도를 최대로 올림 (C long 이 32비트인 플랫폼은 줄여가며 시도)
+    limit = sys.maxsize
+    while True:
+        try:
+            csv.field_size_limit(limit)
+            return
+        except OverflowError:
+            limit //= 10
+
+
+class _ResyncLines:
+    """csv.reader 에 넘기는 줄 이터레이터. resync() 후에는 다음 레코드 시작 줄까지 건너뜀"""
+
+    def __init__(self, lines):
+        self._lines = iter(lines)
+        self._resync = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        line = next(self._lines)
+        while self._resync and not _CSV_RECORD_START_PATTERN.match(line):
+            line = next(self._lines)
+        self._resync = False
+        return line
+
+    def resync(self):
+        self._resync = True
+
+
+class _StructuredPostgresqlLogParser(PostgresqlLogParser):
+    """
+    PostgreSQL 구조화 로그(csvlog/jsonlog) 공통 처리.
+    하위 클래스는 줄 이터레이터를 정규화된 레코드 dict 로 바꾸는 _iter_records 만 구현.
+    """
+
+    @abstractmethod
+    def _iter_records(self, lines):
+        """줄 이터레이터 → {timestamp, user, database, pid, severity, sql_state, message, statement} 순차 반환"""
+        pass
+
+    def _scan_lines(self, lines, threshold_ms):
+        result = ScanResult([], [])
+        for record in self._iter_records(lines):
+            severity = record["severity"]
+            user, database = record["user"] or "", record["database"] or ""
+            # 텍스트 로그의 log_line_prefix(%u@%d) 와 같은 형태로 저장
+            user_host = f"{user}@{database}" if user or database else None
+            pid = int(record["pid"]) if record["pid"] else None
+
+            if severity in _ERROR_SEVERITIES:
+                # log_min_error_statement 로 남은 실패 SQL 만 오류 쿼리로 수집 (텍스트 로그의 STATEMENT 줄과 동일)
+                if record["statement"]:
+                    result.error_queries.append(ErrorQuery(
+                        record["statement"].strip(),
+                        timestamp=record["timestamp"],
+                        user_host=user_host,
+                        pid=pid,
+                        severity=severity,
+                        sql_state=record["sql_state"],
+                        message=record["message"],
+                    ))
+                continue
+
+            match = _DURATION_MESSAGE_PATTERN.match(record["message"] or "")
+            if not match:
+                continue
+            duration = float(match.group(1))
+            if duration < threshold_ms:
+                continue
+            result.slow_queries.append(SlowQuery(
+                duration,
+                match.group(2).strip(),
+                timestamp=record["timestamp"],
+                user_host=user_host,
+                pid=pid,
+            ))
+        return result
+
+    def scan(self, log, threshold_ms):
+        # 문자열/파일 객체 모두 줄 단위로 한 번만 읽음 (따옴표 안 여러 줄 SQL 은 리더가 이어 붙임)
+        if isinstance(log, str):
+            return self._scan_lines(log.splitlines(keepends=True), threshold_ms)
+        with open_text_stream(log) as stream:
+            return self._scan_lines(stream, threshold_ms)
+
+    def scan_buffer(self, buffer, threshold_ms, start=0, end=None):
+        lines = (line.decode("utf-8", "replace") + "\n" for line in iter_buffer_lines(buffer, start, end))
+        return self._scan_lines(lines, threshold_ms)
+
+    def extract_slow_queries(self, log_text, threshold_ms):
+        return self.scan(log_text, threshold_ms).slow_queries
+
+    def extract_error_queries(self, log_text):
+        return self.scan(log_text, 0).error_queries
+
+
+class PostgresqlCsvLogParser(_StructuredPostgresqlLogParser):
+    """PostgreSQL csvlog (log_destination = 'csvlog') 파서"""
+    log_format = "csvlog"
+    # 레코드 경계: log_time 컬럼(시각 + 시간대 + 콤마)으로 시작하는 줄 앞
+    record_boundary_pattern = re.compile(r'^[^\n]*\n(?=\d{4}-\d\d-\d\d \d\d:\d\d:\d\d(?:\.\d+)? ?[A-Za-z0-9+:-]*,)', re.MULTILINE)
+    # csvlog 의 고정 컬럼 순서 (PostgreSQL 13 기준, 이후 버전은 뒤에 컬럼이 추가됨)
+    MIN_COLUMNS = 23
+    LOG_TIME, USER_NAME, DATABASE_NAME, PROCESS_ID = 0, 1, 2, 3
+    ERROR_SEVERITY, SQL_STATE_CODE, MESSAGE, QUERY = 11, 12, 13, 19
+
+    def __init__(self):
+        _raise_csv_field_size_limit()
+
+    def _iter_records(self, lines):
+        lines = _ResyncLines(lines)
+        reader = csv.reader(lines)
+        while True:
+            try:
+                row = next(reader)
+            except StopIteration:
+                return
+            except csv.Error:
+                # 깨진 레코드(닫히지 않은 따옴표, NUL 등)는 버리고 다음 레코드 시작 줄부터 다시 읽음
+                lines.resync()
+                continue
+            if len(row) < self.MIN_COLUMNS:
+                continue
+            yield {
+                "timestamp": row[self.LOG_TIME],
+                "user": row[self.USER_NAME],
+                "database": row[self.DATABASE_NAME],
+                "pid": row[self.PROCESS_ID],
+                "severity": row[self.ERROR_SEVERITY],
+                "sql_state": row[self.SQL_STATE_CODE],
+                "message": row[self.MESSAGE],
+                "statement": row[self.QUERY],
+            }
+
+    def score(self, head):
+        # 완결된 첫 레코드가 csvlog 컬럼 구성(시각, ..., 심각도, SQLSTATE)인지 확인
+        lines = head.splitlines(keepends=True)[:-1] or head.splitlines(keepends=True)
+        try:
+            row = next(csv.reader(lines), None)
+        except csv.Error:
+            return 0.0
+        if not row or len(row) < self.MIN_COLUMNS or not re.match(r'\d{4}-\d\d-\d\d ', row[self.LOG_TIME]):
+            return 0.0
+        return 0.95 if re.fullmatch(r'[0-9A-Z]{5}', row[self.SQL_STATE_CODE]) else 0.7
+
+
+class PostgresqlJsonLogParser(_StructuredPostgresqlLogParser):
+    """PostgreSQL jsonlog (log_destination = 'jsonlog', PostgreSQL 15+) 파서"""
+    log_format = "jsonlog"
+    # 레코드 경계: 한 줄이 한 레코드 (문자열 안 개행은 \n 으로 이스케이프됨)
+    record_boundary_pattern = re.compile(r'^[^\n]*\n(?=\{)', re.MULTILINE)
+
+    def _iter_records(self, lines):
+        for line in lines:
+            # 실행 시간 메시지도, 실패 SQL(statement)도 없는 줄은 JSON 디코딩 없이 건너뜀
+            if '"duration: ' not in line and '"statement":' not in line:
+                continue
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if not isinstance(entry, dict):
+                continue
+            yield {
+                "timestamp": entry.get("timestamp"),
+                "user": entry.get("user"),
+                "database": entry.get("dbname"),
+                "pid": entry.get("pid"),
+                "severity": entry.get("error_severity"),
+                "sql_state": entry.get("state_code"),
+                "message": entry.get("message"),
+                "statement": entry.get("statement"),
+            }
+
+    def score(self, head):
+        lines = head.splitlines()[:-1] or head.splitlines()
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                return 0.0
+            return 0.95 if isinstance(entry, dict) and "error_severity" in entry and "timestamp" in entry else 0.0
+        return 0.0
@@ -0,0 +1,115 @@
+from collections import namedtuple
+
+# 레코드 출처 (여러 파일/압축 묶음을 한 번에 분석할 때 파일별 구분, 단일 파일 분석은 None)
+LogSource = namedtuple("LogSource", ["name", "format_id", "dbms_type"])
+
+
+class SlowQuery:
+    """
+    슬로우 쿼리 레코드.
+    대량 로그에서도 메모리를 적게 쓰도록 __slots__ 사용하며,
+    기존 (duration_ms, sql) 튜플처럼 언패킹할 수 있음.
+    """
+    __slots__ = ("duration_ms", "sql", "timestamp", "user_host", "lock_time_ms", "rows_sent", "rows_examined", "pid", "source")
+
+    def __init__(self, duration_ms, sql, timestamp=None, user_host=None,
+                 lock_time_ms=None, rows_sent=None, rows_examined=None, pid=None, source=None):
+        self.duration_ms = duration_ms
+        self.sql = sql
+        self.timestamp = timestamp
+        self.user_host = user_host
+        self.lock_time_ms = lock_time_ms
+        self.rows_sent = rows_sent
+        self.rows_examined = rows_examined
+        self.pid = pid
+        self.source = source
+
+    @property
+    def rows_ratio(self):
+        """Rows_examined / Rows_sent (풀 스캔 판별 지표, 정보가 없으면 None)"""
+        if self.rows_examined is None:
+            return None
+        return self.rows_examined / max(self.rows_sent or 0, 1)
+
+    def __iter__(self):
+        return iter((self.duration_ms, self.sql))
+
+    def __eq__(self, other):
+        if not isinstance(other, SlowQuery):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self):
+        return f"SlowQuery(duration_ms={self.duration_ms!r}, sql={self.sql!r}, timestamp={self.timestamp!r})"
+
+    def __reduce__(self):
+        # 병렬 파싱/디스크 캐시 pickle 시 필드 튜플만 저장 (기본 __slots__ 상태 dict 보다 작고 빠름)
+        return SlowQuery, tuple(getattr(self, name) for name in self.__slots__)
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class ErrorQuery:
+    """
+    오류 쿼리 레코드.
+    텍스트 로그는 SQL 만, 구조화 로그(csvlog/jsonlog)는 심각도/SQLSTATE/메시지까지 채움.
+    """
+    __slots__ = ("sql", "timestamp", "user_host", "pid", "severity", "sql_state", "message", "source")
+
+    def __init__(self, sql, timestamp=None, user_host=None, pid=None, severity=None, sql_state=None, message=None, source=None):
+        self.sql = sql
+        self.timestamp = timestamp
+        self.user_host = user_host
+        self.pid = pid
+        self.severity = severity
+        self.sql_state = sql_state
+        self.message = message
+        self.source = source
+
+    def __eq__(self, other):
+        if not isinstance(other, ErrorQuery):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self):
+        return f"ErrorQuery(sql={self.sql!r}, severity={self.severity!r}, sql_state={self.sql_state!r})"
+
+    def __str__(self):
+        return self.sql
+
+    def __reduce__(self):
+        return ErrorQuery, tuple(getattr(self, name) for name in self.__slots__)
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+# 슬로우 쿼리 정렬 기준 (값이 없으면 가장 뒤로)
+SLOW_QUERY_SORT_KEYS = {
+    "duration": lambda q: q.duration_ms,
+    "rows_ratio": lambda q: q.rows_ratio if q.rows_ratio is not None else -1,
+    "lock_time": lambda q: q.lock_time_ms if q.lock_time_ms is not None else -1,
+    "rows_examined": lambda q: q.rows_examined if q.rows_examined is not None else -1,
+}
+
+
+def rank_slow_queries(slow_queries, by="duration"):
+    """슬로우 쿼리를 기준(by)에 따라 내림차순 정렬 (by=None 이면 로그 순서 유지)"""
+    if by is None:
+        return list(slow_queries)
+    if by not in SLOW_QUERY_SORT_KEYS:
+        raise ValueError(f"지원하지 않는 정렬 기준입니다: {by}")
+    return sorted(slow_queries, key=SLOW_QUERY_SORT_KEYS[by], reverse=True)
+
+
+def record_dbms_type(record, default=None):
+    """레코드가 나온 로그의 DBMS (여러 파일을 함께 분석해 출처가 있는 경우), 출처가 없으면 default"""
+    return record.source.dbms_type if record.source is not None else default
+
+
+def record_dbms_types(records, default=None):
+    """레코드별 DBMS 목록 (출처가 있는 레코드가 없으면 default 하나만 반환)"""
+    if all(record.source is None for record in records):
+        return default
+    return [record_dbms_type(record, default) for record in records]
@@ -0,0 +1,72 @@
+from .compression import open_decompressed
+from .mariadb import MariaDBLogParser
+from .mysql import MysqlLogParser
+from .postgresql import PostgresqlLogParser
+from .postgresql_structured import PostgresqlCsvLogParser, PostgresqlJsonLogParser
+
+# 로그 형식 자동 감지 시 읽는 파일 앞부분 크기 (압축 파일은 해제 후 기준)
+DETECT_HEAD_BYTES = 8 * 1024
+# 이 점수 미만이면 어떤 형식과도 맞지 않는 것으로 판단
+MIN_DETECT_SCORE = 0.3
+
+# 형식 식별자(get_format_id) → 파서 클래스 (등록 순서 유지, 자동 감지 순위가 같은 점수면 먼저 등록된 파서가 앞)
+_parsers = {}
+
+
+def register_parser(parser_class):
+    """파서 클래스를 레지스트리에 등록 (클래스 데코레이터로도 사용 가능)"""
+    if not parser_class.dbms_type:
+        raise ValueError(f"{parser_class.__name__} 에 dbms_type 이 지정되지 않았습니다.")
+    _parsers[parser_class.get_format_id()] = parser_class
+    return parser_class
+
+
+def list_parsers():
+    """등록된 파서 클래스 목록"""
+    return list(_parsers.values())
+
+
+def get_parser(format_id):
+    """형식 식별자(예: 'postgresql-csvlog')에 해당하는 파서 인스턴스 반환"""
+    if format_id not in _parsers:
+        raise ValueError(f"지원하지 않는 로그 형식입니다: {format_id}")
+    return _parsers[format_id]()
+
+
+def read_head(fileobj, size=DETECT_HEAD_BYTES, name=None):
+    """파일 앞부분 size 바이트를 문자열로 읽기 (압축 파일은 해제해서 읽고, 읽기 위치는 처음으로 복원)"""
+    with open_decompressed(fileobj, name) as stream:
+        head = stream.read(size)
+    fileobj.seek(0)
+    if isinstance(head, bytes):
+        head = head.decode("utf-8", "replace")
+    return head
+
+
+def rank_parsers(head):
+    """로그 앞부분에 대한 각 파서의 점수를 [(score, 파서 인스턴스)] 내림차순으로 반환"""
+    parsers = [parser_class() for parser_class in _parsers.values()]
+    scored = [(parser.score(head), parser) for parser in parsers]
+    scored.sort(key=lambda item: item[0], reverse=True)
+    return scored
+
+
+def detect_parser(fileobj, name=None):
+    """
+    파일 앞부분만 읽어 가장 잘 맞는 파서를 (파서 인스턴스, 점수)로 반환.
+    어떤 파서도 MIN_DETECT_SCORE 에 못 미치거나, 최고 점수가 다른 파서와 같아 구분할 수 없으면
+    (None, 최고 점수) 를 반환해 사용자가 선택한 형식을 쓰도록 함.
+    (예: 고유 표기 없이 '# Time' / '# Query_time' 헤더만 있는 MySQL/MariaDB slow log)
+    """
+    ranked = rank_parsers(read_head(fileobj, name=name))
+    if not ranked:
+        return None, 0.0
+    score, parser = ranked[0]
+    if len(ranked) > 1 and ranked[1][0] == score:
+        return None, score
+    return (parser if score >= MIN_DETECT_SCORE else None), score
+
+
+# 기본 파서 등록 (새 형식은 여기에 추가하거나 register_parser 로 등록하면 대시보드 수정 없이 선택/감지 대상이 됨)
+for _parser_class in (PostgresqlLogParser, PostgresqlCsvLogParser, PostgresqlJsonLogParser, MariaDBLogParser, MysqlLogParser):
+    register_parser(_parser_class)
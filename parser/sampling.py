@@ -0,0 +1,198 @@
+import heapq
+import itertools
+import math
+import os
+import random
+from collections import namedtuple
+from .base import ScanResult, carry_last_time
+from .digest import QueryDigest
+from .fingerprint import fingerprint
+from .records import SLOW_QUERY_SORT_KEYS, record_dbms_type
+from .stream import iter_log_blocks
+
+# fingerprint 별로 보관할 실행 시간 표본 수 (p50/p95/p99 추정용)
+DIGEST_DURATION_SAMPLES = int(os.getenv("DIGEST_DURATION_SAMPLES", "1000"))
+
+# 크기 제한 스캔 결과 (scan_result: 보관한 레코드, digests: 총 소요 시간 상위 fingerprint, *_total: 로그 전체 건수)
+BoundedScan = namedtuple("BoundedScan", ["scan_result", "digests", "slow_total", "error_total"])
+
+SAMPLING_MODES = ("top", "sample")
+
+
+class TopK:
+    """key 기준 상위 k 개만 유지하는 최소 힙 (메모리 O(k), 같은 값이면 로그에서 먼저 나온 레코드 우선)"""
+
+    def __init__(self, k, key):
+        self.k = k
+        self.key = key
+        self._heap = []
+        self._counter = itertools.count()
+
+    def __len__(self):
+        return len(self._heap)
+
+    def push(self, item):
+        if self.k <= 0:
+            return
+        value = self.key(item)
+        heap = self._heap
+        if len(heap) < self.k:
+            heapq.heappush(heap, (value, -next(self._counter), item))
+        elif value > heap[0][0]:
+            heapq.heapreplace(heap, (value, -next(self._counter), item))
+
+    def extend(self, items):
+        for item in items:
+            self.push(item)
+
+    def items(self):
+        """보관 중인 레코드를 key 내림차순으로 반환"""
+        return [item for _, _, item in sorted(self._heap, reverse=True)]
+
+
+class Reservoir:
+    """
+    크기 size 의 균등 무작위 표본 (reservoir sampling, Algorithm L).
+    교체할 다음 위치를 미리 뽑아 두므로 건너뛰는 레코드마다 난수를 만들지 않음.
+    """
+
+    def __init__(self, size, rng=None):
+        self.size = size
+        self.seen = 0
+        self._items = []          # (로그 순번, 레코드)
+        self._random = rng or random.Random()
+        self._weight = 1.0
+        self._next = size - 1     # 다음으로 표본에 들어갈 로그 순번
+
+    def __len__(self):
+        return len(self._items)
+
+    def _uniform(self):
+        # log(0) 방지: (0, 1] 구간 난수
+        return 1.0 - self._random.random()
+
+    def _advance(self):
+        self._weight *= math.exp(math.log(self._uniform()) / self.size)
+        if self._weight >= 1.0:
+            self._next += 1
+            return
+        self._next += math.floor(math.log(self._uniform()) / math.log(1.0 - self._weight)) + 1
+
+    def push(self, item):
+        seen = self.seen
+        self.seen += 1
+        if seen < self.size:
+            self._items.append((seen, item))
+            if seen == self.size - 1:
+                self._advance()
+        elif seen == self._next:
+            self._items[self._random.randrange(self.size)] = (seen, item)
+            self._advance()
+
+    def extend(self, items):
+        for item in items:
+            self.push(item)
+
+    def items(self):
+        """표본을 로그 순서로 반환"""
+        return [item for _, item in sorted(self._items, key=lambda entry: entry[0])]
+
+
+def top_k_slow_queries(slow_queries, k, by="duration"):
+    """슬로우 쿼리 중 기준(by) 상위 k 개 (전체 목록을 만들지 않고 힙으로 선택, 내림차순)"""
+    if by not in SLOW_QUERY_SORT_KEYS:
+        raise ValueError(f"지원하지 않는 정렬 기준입니다: {by}")
+    top = TopK(k, SLOW_QUERY_SORT_KEYS[by])
+    top.extend(slow_queries)
+    return top.items()
+
+
+def sample_slow_queries(slow_queries, size, seed=None):
+    """슬로우 쿼리 균등 무작위 표본 size 개 (로그 순서)"""
+    reservoir = Reservoir(size, random.Random(seed))
+    reservoir.extend(slow_queries)
+    return reservoir.items()
+
+
+class DigestAccumulator:
+    """
+    fingerprint 별 count/total/최대 실행 건을 누적하고 실행 시간은 표본만 보관.
+    메모리는 레코드 수가 아닌 쿼리 형태 수에 비례하며, 백분위는 표본 기준 추정치.
+    """
+
+    def __init__(self, duration_samples=DIGEST_DURATION_SAMPLES, seed=None, dbms_type=None):
+        self.duration_samples = duration_samples
+        self.dbms_type = dbms_type
+        self._groups = {}
+        self._random = random.Random(seed)
+
+    def push(self, query):
+        key = fingerprint(query.sql, record_dbms_type(query, self.dbms_type))
+        group = self._groups.get(key)
+        if group is None:
+            group = self._groups[key] = [0, 0.0, query, Reservoir(self.duration_samples, self._random)]
+        group[0] += 1
+        group[1] += query.duration_ms
+        if query.duration_ms > group[2].duration_ms:
+            group[2] = query
+        group[3].push(query.duration_ms)
+
+    def extend(self, slow_queries):
+        for query in slow_queries:
+            self.push(query)
+
+    def top(self, k):
+        """총 소요 시간 상위 k 개 fingerprint 의 QueryDigest (총 소요 시간 내림차순)"""
+        groups = heapq.nlargest(k, self._groups.items(), key=lambda entry: entry[1][1])
+        return [
+            QueryDigest(key, durations.items(), sample, count=count, total_ms=total_ms)
+            for key, (count, total_ms, sample, durations) in groups
+        ]
+
+
+def top_k_digests(slow_queries, k, duration_samples=DIGEST_DURATION_SAMPLES, seed=None, dbms_type=None):
+    """슬로우 쿼리를 fingerprint 별로 집계해 총 소요 시간 상위 k 개만 반환"""
+    accumulator = DigestAccumulator(duration_samples, seed, dbms_type)
+    accumulator.extend(slow_queries)
+    return accumulator.top(k)
+
+
+def scan_bounded(parser, fileobj, threshold_ms, size, mode="top", by="duration", seed=None):
+    """
+    파일 객체를 블록 단위로 한 번 읽으며 레코드를 size 개까지만 보관 (로그 크기와 무관한 메모리).
+    - mode='top': 기준(by) 상위 size 개 슬로우 쿼리 + 총 소요 시간 상위 size 개 fingerprint
+    - mode='sample': 슬로우 쿼리 균등 무작위 표본 size 개 (digests 는 None)
+    오류 쿼리는 두 방식 모두 무작위 표본 size 개 (로그 순서).
+    """
+    if mode not in SAMPLING_MODES:
+        raise ValueError(f"지원하지 않는 표본 방식입니다: {mode}")
+
+    rng = random.Random(seed)
+    if mode == "top":
+        if by not in SLOW_QUERY_SORT_KEYS:
+            raise ValueError(f"지원하지 않는 정렬 기준입니다: {by}")
+        slow = TopK(size, SLOW_QUERY_SORT_KEYS[by])
+        digests = DigestAccumulator(seed=rng.random(), dbms_type=parser.dbms_type)
+    else:
+        slow = Reservoir(size, rng)
+        digests = None
+    errors = Reservoir(size, rng)
+
+    slow_total = 0
+    last_time = None
+    for block in iter_log_blocks(fileobj, parser.record_boundary_pattern):
+        part = parser.scan(block, threshold_ms)
+        carry_last_time(part.slow_queries, last_time)
+        last_time = parser.find_last_time(block) or last_time
+        slow_total += len(part.slow_queries)
+        slow.extend(part.slow_queries)
+        errors.extend(part.error_queries)
+        if digests is not None:
+            digests.extend(part.slow_queries)
+
+    return BoundedScan(
+        ScanResult(slow.items(), errors.items()),
+        digests.top(size) if digests is not None else None,
+        slow_total,
+        errors.seen,
+    )
@@ -0,0 +1,156 @@
+import re
+from collections import namedtuple
+from datetime import datetime, timezone
+from .records import SlowQuery
+
+# MySQL/MariaDB slow query log 레코드 예시:
+# # Time: 2023-07-03T12:34:56.789123Z
+# # User@Host: root[root] @ localhost []
+# # Query_time: 1.234  Lock_time: 0.000 Rows_sent: 1  Rows_examined: 0
+# use mydb;
+# SET timestamp=1688387696;
+# SELECT * FROM users
+# WHERE id = 1;
+_QUERY_TIME_PATTERN = (
+    r'# Query_time:\s*([\d\.]+)'
+    r'(?:\s+Lock_time:\s*([\d\.]+))?'
+    r'(?:\s+Rows_sent:\s*(\d+))?'
+    r'(?:\s+Rows_examined:\s*(\d+))?'
+)
+_SET_TIMESTAMP_PATTERN = r'SET timestamp=(\d+)'
+# 헤더와 본문 사이의 세션 설정 줄 (SQL 본문에서 제외)
+_SESSION_PREFIXES = ("set timestamp=", "use ", "set insert_id=", "set last_insert_id=")
+
+# 상태 머신이 str 줄과 bytes 줄(mmap)을 같은 코드로 처리하도록 토큰을 타입별로 준비
+_Tokens = namedtuple("_Tokens", [
+    "header", "time", "user_host", "query_time", "newline", "semicolon",
+    "session_prefixes", "query_time_pattern", "set_timestamp_pattern", "decode",
+])
+_TEXT_TOKENS = _Tokens(
+    "# ", "# Time:", "# User@Host:", "# Query_time:", "\n", ";",
+    _SESSION_PREFIXES,
+    re.compile(_QUERY_TIME_PATTERN),
+    re.compile(_SET_TIMESTAMP_PATTERN, re.IGNORECASE),
+    lambda value: value,
+)
+_BYTES_TOKENS = _Tokens(
+    b"# ", b"# Time:", b"# User@Host:", b"# Query_time:", b"\n", b";",
+    tuple(prefix.encode() for prefix in _SESSION_PREFIXES),
+    re.compile(_QUERY_TIME_PATTERN.encode()),
+    re.compile(_SET_TIMESTAMP_PATTERN.encode(), re.IGNORECASE),
+    # 잘못된 바이트가 있어도 분석이 중단되지 않도록 대체 문자로 디코딩
+    lambda value: value.decode("utf-8", "replace"),
+)
+
+
+def _parse_query_time_header(line, tokens):
+    """# Query_time 헤더 → (query_time_ms, lock_time_ms, rows_sent, rows_examined)"""
+    match = tokens.query_time_pattern.match(line)
+    if not match:
+        return None
+    query_time, lock_time, rows_sent, rows_examined = match.groups()
+    return (
+        float(query_time) * 1000,
+        float(lock_time) * 1000 if lock_time else None,
+        int(rows_sent) if rows_sent else None,
+        int(rows_examined) if rows_examined else None,
+    )
+
+
+def _to_record(time, user_host, header, statement, tokens):
+    sql = tokens.decode(tokens.newline.join(statement)).strip()
+    if sql.endswith(";"):
+        sql = sql[:-1].rstrip()
+    duration_ms, lock_time_ms, rows_sent, rows_examined = header
+    return SlowQuery(duration_ms, sql, time, user_host, lock_time_ms, rows_sent, rows_examined)
+
+
+def iter_slow_log_entries(lines, binary=False):
+    """
+    slow log 를 줄 단위 상태 머신으로 읽어 레코드(SlowQuery)를 순차 반환.
+    각 줄은 한 번씩만 검사하므로 여러 줄 SQL 이나 세미콜론 누락 시에도 선형 시간 보장.
+    binary=True 이면 bytes 줄을 받아 추출한 값만 디코딩.
+    """
+    tokens = _BYTES_TOKENS if binary else _TEXT_TOKENS
+    # MySQL 은 '# Time' 헤더를 시각이 바뀔 때만 기록하므로 마지막 값을 다음 레코드에도 사용
+    last_time = None
+    entry_time = None
+    user_host = None
+    header = None
+    statement = []
+
+    for line in lines:
+        if line.startswith(tokens.header):
+            # 새 헤더가 시작되면 세미콜론 없이 끝난 이전 레코드를 마감
+            if statement:
+                yield _to_record(entry_time or last_time, user_host, header, statement, tokens)
+                entry_time = user_host = header = None
+                statement = []
+
+            if line.startswith(tokens.time):
+                last_time = entry_time = tokens.decode(line[7:]).strip()
+                user_host = header = None
+            elif line.startswith(tokens.user_host):
+                user_host = tokens.decode(line[12:]).strip()
+                header = None
+            elif line.startswith(tokens.query_time):
+                header = _parse_query_time_header(line, tokens)
+            continue
+
+        # Query_time 헤더 밖의 줄 (서버 시작 메시지, 에러 로그 등)은 무시
+        if header is None:
+            continue
+
+        stripped = line.strip()
+        if not statement:
+            if not stripped:
+                continue
+            if stripped.lower().startswith(tokens.session_prefixes):
+                # '# Time' 헤더가 없는 레코드는 SET timestamp 값을 실행 시각으로 사용
+                match = tokens.set_timestamp_pattern.match(stripped)
+                if match and entry_time is None:
+                    entry_time = datetime.fromtimestamp(int(match.group(1)), timezone.utc).isoformat()
+                continue
+
+        statement.append(stripped)
+        if stripped.endswith(tokens.semicolon):
+            yield _to_record(entry_time or last_time, user_host, header, statement, tokens)
+            entry_time = user_host = header = None
+            statement = []
+
+    if statement:
+        yield _to_record(entry_time or last_time, user_host, header, statement, tokens)
+
+
+def score_slow_log(head, dialect_markers=(), foreign_markers=()):
+    """
+    로그 앞부분이 MySQL/MariaDB slow log 형식일 가능성 (0.0 ~ 1.0).
+    '# Query_time:' 헤더가 있으면 기본 점수, 해당 DBMS 고유 표기(dialect_markers)가 보이면 가산.
+    다른 DBMS 표기(foreign_markers)가 함께 보이면 가산하지 않음 (예: MariaDB 배너의 'mysqld, Version:').
+    """
+    if "# Query_time:" not in head:
+        return 0.0
+    score = 0.8
+    if "# Time:" in head or "# User@Host:" in head:
+        score += 0.1
+    if any(marker in head for marker in dialect_markers) and not any(marker in head for marker in foreign_markers):
+        score += 0.1
+    return score
+
+
+def find_last_time(text, start=0, end=None):
+    """
+    text(str 또는 bytes/mmap) 의 [start, end) 에서 마지막 '# Time' 헤더 값 (없으면 None).
+    블록/구간을 나눠 읽을 때 앞 구간의 시각을 다음 구간의 '# Time' 없는 레코드에 넘기는 데 사용.
+    """
+    end = len(text) if end is None else end
+    tokens = _TEXT_TOKENS if isinstance(text, str) else _BYTES_TOKENS
+    line_start = text.rfind(tokens.newline + tokens.time, start, end)
+    if line_start >= 0:
+        line_start += 1
+    elif text[start:start + len(tokens.time)] == tokens.time:
+        line_start = start
+    else:
+        return None
+    line_end = text.find(tokens.newline, line_start, end)
+    return tokens.decode(text[line_start + len(tokens.time):end if line_end < 0 else line_end]).strip()
@@ -0,0 +1,154 @@
+import io
+import mmap
+import os
+import re
+import tempfile
+from contextlib import contextmanager
+
+# 스트리밍 파싱 시 한 번에 처리할 블록 크기 (문자 수 기준)
+DEFAULT_BLOCK_SIZE = 4 * 1024 * 1024
+# 레코드 경계를 찾지 못할 때 블록을 강제로 잘라내는 배수 (메모리 상한)
+MAX_PENDING_BLOCKS = 4
+# mmap 줄 단위 순회 시 한 번에 분할할 구간 크기 (바이트)
+BUFFER_WINDOW_SIZE = 16 * 1024 * 1024
+
+
+@contextmanager
+def open_text_stream(fileobj, encoding="utf-8"):
+    """
+    바이너리/텍스트 파일 객체를 텍스트 스트림으로 변환.
+    잘못된 바이트는 대체 문자로 치환하며, 사용 후 원본 파일 객체는 닫지 않음.
+    """
+    if isinstance(fileobj, io.TextIOBase):
+        yield fileobj
+        return
+
+    text_stream = io.TextIOWrapper(fileobj, encoding=encoding, errors="replace")
+    try:
+        yield text_stream
+    finally:
+        # TextIOWrapper 가 GC 될 때 원본 파일(예: Streamlit UploadedFile)을 닫지 않도록 분리
+        text_stream.detach()
+
+
+def _find_block_cut(text, record_boundary):
+    """마지막 레코드 경계(새 레코드가 시작되는 줄의 시작 위치) 반환, 없으면 0"""
+    # 마지막 줄은 아직 다 읽지 않았을 수 있으므로 완결된 줄만 경계 후보로 사용
+    line_end = text.rfind("\n")
+    while line_end > 0:
+        line_start = text.rfind("\n", 0, line_end) + 1
+        if line_start == 0:
+            return 0
+        if record_boundary is None:
+            return line_end + 1
+
+        prev_start = text.rfind("\n", 0, line_start - 1) + 1
+        if record_boundary.match(text, prev_start):
+            return line_start
+        line_end = line_start - 1
+    return 0
+
+
+def iter_log_blocks(fileobj, record_boundary=None, block_size=DEFAULT_BLOCK_SIZE):
+    """
+    파일 객체를 레코드 경계에 맞춘 텍스트 블록 단위로 순차 반환.
+    record_boundary: 이전 줄 시작 위치에서 match 되면 다음 줄부터 새 레코드로 보는 compiled 정규식
+                     (None 이면 줄 단위로만 분할)
+    """
+    with open_text_stream(fileobj) as stream:
+        pending = ""
+        while True:
+            chunk = stream.read(block_size)
+            if not chunk:
+                break
+            pending += chunk
+
+            cut = _find_block_cut(pending, record_boundary)
+            if cut == 0:
+                # 레코드 하나가 블록보다 큰 경우 경계가 나올 때까지 누적 (상한 초과 시 강제 분할)
+                if len(pending) < block_size * MAX_PENDING_BLOCKS:
+                    continue
+                # 줄 중간('# Time: 2025-07-08 14' 등)에서 잘리지 않도록 마지막 완결된 줄까지 자름
+                cut = pending.rfind("\n") + 1 or len(pending)
+
+            yield pending[:cut]
+            pending = pending[cut:]
+
+        if pending:
+            yield pending
+
+
+def to_bytes_pattern(pattern):
+    """str 정규식(레코드 경계 등)을 mmap 검색용 bytes 정규식으로 변환"""
+    return re.compile(pattern.pattern.encode(), pattern.flags & ~re.UNICODE)
+
+
+def _disk_file_path(fileobj):
+    """실제 디스크 파일을 그대로 읽는 파일 객체면 그 경로 반환 (BytesIO/업로드/압축 해제 스트림은 None)"""
+    if not isinstance(fileobj, (io.FileIO, io.BufferedReader)):
+        return None
+    name = getattr(fileobj, "name", None)
+    return name if isinstance(name, str) and os.path.isfile(name) else None
+
+
+@contextmanager
+def spill_to_file(fileobj):
+    """
+    파일 객체를 mmap 가능한 실제 파일 경로로 제공.
+    디스크 파일이면 그 경로를 그대로 쓰고, 업로드(메모리) 파일은 임시 파일로 복사 후 사용이 끝나면 삭제.
+    """
+    path = _disk_file_path(fileobj)
+    if path:
+        yield path
+        return
+
+    # 압축 해제 스트림처럼 되감을 수 없는 객체는 현재 위치부터 복사
+    seekable = fileobj.seekable()
+    if seekable:
+        position = fileobj.tell()
+        fileobj.seek(0)
+    fd, path = tempfile.mkstemp(prefix="query-log-", suffix=".log")
+    try:
+        with os.fdopen(fd, "wb") as tmp:
+            while True:
+                chunk = fileobj.read(1024 * 1024)
+                if not chunk:
+                    break
+                tmp.write(chunk if isinstance(chunk, bytes) else chunk.encode("utf-8"))
+        if seekable:
+            fileobj.seek(position)
+        yield path
+    finally:
+        os.remove(path)
+
+
+@contextmanager
+def open_mmap(path):
+    """파일을 읽기 전용 mmap 으로 열기 (빈 파일은 b"" 반환)"""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b""
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            yield buffer
+
+
+def iter_buffer_lines(buffer, start=0, end=None, window=BUFFER_WINDOW_SIZE):
+    """
+    bytes/mmap 버퍼의 [start, end) 구간을 줄(bytes, 개행 제외) 단위로 순차 반환.
+    구간을 window 크기씩 줄 경계에 맞춰 잘라 분할하므로 메모리 사용량은 window 로 제한.
+    """
+    end = len(buffer) if end is None else end
+    position = start
+    while position < end:
+        window_end = min(position + window, end)
+        if window_end < end:
+            newline = buffer.rfind(b"\n", position, window_end)
+            # 한 줄이 window 보다 길면 다음 개행까지 확장
+            window_end = newline + 1 if newline >= 0 else buffer.find(b"\n", window_end, end) + 1 or end
+
+        lines = buffer[position:window_end].split(b"\n")
+        if lines and not lines[-1]:
+            lines.pop()
+        yield from lines
+        position = window_end
@@ -0,0 +1,118 @@
+import hashlib
+import os
+from collections import namedtuple
+from .base import ScanResult, carry_last_time
+from .stream import open_mmap, to_bytes_pattern
+
+# 증분 읽기 결과: 새 레코드 + 다음 실행에 저장할 체크포인트(inode, offset, head_hash, last_time)
+TailResult = namedtuple("TailResult", ["scan_result", "inode", "offset", "rotated", "head_hash", "last_time"])
+
+# copytruncate 회전 판별용으로 해시하는 파일 앞부분 최대 크기
+HEAD_HASH_BYTES = 4096
+
+# 서버 로그 경로로 읽을 수 있는 디렉터리 (여러 개는 os.pathsep 으로 구분, 비어 있으면 서버 로그 읽기 불가)
+SERVER_LOG_ROOTS = [root for root in os.getenv("SERVER_LOG_ROOTS", "").split(os.pathsep) if root]
+
+
+def resolve_server_log_path(path, roots=None):
+    """
+    입력한 서버 로그 경로를 실제 경로로 바꿔 허용된 디렉터리(SERVER_LOG_ROOTS) 안에 있는지 확인.
+    심볼릭 링크/.. 로 벗어나는 경로까지 막기 위해 realpath 기준으로 비교하며, 허용되지 않으면 ValueError.
+    """
+    roots = SERVER_LOG_ROOTS if roots is None else roots
+    if not roots:
+        raise ValueError("서버 로그를 읽을 수 있는 경로(SERVER_LOG_ROOTS)가 설정되지 않았습니다.")
+    real_path = os.path.realpath(path)
+    for root in roots:
+        real_root = os.path.realpath(root)
+        if os.path.commonpath([real_path, real_root]) == real_root:
+            return real_path
+    raise ValueError(f"허용된 로그 경로({', '.join(roots)}) 밖의 파일은 읽을 수 없습니다: {path}")
+
+
+def _last_record_start(buffer, record_boundary, start, end):
+    """[start, end) 에서 마지막 레코드가 시작되는 위치 (없으면 start)"""
+    line_start = buffer.rfind(b"\n", start, end - 1) + 1
+    while line_start > start:
+        prev_start = max(buffer.rfind(b"\n", start, line_start - 1) + 1, start)
+        if record_boundary.match(buffer, prev_start, end):
+            return line_start
+        line_start = prev_start
+    return start
+
+
+def _complete_end(parser, buffer, start, end):
+    """
+    [start, end) 중 완결된 레코드까지의 끝 위치.
+    기록 중인 마지막 줄과, 다음 레코드가 나타나기 전까지 완결을 알 수 없는 마지막 레코드는 다음 실행으로 미룸.
+    """
+    line_end = buffer.rfind(b"\n", start, end) + 1
+    if line_end <= start or parser.record_boundary_pattern is None:
+        return max(line_end, start)
+    return _last_record_start(buffer, to_bytes_pattern(parser.record_boundary_pattern), start, line_end)
+
+
+def _scan_from(parser, path, offset, threshold_ms, result, last_time=None, final=False):
+    """
+    path 의 offset 이후를 스캔해 result 에 추가하고 (읽은 끝 위치, 그때까지의 마지막 시각 헤더 값) 반환.
+    final 이면 파일 끝까지 읽으며, 파일 안에 시각 헤더가 없으면 이전 파일/체크포인트의 last_time 을 이어받음.
+    """
+    with open_mmap(path) as buffer:
+        end = len(buffer)
+        if offset >= end:
+            return offset, parser.find_last_time(buffer) or last_time
+        if not final:
+            end = _complete_end(parser, buffer, offset, end)
+        if end > offset:
+            part = parser.scan_buffer(buffer, threshold_ms, offset, end)
+            result.slow_queries.extend(carry_last_time(part.slow_queries, last_time))
+            result.error_queries.extend(part.error_queries)
+        return end, parser.find_last_time(buffer, 0, end) or last_time
+
+
+def _head_hash(path, offset):
+    """파일 앞부분(offset 과 HEAD_HASH_BYTES 중 작은 크기) 해시 (덧붙여 쓰기만 하면 바뀌지 않음)"""
+    with open(path, "rb") as f:
+        head = f.read(min(offset, HEAD_HASH_BYTES))
+    return hashlib.sha1(head).hexdigest()
+
+
+def _find_rotated_file(path, inode):
+    """같은 디렉터리에서 회전(rename)된 이전 로그 파일 찾기 (예: slow.log → slow.log.1)"""
+    directory, name = os.path.split(os.path.abspath(path))
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.name != name and entry.name.startswith(name) and entry.is_file() and entry.inode() == inode:
+                    return entry.path
+    except OSError:
+        return None
+    return None
+
+
+def read_new_records(parser, path, inode=None, offset=0, threshold_ms=0, head_hash=None, last_time=None):
+    """
+    계속 커지는 로그 파일에서 지난 체크포인트(inode, offset, head_hash, last_time) 이후 완결된 레코드만 읽기.
+    - inode 가 바뀌면 회전된 것으로 보고, 같은 디렉터리에 남은 이전 파일의 나머지를 먼저 읽은 뒤 새 파일을 처음부터 읽음
+      (회전하면서 압축된 이전 파일은 찾을 수 없으므로 남은 부분은 건너뜀)
+    - 같은 inode 인데 크기가 offset 보다 작거나 앞부분 해시가 다르면 copytruncate 방식 회전으로 보고 처음부터 읽음
+      (잘린 뒤 다시 offset 이상으로 커진 경우도 판별)
+    - last_time 은 지난 실행까지의 마지막 '# Time' 값으로, 회전 후 새 파일의 '# Time' 없는 첫 레코드에도 이어 씀
+    """
+    current_inode = os.stat(path).st_ino
+    result = ScanResult([], [])
+    rotated = False
+
+    if inode is not None and inode != current_inode:
+        rotated = True
+        rotated_path = _find_rotated_file(path, inode)
+        if rotated_path:
+            # 회전된 파일에는 더 이상 기록되지 않으므로 마지막 레코드까지 모두 완결된 것으로 처리
+            _, last_time = _scan_from(parser, rotated_path, offset, threshold_ms, result, last_time, final=True)
+        offset = 0
+    elif os.path.getsize(path) < offset or (head_hash is not None and _head_hash(path, offset) != head_hash):
+        rotated = True
+        offset = 0
+
+    offset, last_time = _scan_from(parser, path, offset, threshold_ms, result, last_time)
+    return TailResult(result, current_inode, offset, rotated, _head_hash(path, offset), last_time)
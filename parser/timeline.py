@@ -0,0 +1,85 @@
+import os
+import numpy as np
+import pandas as pd
+from .hotspot import sql_feature_labels
+from .records import record_dbms_types
+
+# 시간 버킷 단위 (pandas offset alias)
+TIMELINE_FREQS = {"minute": "min", "hour": "h"}
+# 계열 분할 기준 (None: 전체 합계)
+TIMELINE_SPLITS = (None, "fingerprint", "table")
+# 계열로 나눠 그릴 최대 개수 (총 소요 시간 상위, 나머지는 OTHER_SERIES 로 합침)
+TIMELINE_MAX_SERIES = int(os.getenv("TIMELINE_MAX_SERIES", "10"))
+OTHER_SERIES = "(기타)"
+
+# 로그별 시각 뒤에 붙는 시간대 표기 (예: ' UTC', ' KST', 'Z', '+09', '+09:00') - 로그에 기록된 현지 시각 기준으로 집계
+_TIMEZONE_SUFFIX_PATTERN = r'(?:Z|\s+[A-Za-z]{2,5}|[+-]\d\d(?::?\d\d)?)$'
+# MySQL 5.x slow log '# Time: 230703  9:34:56' 형식
+_MYSQL_LEGACY_TIME_PATTERN = r'^(\d{6})\s+(\d{1,2}):(\d\d:\d\d)$'
+
+
+def parse_timestamps(timestamps):
+    """
+    레코드 timestamp 문자열 목록을 datetime64 Series 로 일괄 변환 (해석할 수 없으면 NaT).
+    ISO 8601 계열(PostgreSQL/MySQL 5.7+/csvlog/jsonlog)과 MySQL 5.x 'YYMMDD H:MM:SS' 형식을 지원.
+    """
+    text = pd.Series(timestamps, dtype="string").str.strip().str.replace(_TIMEZONE_SUFFIX_PATTERN, "", regex=True)
+    parsed = pd.to_datetime(text, format="ISO8601", errors="coerce")
+
+    legacy = parsed.isna() & text.str.match(_MYSQL_LEGACY_TIME_PATTERN).fillna(False)
+    if legacy.any():
+        legacy_text = text[legacy].str.replace(_MYSQL_LEGACY_TIME_PATTERN, r"\1 \2:\3", regex=True)
+        parsed[legacy] = pd.to_datetime(legacy_text, format="%y%m%d %H:%M:%S", errors="coerce")
+    return parsed
+
+
+def build_timeline(slow_queries, freq="minute", split_by=None, max_series=TIMELINE_MAX_SERIES, dbms_type=None):
+    """
+    슬로우 쿼리를 실행 시각 버킷(분/시간)별로 집계한 DataFrame.
+    컬럼: bucket, series(split_by 지정 시), count, total_ms, p95_ms
+    split_by='table' 이면 여러 테이블을 읽는 쿼리는 테이블마다 집계되며, 시각을 해석할 수 없는 레코드는 제외.
+    dbms_type 은 출처(LogSource)가 없는 레코드의 SQL 방언.
+    """
+    if freq not in TIMELINE_FREQS:
+        raise ValueError(f"지원하지 않는 시간 단위입니다: {freq}")
+    if split_by not in TIMELINE_SPLITS:
+        raise ValueError(f"지원하지 않는 분할 기준입니다: {split_by}")
+
+    keys = ["bucket"] if split_by is None else ["bucket", "series"]
+    frame = pd.DataFrame({
+        "bucket": parse_timestamps([query.timestamp for query in slow_queries]).dt.floor(TIMELINE_FREQS[freq]),
+        "duration_ms": np.fromiter((query.duration_ms for query in slow_queries), dtype=np.float64, count=len(slow_queries)),
+    })
+    if split_by is not None:
+        frame["series"] = sql_feature_labels([query.sql for query in slow_queries], split_by, record_dbms_types(slow_queries, dbms_type))
+        if split_by == "table":
+            frame = frame.explode("series", ignore_index=True)
+    frame = frame.dropna(subset=["bucket"])
+    if frame.empty:
+        return pd.DataFrame(columns=keys + ["count", "total_ms", "p95_ms"])
+
+    if split_by is not None:
+        # 총 소요 시간 상위 max_series 개 계열만 남기고 나머지는 하나로 합침
+        totals = frame.groupby("series", sort=False)["duration_ms"].sum()
+        if len(totals) > max_series:
+            frame["series"] = frame["series"].where(frame["series"].isin(totals.nlargest(max_series).index), OTHER_SERIES)
+
+    grouped = frame.groupby(keys, sort=True)["duration_ms"]
+    timeline = grouped.agg(count="count", total_ms="sum")
+    timeline["p95_ms"] = grouped.quantile(0.95)
+    return timeline.reset_index()
+
+
+def pivot_timeline(timeline, metric="count", freq="minute"):
+    """
+    차트용 넓은 표: 버킷 시각 인덱스(빈 구간 포함) × 계열 컬럼.
+    빈 구간의 count/total_ms 는 0, p95_ms 는 값 없음(NaN).
+    """
+    if timeline.empty:
+        return pd.DataFrame()
+    if "series" in timeline.columns:
+        wide = timeline.pivot(index="bucket", columns="series", values=metric)
+    else:
+        wide = timeline.set_index("bucket")[[metric]]
+    wide = wide.asfreq(TIMELINE_FREQS[freq])
+    return wide if metric == "p95_ms" else wide.fillna(0)
@@ -1,4 +1,7 @@
+import hashlib
 import html
+import tarfile
+import zipfile
 import pandas as pd
 from urllib.parse import quote
 from datetime import date
@@ -6,20 +9,33 @@ import time
 import uuid
 import streamlit as st
 import os
+from concurrent.futures import ThreadPoolExecutor
 from auth.session import is_logged_in, save_session_state
 from utils.datetime import datetime, utc_to_local
 from utils.string import get_truncated_sql
 from auth.session import get_current_user
 from database.user_project import list_user_projects
 from database.query_log import create_query_log, list_query_logs_by_user_id
-from ai.blob import upload_to_blob
+from database.log_checkpoint import get_log_checkpoint, save_log_checkpoint
+from database.digest_snapshot import save_digest_snapshot, list_digest_snapshots, get_digest_snapshot_stats
+from database.suggestion_cache import get_suggestion_cache_stats
+from ai.blob import upload_to_blob, upload_files_to_blob
 # from utils.ai import analyze_query_log_file
-from parser.mariadb import MariaDBLogParser
-from parser.postgresql import PostgresqlLogParser
-from parser.mysql import MysqlLogParser
-
-from ai.search_client import get_embedding, index_query_to_search, search_documents
-from ai.openai_client import get_tuning_suggestion
+from parser.registry import list_parsers, get_parser, detect_parser
+from parser.records import rank_slow_queries
+from parser.digest import aggregate_slow_queries
+from parser.fingerprint import fingerprint_id
+from parser.hotspot import build_hotspot_report
+from parser.compare import COMPARE_TOLERANCE, STATUS_REGRESSION, STATUS_IMPROVEMENT, STATUS_NEW, STATUS_GONE, compare_digests, digests_to_frame, summarize_comparison
+from parser.timeline import OTHER_SERIES, build_timeline, pivot_timeline
+from parser.archive import ARCHIVE_FILE_TYPES, is_archive, extract_log_files, resolve_log_parsers, scan_log_files
+from parser.cache import CACHE_FORMAT_VERSION, ParsedLog, parse_cache, hash_fileobj
+from parser.index import DurationIndex
+from parser.compression import LOG_FILE_TYPES, COMPRESSED_FILE_TYPES, DECOMPRESSION_ERRORS
+from parser.tail import read_new_records, resolve_server_log_path
+
+from ai.search_client import get_embedding, index_query_to_search, index_queries_to_search, search_documents
+from ai.openai_client import AZURE_OPENAI_MAX_CONCURRENCY, get_tuning_suggestions_bulk, stream_cached_tuning_suggestion
 
 class UserDashboard:
     """사용자 메뉴 클래스"""
@@ -71,83 +87,234 @@ class UserDashboard:
             st.divider()
             st.subheader("📤 쿼리 로그 업로드 및 분석")
 
-            dbms_options = {
-                "PostgreSQL": "postgresql",
-                "MariaDB": "mariadb",
-                "MySQL": "mysql"
-            }
+            # 파서 레지스트리에 등록된 형식을 선택지로 사용 (자동 감지 시 파일 앞부분으로 판별)
+            dbms_options = {"🔎 자동 감지": None}
+            dbms_options.update({self._format_parser_label(parser_class): parser_class.get_format_id() for parser_class in list_parsers()})
             # select_dbms = st.sidebar.selectbox("📦 대상 DBMS", options=list(dbms_options.keys()))
             select_dbms = st.selectbox("📦 대상 DBMS", options=list(dbms_options.keys()))
-            dbms_type = dbms_options[select_dbms]
-
-            if dbms_type == "postgresql":
-                parser = PostgresqlLogParser()
-            elif dbms_type == "mariadb":
-                parser = MariaDBLogParser()
-            elif dbms_type == "mysql":
-                parser = MysqlLogParser()
-            else:
-                st.error("지원하지 않는 DBMS입니다.")
-                st.stop()
-
-            uploaded_file = st.file_uploader(
-                # lable="로그 파일 업로드 (LOG, TXT)", 
-                label="📂 파일을 마우스로 끌어 오거나 클릭하여 업로드 하세요.",
-                type=["log", "txt"],
-                help="PostgreSQL, MariaDB, MySQL 로그 파일만 업로드할 수 있습니다."
-            )
+            format_id = dbms_options[select_dbms]
 
-            st.number_input(
-                label="**⏱ 슬로우 쿼리 기준 시간 (ms)** (100 ~ 10000 사이의 값 입력)",
-                min_value=100,
-                max_value=10000,
-                # value=st.session_state.get("slow_query_threshold", 2000),
-                step=100,
-                key="input_slow_value",
-                on_change=self.on_input_change,
-            )
+            log_source_options = {
+                "📂 파일 업로드": "upload",
+                "📡 서버 로그 경로 (증분 분석)": "tail",
+            }
+            select_log_source = st.radio("**📥 로그 입력 방식**", options=list(log_source_options.keys()), horizontal=True)
+            log_source = log_source_options[select_log_source]
+
+            uploaded_files = []
+            uploaded_file = None
+            log_path = None
+            read_new_logs = False
+            if log_source == "upload":
+                uploaded_files = st.file_uploader(
+                    # lable="로그 파일 업로드 (LOG, TXT)", 
+                    label="📂 파일을 마우스로 끌어 오거나 클릭하여 업로드 하세요.",
+                    type=LOG_FILE_TYPES + COMPRESSED_FILE_TYPES + ARCHIVE_FILE_TYPES,
+                    accept_multiple_files=True,
+                    help="PostgreSQL, MariaDB, MySQL 로그 파일만 업로드할 수 있습니다. (gz/bz2/xz/zst 압축 파일은 그대로 업로드, "
+                         "회전된 여러 파일이나 zip/tar 묶음은 한 번에 올리면 파일별로 동시에 파싱해 합쳐서 분석)"
+                ) or []
+                # 파일 하나면 기존 단일 파일 분석, 여러 파일이나 묶음 파일은 파일별 병렬 분석
+                if len(uploaded_files) == 1 and not is_archive(uploaded_files[0], uploaded_files[0].name):
+                    uploaded_file = uploaded_files[0]
+            else:
+                log_path = st.text_input(
+                    "📡 분석 서버의 로그 파일 경로",
+                    placeholder="/var/log/mysql/slow.log",
+                    help="지난 분석 이후 새로 기록된 레코드만 읽습니다. (파일 회전 시 이전 파일의 남은 부분부터 이어서 읽음)"
+                ).strip()
+                if log_path:
+                    # 다른 프로젝트 로그나 로그가 아닌 파일을 읽지 못하도록 허용된 디렉터리 안의 경로만 사용
+                    try:
+                        log_path = resolve_server_log_path(log_path)
+                    except ValueError as e:
+                        st.error(str(e))
+                        st.stop()
+                read_new_logs = st.button("🔄 새 로그 읽기", disabled=not log_path)
+
+            threshold_modes = {
+                "고정 시간 (ms)": "fixed",
+                "상위 백분위 (pXX 이상)": "percentile",
+            }
+            select_threshold_mode = st.radio("**⏱ 슬로우 쿼리 기준 방식**", options=list(threshold_modes.keys()), horizontal=True)
+            threshold_mode = threshold_modes[select_threshold_mode]
 
             slow_query_threshold_ms = st.session_state["slow_query_threshold"]
-            st.write(f"현재 슬로우 쿼리 기준 시간: {slow_query_threshold_ms} ms")
+            if threshold_mode == "fixed":
+                st.number_input(
+                    label="**⏱ 슬로우 쿼리 기준 시간 (ms)** (100 ~ 10000 사이의 값 입력)",
+                    min_value=100,
+                    max_value=10000,
+                    # value=st.session_state.get("slow_query_threshold", 2000),
+                    step=100,
+                    key="input_slow_value",
+                    on_change=self.on_input_change,
+                )
+                st.write(f"현재 슬로우 쿼리 기준 시간: {slow_query_threshold_ms} ms")
+            else:
+                threshold_percentile = st.slider(
+                    label="**⏱ 실행 시간 상위 백분위 기준**",
+                    min_value=50.0,
+                    max_value=99.9,
+                    value=95.0,
+                    step=0.1,
+                    format="p%.1f",
+                )
 
 
             language = st.selectbox("🌐 튜닝 제안 언어", ["한국어", "English", "Tiếng Việt"])
 
-            if uploaded_file:
-                content = None
+            sort_options = {
+                "로그 순서": None,
+                "실행 시간": "duration",
+                "검사/반환 행 비율 (Rows_examined / Rows_sent)": "rows_ratio",
+                "Lock 시간": "lock_time",
+            }
+            select_sort = st.selectbox("📊 슬로우 쿼리 정렬 기준", options=list(sort_options.keys()))
+            group_by_fingerprint = st.checkbox(
+                "🧩 같은 형태의 쿼리(fingerprint)끼리 묶어 보기",
+                value=True,
+                help="리터럴/IN 목록/주석을 제거한 쿼리 형태별로 실행 횟수와 소요 시간을 집계하고, 가장 느린 실행 건으로 AI 분석합니다."
+            )
+
+            # 수백만 건 이상의 대용량 로그는 전체 레코드 대신 상위 K개 / 무작위 표본만 메모리에 보관
+            sampling_options = {
+                "전체 레코드": None,
+                "느린 쿼리 상위 K개 (대용량 로그)": "top",
+                "무작위 표본 K개 (대용량 로그)": "sample",
+            }
+            sampling_mode = None
+            sample_size = None
+            if log_source == "upload":
+                select_sampling = st.selectbox(
+                    "🗜 분석 범위",
+                    options=list(sampling_options.keys()),
+                    help="상위 K개는 정렬 기준으로 가장 느린 K개와 총 소요 시간 상위 K개 쿼리 형태를, 무작위 표본은 로그 전체에서 고르게 뽑은 K개를 보관합니다."
+                )
+                sampling_mode = sampling_options[select_sampling]
+                if sampling_mode and uploaded_files and not uploaded_file:
+                    st.info("여러 파일/묶음 파일은 전체 레코드로 분석합니다.")
+                    sampling_mode = None
+                if sampling_mode:
+                    sample_size = int(st.number_input("보관할 레코드 수 (K)", min_value=10, max_value=100000, value=1000, step=100))
+
+            if uploaded_files or log_path:
                 project_code = selected_project["project_code"]
-                # st.markdown(f"##### 💡 uploaded_file.name: {uploaded_file.name}")
-                if uploaded_file.name != st.session_state["prev_file_name"]:
-                    st.session_state["prev_file_name"] = uploaded_file.name   
-                    st.session_state["slow_query_page"] = 0 
-                    st.session_state["error_query_page"] = 0
-
-                    keys_to_delete = [
-                        key for key in st.session_state.keys() 
-                        if "clicked_btn_ai_" in key or "result_suggestion_btn_ai_" in key or "result_similar_btn_ai_" in key
-                    ]
-                    for key in keys_to_delete:
-                        del st.session_state[key]
-
-                    with st.spinner("파일 업로드 중..."):
-
-                        content = uploaded_file.read().decode("utf-8")
-                        st.session_state["upload_content"] = content
-                        
-                        # 1️⃣ Azure Blob Storage 업로드
-                        blob_path = upload_to_blob(file=uploaded_file, project_code=project_code, dbms_type=dbms_type)
-                        self._save_and_rerun()
-                else:
-                    content = st.session_state["upload_content"]
 
-                st.success("✅ Azure Blob Storage 업로드 완료")
+                bounded_log = None
+                if uploaded_file:
+                    parser = self._resolve_parser(format_id, uploaded_file, uploaded_file.name)
+                    # 검색 필터/Blob 경로는 로그 형식과 무관하게 DBMS 단위로 사용
+                    dbms_type = parser.dbms_type
+
+                    # st.markdown(f"##### 💡 uploaded_file.name: {uploaded_file.name}")
+                    if uploaded_file.name != st.session_state["prev_file_name"]:
+                        st.session_state["prev_file_name"] = uploaded_file.name   
+                        st.session_state["slow_query_page"] = 0 
+                        st.session_state["error_query_page"] = 0
+
+                        self._clear_ai_results()
+
+                        with st.spinner("파일 업로드 중..."):
+
+                            # 1️⃣ Azure Blob Storage 업로드 (압축 파일은 압축된 그대로 저장)
+                            uploaded_file.seek(0)
+                            blob_path = upload_to_blob(file=uploaded_file, project_code=project_code, dbms_type=dbms_type)
+                            # 파싱 캐시 키로 사용할 파일 내용 해시
+                            st.session_state["upload_content_hash"] = hash_fileobj(uploaded_file)
+                            self._save_and_rerun()
 
-                slow_queries = parser.extract_slow_queries(content, slow_query_threshold_ms)
-                error_queries = parser.extract_error_queries(content)
+                    st.success("✅ Azure Blob Storage 업로드 완료")
+
+                    # 전체 내용을 문자열로 디코딩하지 않고 파일 객체를 한 번만 읽어 슬로우/오류 쿼리를 함께 추출
+                    # 같은 파일/DBMS 는 캐시된 파싱 결과를 재사용 (버튼 클릭 등 rerun 시 재파싱 방지)
+                    try:
+                        if sampling_mode:
+                            # 기준 시간은 스캔 중에 적용 (백분위 방식은 보관한 레코드 기준으로 추정)
+                            bounded_log = parse_cache.get_or_scan_bounded(
+                                parser,
+                                uploaded_file,
+                                slow_query_threshold_ms if threshold_mode == "fixed" else 0,
+                                sample_size,
+                                mode=sampling_mode,
+                                by=sort_options[select_sort] or "duration",
+                                content_hash=st.session_state.get("upload_content_hash"),
+                            )
+                            parsed_log = ParsedLog(bounded_log.scan_result, DurationIndex(bounded_log.scan_result.slow_queries))
+                        else:
+                            parsed_log = parse_cache.get_or_parse(parser, uploaded_file, st.session_state.get("upload_content_hash"))
+                    except (ValueError,) + DECOMPRESSION_ERRORS as e:
+                        # 손상된 압축 파일 또는 zstandard 미설치 등
+                        st.error(f"로그 파일을 읽을 수 없습니다: {e}")
+                        st.stop()
+                elif uploaded_files:
+                    dbms_type, parsed_log = self._analyze_uploaded_files(format_id, uploaded_files, project_code)
+                else:
+                    parser = self._resolve_parser(format_id, log_path, log_path)
+                    dbms_type = parser.dbms_type
+                    parsed_log = self._follow_server_log(parser, project_code, log_path, read_new_logs)
+
+                error_queries = parsed_log.scan_result.error_queries
+
+                # 기준 시간/백분위 변경은 재파싱 없이 정렬된 실행 시간 인덱스에서 바로 필터링
+                duration_index = parsed_log.duration_index
+                if threshold_mode == "percentile":
+                    slow_query_threshold_ms = duration_index.percentile(threshold_percentile)
+                    st.write(f"p{threshold_percentile:g} 기준 시간: {slow_query_threshold_ms:.2f} ms")
+                slow_queries = duration_index.above(slow_query_threshold_ms)
+
+                if slow_queries and st.checkbox("📈 시간대별 워크로드 보기", help="슬로우 쿼리를 실행 시각 기준 분/시간 단위로 집계해 장애 시점과 비교합니다."):
+                    self._show_workload_timeline(slow_queries, dbms_type)
+
+                if (slow_queries or error_queries) and st.checkbox("🔥 테이블/패턴별 핫스팟 보기", help="슬로우 쿼리 소요 시간과 오류 건수를 테이블 또는 쿼리 패턴(JOIN, SUBQUERY 등)별로 집계합니다."):
+                    self._show_hotspot_report(slow_queries, error_queries, dbms_type)
+
+                # 튜닝 전/후 비교 메뉴에서 쓸 수 있도록 현재 분석의 쿼리 형태별 집계를 저장 (표본만 보관한 대용량 모드 제외)
+                if slow_queries and not bounded_log:
+                    with st.expander("💾 전/후 비교용으로 현재 분석 저장"):
+                        source_name = ", ".join(uploaded.name for uploaded in uploaded_files) or log_path
+                        snapshot_label = st.text_input("저장 이름", value=f"{date.today()} {source_name}")
+                        if st.button("저장", key="btn_save_digest_snapshot"):
+                            snapshot_digests = aggregate_slow_queries(slow_queries, dbms_type)
+                            save_digest_snapshot(project_code, dbms_type, snapshot_label, snapshot_digests, self.current_user["user_id"])
+                            st.success(f"✅ 쿼리 형태 {len(snapshot_digests):,}개 집계를 저장했습니다.")
+
+                slow_digests = None
+                if group_by_fingerprint:
+                    # 쿼리 형태별 집계 후 대표 쿼리(가장 느린 실행 건)만 분석 대상으로 사용 (총 소요 시간 순)
+                    if bounded_log and bounded_log.digests is not None:
+                        # 상위 K 모드는 로그 전체를 스트리밍으로 집계한 상위 K개 형태 사용 (백분위는 표본 기준 추정치)
+                        slow_digests = bounded_log.digests
+                        slow_query_count = bounded_log.slow_total
+                    else:
+                        slow_digests = aggregate_slow_queries(slow_queries, dbms_type)
+                        slow_query_count = len(slow_queries)
+                    slow_queries = [digest.sample for digest in slow_digests]
+                else:
+                    slow_queries = rank_slow_queries(slow_queries, by=sort_options[select_sort])
+
+                if slow_queries or error_queries:
+                    with st.expander("⚡ 전체 AI 분석"):
+                        st.caption("아래 목록 순서대로 상위 N개 슬로우/오류 쿼리의 튜닝 제안을 동시에 요청합니다. 이미 분석한 쿼리는 건너뜁니다.")
+                        col1, col2, col3 = st.columns(3)
+                        bulk_slow_count = col1.number_input("슬로우 쿼리 상위 N개", min_value=0, max_value=len(slow_queries), value=min(20, len(slow_queries)))
+                        bulk_error_count = col2.number_input("오류 쿼리 상위 N개", min_value=0, max_value=len(error_queries), value=min(20, len(error_queries)))
+                        bulk_concurrency = col3.number_input("동시 요청 수", min_value=1, max_value=32, value=AZURE_OPENAI_MAX_CONCURRENCY)
+                        if st.button("⚡ 전체 분석 시작", key="btn_ai_bulk", disabled=not (bulk_slow_count or bulk_error_count)):
+                            self._run_bulk_ai_analysis(
+                                [("slow_digest" if slow_digests else "slow", query) for query in slow_queries[:bulk_slow_count]]
+                                + [("error", query) for query in error_queries[:bulk_error_count]],
+                                dbms_type, project_code, language, bulk_concurrency,
+                            )
 
                 if slow_queries:
-                    filters = f"query_type eq 'slow' and project_code eq '{project_code}' and dbms_type eq '{dbms_type}'"                
-                    st.subheader(f"🐢 Slow Query {len(slow_queries)}개 발견됨")
+                    if slow_digests:
+                        st.subheader(f"🐢 Slow Query {slow_query_count}건 ({len(slow_digests)}개 유형) 발견됨")
+                        st.dataframe(self._create_query_digests_dataframe(slow_digests), use_container_width=True)
+                    else:
+                        st.subheader(f"🐢 Slow Query {len(slow_queries)}개 발견됨")
+                    if bounded_log:
+                        st.caption(self._format_bounded_caption(sampling_mode, bounded_log.slow_total, len(bounded_log.scan_result.slow_queries)))
 
                     page_size = 10
                     page = st.session_state.get("slow_query_page", 0)
@@ -155,13 +322,32 @@ class UserDashboard:
                     end_idx = (page + 1) * page_size
                     end_idx = min(end_idx, len(slow_queries))
 
-                    for i, (duration, sql) in enumerate(slow_queries[start_idx:end_idx], start=1):  
-                        with st.expander(f"[Slow {i}] {duration:.2f}ms"):
+                    for i, query in enumerate(slow_queries[start_idx:end_idx], start=1):  
+                        duration, sql = query.duration_ms, query.sql
+                        # 여러 파일을 함께 분석하면 레코드가 나온 파일의 DBMS 기준으로 검색/분석
+                        query_dbms_type = query.source.dbms_type if query.source else dbms_type
+                        filters = f"query_type eq 'slow' and project_code eq '{project_code}' and dbms_type eq '{query_dbms_type}'"
+                        if slow_digests:
+                            digest = slow_digests[i - 1]
+                            key_suffix = f"slow_digest_{i}"
+                            title = (f"[Slow {i}] {digest.count:,}회 · total {digest.total_ms:,.0f}ms · "
+                                     f"p95 {digest.p95_ms:.2f}ms · max {digest.max_ms:.2f}ms")
+                        else:
+                            key_suffix = f"slow_{i}"
+                            title = f"[Slow {i}] {duration:.2f}ms{self._format_slow_query_stats(query)}"
+
+                        with st.expander(title):
+                            if slow_digests:
+                                st.caption(f"fingerprint: {slow_digests[i - 1].fingerprint}")
+                            query_origin = (query.source.name if query.source else None, query.timestamp, query.user_host)
+                            if any(query_origin):
+                                st.caption(" | ".join(v for v in query_origin if v))
                             st.code(sql, language="sql")
-                            btn_key = f"btn_ai_slow_{i}"
-                            clicked_btn_key = f"clicked_btn_ai_slow_{i}"
-                            result_suggestion = f"result_suggestion_btn_ai_slow_{i}"
-                            result_similar = f"result_similar_btn_ai_slow_{i}"
+                            btn_key = f"btn_ai_{key_suffix}"
+                            clicked_btn_key = f"clicked_btn_ai_{key_suffix}"
+                            result_suggestion = f"result_suggestion_btn_ai_{key_suffix}"
+                            result_similar = f"result_similar_btn_ai_{key_suffix}"
+                            result_cached = f"result_cached_btn_ai_{key_suffix}"
 
                             if clicked_btn_key not in st.session_state:
                                 st.session_state[clicked_btn_key] = False
@@ -176,14 +362,15 @@ class UserDashboard:
                                 if not st.session_state[clicked_btn_key]: 
                                     if st.button("💡 AI 튜닝 제안", key=btn_key):
                                         with st.spinner("AI 분석 중..."):
-                                            similar_queries = search_documents(dbms_type=dbms_type, query_text=sql, filters=filters , top_k=5)
+                                            similar_queries = search_documents(dbms_type=query_dbms_type, query_text=sql, filters=filters , top_k=5)
                                             similar_data = [
                                                 {'sql_query': r['sql_query'], 'suggestion': r['suggestion']}
                                                 for r in similar_queries if r.get('@search.score', 0) > 0.7
                                             ]
-                                            suggestion = get_tuning_suggestion(sql, duration, language, similar_data, dbms_type=dbms_type)
-                                            # st.markdown("##### 💡 AI 튜닝 제안")
-                                            # st.write(suggestion)
+                                            # 제안은 받는 대로 표시하고, 끝까지 받은 전체 텍스트만 저장 (중간에 실패하면 RuntimeError 로 저장/색인 생략)
+                                            st.markdown("##### 💡 AI 튜닝 제안")
+                                            suggestion_stream, cached = stream_cached_tuning_suggestion(sql, duration, language, similar_data, dbms_type=query_dbms_type, query_type="slow")
+                                            suggestion = st.write_stream(suggestion_stream)
 
                                             # if similar_data:
                                                 # st.markdown("##### 🔍 유사 쿼리 참고")
@@ -191,9 +378,10 @@ class UserDashboard:
                                                     # st.write(f"**유사 쿼리 {idx}:** {sim['sql_query'][:100]}...")
                                                     # st.write(f"**유사 쿼리 {idx}:** {sim['sql_query']}")
 
-                                            create_query_log("slow", duration, sql, suggestion, language, dbms_type, project_code=selected_project["project_code"], user_id=self.current_user["user_id"])
+                                            create_query_log("slow", duration, sql, suggestion, language, query_dbms_type, project_code=selected_project["project_code"], user_id=self.current_user["user_id"])
                                             
-                                            embedding = get_embedding(sql)
+                                            # 캐시된 제안은 이미 검색 인덱스에 있으므로 다시 색인하지 않음
+                                            embedding = None if cached else get_embedding(sql)
                                             if embedding:
                                                 doc = {
                                                     "id": str(uuid.uuid4()),
@@ -203,16 +391,17 @@ class UserDashboard:
                                                     "query_type": "slow",
                                                     "duration_ms": duration,
                                                     "language": language,
-                                                    "dbms_type": dbms_type,
+                                                    "dbms_type": query_dbms_type,
                                                     "project_code": selected_project["project_code"],
                                                     "created_at": datetime.now().astimezone().isoformat(),
                                                     "sql_embedding": embedding
                                                 }
-                                                index_query_to_search(doc, dbms_type)
+                                                index_query_to_search(doc, query_dbms_type)
                                             # ✅ 상태 저장
                                             st.session_state[clicked_btn_key] = True
                                             st.session_state[result_suggestion] = suggestion
                                             st.session_state[result_similar] = similar_data
+                                            st.session_state[result_cached] = cached
                                             self._save_and_rerun()
                             except Exception as e:
                                 st.error(f"{e}")
@@ -221,6 +410,8 @@ class UserDashboard:
                                 # 결과 출력
                                 if st.session_state[result_suggestion]:
                                     st.markdown("##### 💡 AI 튜닝 제안")
+                                    if st.session_state.get(result_cached):
+                                        st.caption("💾 같은 쿼리 형태의 이전 제안 (캐시)")
                                     st.write(st.session_state[result_suggestion])
                                     # st.info("🔒 이미 분석된 쿼리입니다.")
                                     if st.session_state[result_similar]:
@@ -247,8 +438,9 @@ class UserDashboard:
                         st.markdown("✅ 모든 슬로우 쿼리를 다 확인했습니다.")
 
                 if error_queries:
-                    filters = f"query_type eq 'error' and project_code eq '{project_code}' and dbms_type eq '{dbms_type}'"
                     st.subheader(f"❌ Error Query {len(error_queries)}개 발견됨")
+                    if bounded_log:
+                        st.caption(self._format_bounded_caption("sample", bounded_log.error_total, len(error_queries)))
 
                     page_size = 10
                     page = st.session_state.get("error_query_page", 0)
@@ -256,11 +448,15 @@ class UserDashboard:
                     end_idx = (page + 1) * page_size
                     end_idx = min(end_idx, len(error_queries))
 
-                    for i, sql in enumerate(error_queries[start_idx:end_idx], start=1):
+                    for i, error_query in enumerate(error_queries[start_idx:end_idx], start=1):
+                        sql = error_query.sql
+                        query_dbms_type = error_query.source.dbms_type if error_query.source else dbms_type
+                        filters = f"query_type eq 'error' and project_code eq '{project_code}' and dbms_type eq '{query_dbms_type}'"
                         btn_key = f"btn_ai_error_{i}"
                         clicked_btn_key = f"clicked_btn_ai_error_{i}"
                         result_suggestion = f"result_suggestion_btn_ai_error_{i}"
                         result_similar = f"result_similar_btn_ai_error_{i}"
+                        result_cached = f"result_cached_btn_ai_error_{i}"
 
                         if clicked_btn_key not in st.session_state:
                             st.session_state[clicked_btn_key] = False
@@ -271,27 +467,33 @@ class UserDashboard:
                         if result_similar not in st.session_state:
                             st.session_state[result_similar] = None
 
-                        with st.expander(f"[Error {i}]", expanded=st.session_state[clicked_btn_key]):
+                        with st.expander(f"[Error {i}]{self._format_error_query_stats(error_query)}", expanded=st.session_state[clicked_btn_key]):
+                            if error_query.source:
+                                st.caption(error_query.source.name)
+                            if error_query.message:
+                                st.caption(error_query.message)
                             st.code(sql, language="sql")
 
                             try:
                                 if not st.session_state[clicked_btn_key]: 
                                     if st.button("🛠 AI 오류 분석", key=btn_key):
                                         with st.spinner("AI 오류 분석 중..."):
-                                            similar_queries = search_documents(dbms_type=dbms_type, query_text=sql, filters=filters, top_k=3)
+                                            similar_queries = search_documents(dbms_type=query_dbms_type, query_text=sql, filters=filters, top_k=3)
                                             similar_data = [
                                                 {'sql_query': r['sql_query'], 'suggestion': r['suggestion']}
                                                 for r in similar_queries if r.get('@search.score', 0) > 0.6
                                             ]
-                                            suggestion = get_tuning_suggestion(sql, 0, language, similar_data, dbms_type=dbms_type)
-                                            # st.markdown("##### 🛠 AI 오류 수정 제안")
-                                            # st.write(suggestion)
+                                            # 제안은 받는 대로 표시하고, 끝까지 받은 전체 텍스트만 저장 (중간에 실패하면 RuntimeError 로 저장/색인 생략)
+                                            st.markdown("##### 🛠 AI 오류 수정 제안")
+                                            suggestion_stream, cached = stream_cached_tuning_suggestion(sql, 0, language, similar_data, dbms_type=query_dbms_type, query_type="error")
+                                            suggestion = st.write_stream(suggestion_stream)
                                             # # 3️⃣ DB 저장
                                             # st.info("DB 저장 중...")
-                                            create_query_log("error", 0, sql, suggestion, language, dbms_type, project_code=selected_project["project_code"], user_id=self.current_user["user_id"])
+                                            create_query_log("error", 0, sql, suggestion, language, query_dbms_type, project_code=selected_project["project_code"], user_id=self.current_user["user_id"])
                                             # st.success("✅ 분석 및 저장 완료")
                                             
-                                            embedding = get_embedding(sql)
+                                            # 캐시된 제안은 이미 검색 인덱스에 있으므로 다시 색인하지 않음
+                                            embedding = None if cached else get_embedding(sql)
                                             if embedding:
                                                 doc = {
                                                     "id": str(uuid.uuid4()),
@@ -301,16 +503,17 @@ class UserDashboard:
                                                     "query_type": "error",
                                                     "duration_ms": duration,
                                                     "language": language,
-                                                    "dbms_type": dbms_type,
+                                                    "dbms_type": query_dbms_type,
                                                     "project_code": selected_project["project_code"],
                                                     "created_at": datetime.now().astimezone().isoformat(),
                                                     "sql_embedding": embedding
                                                 }
-                                                index_query_to_search(doc, dbms_type)
+                                                index_query_to_search(doc, query_dbms_type)
                                             # ✅ 상태 저장
                                             st.session_state[clicked_btn_key] = True
                                             st.session_state[result_similar] = similar_data
                                             st.session_state[result_suggestion] = suggestion
+                                            st.session_state[result_cached] = cached
                                             self._save_and_rerun()
                             except Exception as e:
                                 st.error(f"{e}")
@@ -319,6 +522,8 @@ class UserDashboard:
                                 # 결과 출력
                                 if st.session_state[result_suggestion]:
                                     st.markdown("##### 🛠 AI 오류 수정 제안")
+                                    if st.session_state.get(result_cached):
+                                        st.caption("💾 같은 쿼리 형태의 이전 제안 (캐시)")
                                     st.write(st.session_state[result_suggestion])
                                     # st.info("🔒 이미 분석된 쿼리입니다.")
 
@@ -330,14 +535,380 @@ class UserDashboard:
                         st.markdown("✅ 모든 에러 쿼리를 다 확인했습니다.")
     
 
+    def _resolve_parser(self, format_id, source, source_name):
+        """선택한 형식의 파서 반환 (자동 감지면 파일/경로마다 한 번만 앞부분을 읽어 판별)"""
+        if format_id is not None:
+            return get_parser(format_id)
+
+        if st.session_state.get("detected_file_name") != source_name:
+            try:
+                if isinstance(source, str):
+                    with open(source, "rb") as f:
+                        detected_parser, detected_score = detect_parser(f, source)
+                else:
+                    detected_parser, detected_score = detect_parser(source, source_name)
+            except OSError as e:
+                st.error(f"로그 파일을 읽을 수 없습니다: {e}")
+                st.stop()
+            st.session_state["detected_file_name"] = source_name
+            st.session_state["detected_format_id"] = detected_parser.get_format_id() if detected_parser else None
+            st.session_state["detected_score"] = detected_score
+
+        format_id = st.session_state["detected_format_id"]
+        if format_id is None:
+            st.error("로그 형식을 자동으로 감지하지 못했습니다. 대상 DBMS 를 직접 선택해 주세요.")
+            st.stop()
+        parser = get_parser(format_id)
+        st.info(f"🔎 자동 감지된 로그 형식: {self._format_parser_label(type(parser))} (일치도 {st.session_state['detected_score']:.0%})")
+        return parser
+
+    def _analyze_uploaded_files(self, format_id, uploaded_files, project_code):
+        """
+        여러 로그 파일 / zip·tar 묶음을 한 번에 분석해 (대표 dbms_type, ParsedLog) 반환.
+        파일별로 형식을 감지한 뒤 Blob 업로드(스레드)와 파일별 파싱(프로세스 풀)을 동시에 진행하고,
+        결과는 파싱 캐시에 두어 rerun 시 재사용 (레코드마다 출처 파일 기록).
+        """
+        upload_key = "|".join(f"{uploaded.name}:{uploaded.size}" for uploaded in uploaded_files)
+        is_new_upload = upload_key != st.session_state["prev_file_name"]
+        parsed_log = None if is_new_upload else parse_cache.get(st.session_state.get("multi_cache_key") or "")
+
+        if parsed_log is None:
+            if is_new_upload:
+                st.session_state["prev_file_name"] = upload_key
+                st.session_state["slow_query_page"] = 0
+                st.session_state["error_query_page"] = 0
+                self._clear_ai_results()
+
+            with st.spinner(f"파일 {len(uploaded_files)}개 압축 해제 및 분석 중..."):
+                try:
+                    with extract_log_files(uploaded_files) as log_files:
+                        resolved, skipped = resolve_log_parsers(log_files, format_id)
+                        if not resolved:
+                            st.error("로그 형식을 감지한 파일이 없습니다. 대상 DBMS 를 직접 선택해 주세요.")
+                            st.stop()
+
+                        # 업로드 파일별 Blob 경로는 그 파일(묶음이면 첫 로그)의 DBMS 기준
+                        upload_dbms_types = {}
+                        for log_file, parser in resolved:
+                            upload_dbms_types.setdefault(log_file.upload_name, parser.dbms_type)
+                        blob_files = [(uploaded, upload_dbms_types[uploaded.name]) for uploaded in uploaded_files if uploaded.name in upload_dbms_types]
+
+                        with ThreadPoolExecutor(max_workers=1) as executor:
+                            upload_future = executor.submit(upload_files_to_blob, blob_files, project_code) if is_new_upload else None
+                            scan_result = scan_log_files(resolved)
+                            if upload_future:
+                                upload_future.result()
+                except (ValueError, tarfile.TarError, zipfile.BadZipFile) + DECOMPRESSION_ERRORS as e:
+                    # 손상된 압축/묶음 파일 또는 zstandard 미설치 등
+                    st.error(f"로그 파일을 읽을 수 없습니다: {e}")
+                    st.stop()
+
+            content_hash = hashlib.sha256("|".join(hash_fileobj(uploaded) for uploaded in uploaded_files).encode("utf-8")).hexdigest()
+            parser_versions = ",".join(sorted({f"{parser.get_format_id()}:{parser.parser_version}" for _, parser in resolved}))
+            multi_cache_key = f"multi:{content_hash}:{format_id}:{parser_versions}:{CACHE_FORMAT_VERSION}"
+            parsed_log = parse_cache.put_scan_result(multi_cache_key, scan_result)
+
+            st.session_state["multi_cache_key"] = multi_cache_key
+            st.session_state["multi_dbms_type"] = resolved[0][1].dbms_type
+            st.session_state["multi_log_files"] = [[log_file.name, parser.get_format_id()] for log_file, parser in resolved]
+            st.session_state["multi_skipped_files"] = [log_file.name for log_file in skipped]
+            if is_new_upload:
+                self._save_and_rerun()
+
+        st.success(f"✅ 파일 {len(uploaded_files)}개 Azure Blob Storage 업로드 완료")
+        if st.session_state.get("multi_skipped_files"):
+            st.warning("로그 형식을 감지하지 못해 제외한 파일: " + ", ".join(st.session_state["multi_skipped_files"]))
+        with st.expander("📄 파일별 분석 결과"):
+            st.dataframe(self._create_log_sources_dataframe(st.session_state["multi_log_files"], parsed_log.scan_result), use_container_width=True)
+        return st.session_state["multi_dbms_type"], parsed_log
+
+    def _follow_server_log(self, parser, project_code, log_path, read_new_logs):
+        """
+        서버 로그 파일의 지난 체크포인트 이후 새 레코드만 읽어 ParsedLog 반환.
+        체크포인트(inode, offset, 마지막 '# Time')는 (프로젝트, DBMS, 경로) 별로 SQLite 에 저장하고,
+        읽은 결과는 파싱 캐시에 두어 버튼 클릭 등 rerun 시 재사용.
+        """
+        tail_key_prefix = f"tail:{project_code}:{parser.get_format_id()}:{log_path}:"
+        if read_new_logs:
+            checkpoint = get_log_checkpoint(project_code, parser.dbms_type, log_path)
+            try:
+                with st.spinner("새 로그 읽는 중..."):
+                    tail = read_new_records(
+                        parser,
+                        log_path,
+                        inode=checkpoint["inode"] if checkpoint else None,
+                        offset=checkpoint["offset"] if checkpoint else 0,
+                        head_hash=checkpoint["head_hash"] if checkpoint else None,
+                        last_time=checkpoint["last_time"] if checkpoint else None,
+                    )
+            except OSError as e:
+                st.error(f"로그 파일을 읽을 수 없습니다: {e}")
+                st.stop()
+            save_log_checkpoint(project_code, parser.dbms_type, log_path, tail.inode, tail.offset, tail.head_hash, tail.last_time)
+
+            tail_cache_key = f"{tail_key_prefix}{tail.inode}:{tail.offset}"
+            parse_cache.put_scan_result(tail_cache_key, tail.scan_result)
+            st.session_state["tail_cache_key"] = tail_cache_key
+            st.session_state["tail_rotated"] = tail.rotated
+            st.session_state["slow_query_page"] = 0
+            st.session_state["error_query_page"] = 0
+            self._clear_ai_results()
+            self._save_and_rerun()
+
+        # 다른 경로/프로젝트로 바꾼 경우 이전 결과는 표시하지 않음
+        tail_cache_key = st.session_state.get("tail_cache_key") or ""
+        parsed_log = parse_cache.get(tail_cache_key) if tail_cache_key.startswith(tail_key_prefix) else None
+        if parsed_log is None:
+            st.info("🔄 새 로그 읽기를 누르면 지난 분석 이후 기록된 로그만 분석합니다.")
+            st.stop()
+
+        if st.session_state.get("tail_rotated"):
+            st.warning("🔁 로그 파일 회전이 감지되어 이전 파일의 남은 부분과 새 파일을 이어서 읽었습니다.")
+        scan_result = parsed_log.scan_result
+        st.success(f"✅ 새 레코드 {len(scan_result.slow_queries) + len(scan_result.error_queries)}건 읽기 완료")
+        return parsed_log
+
+    def _show_workload_timeline(self, slow_queries, dbms_type):
+        """슬로우 쿼리의 시간대별 건수/총 소요 시간/p95 차트 (집계는 pandas group-by)"""
+        freq_options = {"분 단위": "minute", "시간 단위": "hour"}
+        split_options = {"전체": None, "쿼리 형태(fingerprint)별": "fingerprint", "테이블별": "table"}
+        metric_options = {"건수": "count", "총 소요 시간 (ms)": "total_ms", "p95 (ms)": "p95_ms"}
+
+        col1, col2, col3 = st.columns(3)
+        freq = freq_options[col1.radio("시간 단위", options=list(freq_options.keys()), horizontal=True)]
+        split_by = split_options[col2.selectbox("계열 분할", options=list(split_options.keys()))]
+        metric = metric_options[col3.radio("지표", options=list(metric_options.keys()), horizontal=True)]
+
+        timeline = build_timeline(slow_queries, freq=freq, split_by=split_by, dbms_type=dbms_type)
+        if timeline.empty:
+            st.info("실행 시각 정보가 있는 슬로우 쿼리가 없습니다.")
+            return
+
+        chart_data = pivot_timeline(timeline, metric=metric, freq=freq)
+        if split_by == "fingerprint":
+            # 범례에는 식별자 + 잘린 fingerprint 표시 (앞부분이 같은 형태끼리 겹치지 않도록)
+            chart_data.columns = [
+                column if column == OTHER_SERIES else f"{fingerprint_id(column)[:8]} {html.unescape(get_truncated_sql(column, 50))}"
+                for column in chart_data.columns
+            ]
+        if metric == "p95_ms":
+            st.line_chart(chart_data)
+        else:
+            st.bar_chart(chart_data)
+
+        if split_by != "table":
+            excluded = len(slow_queries) - int(timeline["count"].sum())
+            if excluded:
+                st.caption(f"실행 시각을 해석할 수 없는 {excluded:,}건은 제외했습니다.")
+
+    def _show_hotspot_report(self, slow_queries, error_queries, dbms_type):
+        """테이블/쿼리 패턴별 슬로우 쿼리 시간·건수와 오류 건수 표 (AI 분석 전 병목 테이블 파악용)"""
+        hotspot_options = {"테이블별": "table", "쿼리 패턴별 (JOIN, SUBQUERY, GROUP_BY ...)": "pattern"}
+        by = hotspot_options[st.radio("집계 기준", options=list(hotspot_options.keys()), horizontal=True)]
+
+        report = build_hotspot_report(slow_queries, error_queries, by=by, dbms_type=dbms_type)
+        if report.empty:
+            st.info("집계할 쿼리가 없습니다.")
+            return
+        st.dataframe(self._create_hotspot_dataframe(report), use_container_width=True)
+        st.caption("여러 테이블/패턴에 해당하는 쿼리는 각각에 모두 집계되므로 비율의 합은 100%를 넘을 수 있습니다.")
+
+    def _run_bulk_ai_analysis(self, targets, dbms_type, project_code, language, max_concurrency):
+        """
+        [(목록 종류, 레코드)] 의 AI 제안을 동시에 요청하고 각 쿼리의 AI 분석 결과 상태로 저장.
+        키는 개별 버튼과 같은 순번을 쓰므로 목록의 해당 쿼리에 결과가 바로 표시됨.
+        """
+        pending = []
+        positions = {"slow": 0, "slow_digest": 0, "error": 0}
+        for kind, query in targets:
+            positions[kind] += 1
+            key_suffix = f"{kind}_{positions[kind]}"
+            if not st.session_state.get(f"clicked_btn_ai_{key_suffix}"):
+                pending.append((key_suffix, "error" if kind == "error" else "slow", query))
+        if not pending:
+            st.info("모두 이미 분석된 쿼리입니다.")
+            return
+
+        progress = st.progress(0.0, text=f"AI 분석 중... 0/{len(pending)}")
+        tasks = [
+            (query.sql, query.duration_ms if query_type == "slow" else 0, query.source.dbms_type if query.source else dbms_type, query_type)
+            for _, query_type, query in pending
+        ]
+        docs = {}
+        failures = []
+        for done, (i, suggestion, cached, error) in enumerate(get_tuning_suggestions_bulk(tasks, language, max_concurrency), start=1):
+            progress.progress(done / len(pending), text=f"AI 분석 중... {done}/{len(pending)}")
+            key_suffix, query_type, query = pending[i]
+            sql, duration, query_dbms_type, _ = tasks[i]
+            if error:
+                failures.append(f"{key_suffix}: {error}")
+                continue
+
+            create_query_log(query_type, duration, sql, suggestion, language, query_dbms_type, project_code=project_code, user_id=self.current_user["user_id"])
+            st.session_state[f"clicked_btn_ai_{key_suffix}"] = True
+            st.session_state[f"result_suggestion_btn_ai_{key_suffix}"] = suggestion
+            st.session_state[f"result_similar_btn_ai_{key_suffix}"] = []
+            st.session_state[f"result_cached_btn_ai_{key_suffix}"] = cached
+            # 캐시된 제안은 이미 검색 인덱스에 있으므로 새 제안만 색인
+            if not cached:
+                docs.setdefault(query_dbms_type, []).append({
+                    "id": str(uuid.uuid4()),
+                    "user_id": self.current_user['user_id'],
+                    "sql_query": sql,
+                    "suggestion": suggestion,
+                    "query_type": query_type,
+                    "duration_ms": duration,
+                    "language": language,
+                    "dbms_type": query_dbms_type,
+                    "project_code": project_code,
+                    "created_at": datetime.now().astimezone().isoformat(),
+                })
+
+        # 새 제안은 DBMS 별로 임베딩을 일괄 생성해 한 번에 색인
+        progress.progress(1.0, text="검색 인덱스 저장 중...")
+        for query_dbms_type, dbms_docs in docs.items():
+            index_queries_to_search(dbms_docs, query_dbms_type)
+
+        if failures:
+            save_session_state(self.current_user['user_id'])
+            st.error(f"{len(failures)}건 분석 실패\n\n" + "\n\n".join(failures[:5]))
+            return
+        self._save_and_rerun()
+
+    def _clear_ai_results(self):
+        """이전 분석 대상의 AI 분석 버튼/결과 상태 삭제"""
+        keys_to_delete = [
+            key for key in st.session_state.keys()
+            if "clicked_btn_ai_" in key or "result_suggestion_btn_ai_" in key or "result_similar_btn_ai_" in key
+            or "result_cached_btn_ai_" in key
+        ]
+        for key in keys_to_delete:
+            del st.session_state[key]
+
+    def _format_parser_label(self, parser_class):
+        """파서 선택지 표시 이름 (예: PostgreSQL (csvlog))"""
+        name = parser_class().get_dbms_name()
+        return f"{name} ({parser_class.log_format})" if parser_class.log_format else name
+
+    def _format_slow_query_stats(self, query):
+        """슬로우 쿼리 헤더에 표시할 Lock 시간 / 검사·반환 행 수"""
+        stats = []
+        if query.lock_time_ms:
+            stats.append(f"lock {query.lock_time_ms:.2f}ms")
+        if query.rows_examined is not None:
+            stats.append(f"rows {query.rows_examined:,} examined / {query.rows_sent or 0:,} sent")
+        return f" · {' · '.join(stats)}" if stats else ""
+
+    def _format_bounded_caption(self, sampling_mode, total, kept):
+        """대용량 로그 모드에서 로그 전체 건수 대비 보관한 레코드 수 안내"""
+        kind = "상위" if sampling_mode == "top" else "무작위 표본"
+        return f"🗜 대용량 로그 모드: 로그 전체 {total:,}건 중 {kind} {kept:,}건만 보관해 표시합니다."
+
+    def _format_error_query_stats(self, error_query):
+        """오류 쿼리 헤더에 표시할 심각도 / SQLSTATE (구조화 로그만 값이 있음)"""
+        stats = [value for value in (error_query.severity, error_query.sql_state) if value]
+        return f" · {' · '.join(stats)}" if stats else ""
+
     def on_input_change(self):
         st.session_state["slow_query_threshold"] = st.session_state["input_slow_value"]
         self._save_and_rerun()
 
 
+    def _show_query_log_comparison(self):
+        """튜닝 전/후 로그(또는 저장된 분석)의 쿼리 형태(fingerprint)별 횟수/p95/총 시간 비교"""
+
+        st.subheader("⚖️ 튜닝 전/후 비교")
+        projects = list_user_projects(self.current_user['user_id'])
+        if not projects:
+            st.warning("할당된 프로젝트가 없습니다.")
+            return
+
+        project_options = {f"{p['project_code']} - {p['project_name']}": p for p in projects}
+        selected_project = project_options[st.selectbox("프로젝트 선택", options=list(project_options.keys()), key="compare_project")]
+        project_code = selected_project["project_code"]
+
+        dbms_options = {self._format_parser_label(parser_class): parser_class.get_format_id() for parser_class in list_parsers()}
+        format_id = dbms_options[st.selectbox("📦 대상 DBMS", options=list(dbms_options.keys()), key="compare_dbms")]
+        parser = get_parser(format_id)
+
+        col1, col2, col3 = st.columns(3)
+        threshold_ms = col1.number_input("비교할 최소 실행 시간 (ms)", min_value=0, value=0, step=100, help="업로드한 로그에만 적용됩니다.")
+        status_options = {"p95": "p95_ms", "총 소요 시간": "total_ms", "실행 횟수": "count"}
+        status_by = status_options[col2.radio("악화/개선 판정 기준", options=list(status_options.keys()), horizontal=True)]
+        tolerance = col3.slider("판정 임계 변화율 (%)", min_value=1, max_value=100, value=int(COMPARE_TOLERANCE * 100)) / 100
+
+        col_before, col_after = st.columns(2)
+        with col_before:
+            before = self._load_comparison_side("이전 (Before)", "before", project_code, parser, threshold_ms)
+        with col_after:
+            after = self._load_comparison_side("이후 (After)", "after", project_code, parser, threshold_ms)
+        if before is None or after is None:
+            st.info("이전/이후 로그를 업로드하거나 저장된 분석을 선택하면 쿼리 형태별로 비교합니다.")
+            return
+
+        comparison = compare_digests(before, after, status_by=status_by, tolerance=tolerance)
+        summary = summarize_comparison(comparison)
+
+        metric_cols = st.columns(6)
+        metric_cols[0].metric("🔺 악화", f"{summary[STATUS_REGRESSION]:,}")
+        metric_cols[1].metric("🔻 개선", f"{summary[STATUS_IMPROVEMENT]:,}")
+        metric_cols[2].metric("🆕 새 형태", f"{summary[STATUS_NEW]:,}")
+        metric_cols[3].metric("🗑 사라진 형태", f"{summary[STATUS_GONE]:,}")
+        metric_cols[4].metric("실행 횟수", f"{summary['count_after']:,.0f}", delta=f"{summary['count_after'] - summary['count_before']:,.0f}", delta_color="inverse")
+        metric_cols[5].metric("총 소요 시간(ms)", f"{summary['total_ms_after']:,.0f}", delta=f"{summary['total_ms_after'] - summary['total_ms_before']:,.0f}", delta_color="inverse")
+
+        status_labels = {STATUS_REGRESSION: "악화", STATUS_IMPROVEMENT: "개선", STATUS_NEW: "새 형태", STATUS_GONE: "사라진 형태", "unchanged": "변화 없음"}
+        selected_statuses = st.multiselect(
+            "표시할 상태",
+            options=list(status_labels.keys()),
+            default=[STATUS_REGRESSION, STATUS_IMPROVEMENT, STATUS_NEW],
+            format_func=status_labels.get,
+        )
+        comparison = comparison[comparison["status"].isin(selected_statuses)]
+        st.dataframe(self._create_comparison_dataframe(comparison, status_labels), use_container_width=True)
+
+    def _load_comparison_side(self, label, side, project_code, parser, threshold_ms):
+        """비교 한쪽의 fingerprint 별 집계 DataFrame (로그 업로드 또는 저장된 분석, 선택 전이면 None)"""
+
+        st.markdown(f"##### {label}")
+        source = st.radio("입력", options=["📂 로그 파일 업로드", "💾 저장된 분석"], horizontal=True, key=f"compare_{side}_source")
+        if source == "💾 저장된 분석":
+            snapshots = list_digest_snapshots(project_code, parser.dbms_type)
+            if not snapshots:
+                st.caption("저장된 분석이 없습니다. 쿼리 로그 분석 화면에서 저장할 수 있습니다.")
+                return None
+            snapshot_options = {
+                f"#{snapshot['id']} {snapshot['label']} ({utc_to_local(snapshot['created_at'])}, {snapshot['slow_query_count']:,}건)": snapshot["id"]
+                for snapshot in snapshots
+            }
+            snapshot_id = snapshot_options[st.selectbox("저장된 분석", options=list(snapshot_options.keys()), key=f"compare_{side}_snapshot")]
+            return digests_to_frame(get_digest_snapshot_stats(snapshot_id))
+
+        uploaded_file = st.file_uploader(
+            "로그 파일",
+            type=LOG_FILE_TYPES + COMPRESSED_FILE_TYPES,
+            key=f"compare_{side}_file",
+        )
+        if uploaded_file is None:
+            return None
+        try:
+            parsed_log = parse_cache.get_or_parse(parser, uploaded_file)
+        except (ValueError,) + DECOMPRESSION_ERRORS as e:
+            st.error(f"로그 파일을 읽을 수 없습니다: {e}")
+            return None
+        slow_queries = parsed_log.duration_index.above(threshold_ms)
+        st.caption(f"슬로우 쿼리 {len(slow_queries):,}건")
+        return digests_to_frame(aggregate_slow_queries(slow_queries, parser.dbms_type))
+
     def _show_query_log_analysis_history(self):
 
         st.subheader("쿼리 로그 분석 현황")
+        cache_stats = get_suggestion_cache_stats()
+        lookups = cache_stats["hits"] + cache_stats["misses"]
+        col1, col2, col3 = st.columns(3)
+        col1.metric("AI 제안 캐시 적중", f"{cache_stats['hits']:,}회")
+        col2.metric("캐시 미스 (API 호출)", f"{cache_stats['misses']:,}회")
+        col3.metric("적중률", f"{cache_stats['hits'] / lookups:.1%}" if lookups else "-", help=f"캐시된 제안 {cache_stats['entries']:,}건")
         query_logs = list_query_logs_by_user_id(user_id=self.current_user["user_id"])
         if query_logs:
             # 데이터프레임 생성
@@ -347,6 +918,54 @@ class UserDashboard:
         else:
             st.info("등록된 쿼리 로그 분석 이력이 없습니다.")
 
+    def _create_query_digests_dataframe(self, digests):
+        """쿼리 형태(fingerprint)별 집계 데이터프레임 생성"""
+
+        df = pd.DataFrame([digest.to_dict() for digest in digests])
+        df = df[["fingerprint", "count", "total_ms", "mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms"]]
+        df.columns = ["쿼리 형태", "횟수", "총 시간(ms)", "평균(ms)", "p50(ms)", "p95(ms)", "p99(ms)", "최대(ms)"]
+        df.index = range(1, len(df) + 1)
+        df.index.name = "No"
+        return df.round(2)
+
+    def _create_hotspot_dataframe(self, report):
+        """테이블/패턴별 핫스팟 데이터프레임 생성"""
+
+        df = report.copy()
+        df["share"] = df["share"] * 100
+        df.columns = ["대상", "슬로우 횟수", "총 시간(ms)", "시간 비율(%)", "평균(ms)", "p95(ms)", "최대(ms)", "오류 횟수"]
+        df.index = range(1, len(df) + 1)
+        df.index.name = "No"
+        return df.round(2)
+
+    def _create_log_sources_dataframe(self, log_files, scan_result):
+        """여러 파일 분석 시 파일별 형식/슬로우·오류 쿼리 건수 데이터프레임 생성"""
+
+        df = pd.DataFrame(log_files, columns=["파일", "로그 형식"])
+        slow_counts = pd.Series([query.source.name for query in scan_result.slow_queries], dtype=object).value_counts()
+        error_counts = pd.Series([query.source.name for query in scan_result.error_queries], dtype=object).value_counts()
+        df["슬로우 쿼리"] = df["파일"].map(slow_counts).fillna(0).astype(int)
+        df["오류 쿼리"] = df["파일"].map(error_counts).fillna(0).astype(int)
+        df.index = range(1, len(df) + 1)
+        df.index.name = "No"
+        return df
+
+    def _create_comparison_dataframe(self, comparison, status_labels):
+        """전/후 비교 데이터프레임 생성 (비율은 이후/이전)"""
+
+        df = comparison[[
+            "status", "fingerprint",
+            "count_before", "count_after",
+            "p95_ms_before", "p95_ms_after", "p95_ms_ratio",
+            "total_ms_before", "total_ms_after", "total_ms_delta",
+        ]].copy()
+        df["status"] = df["status"].map(status_labels)
+        df.columns = ["상태", "쿼리 형태", "이전 횟수", "이후 횟수", "이전 p95(ms)", "이후 p95(ms)", "p95 비율",
+                      "이전 총 시간(ms)", "이후 총 시간(ms)", "총 시간 증감(ms)"]
+        df.index = range(1, len(df) + 1)
+        df.index.name = "No"
+        return df.round(2)
+
     def _create_query_logs_dataframe(self, query_logs):
         """분석 이력 데이터프레임 생성"""
 